@@ -1,27 +1,1340 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import (Flask, render_template, request, jsonify, redirect, url_for, g, has_app_context, has_request_context,
+                   stream_with_context)
+from flask.json.provider import DefaultJSONProvider
 import sqlite3
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from datetime import datetime
+from psycopg2 import pool as pg_pool
+from psycopg2.extras import RealDictCursor, execute_values
+from werkzeug.security import safe_join
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from html.parser import HTMLParser
+from itertools import chain, islice
+import logging
+import mimetypes
 import os
+import queue
+import re
+import select
+import socket
+import gzip
+import hashlib
+import io
+import ipaddress
 import json
+import threading
+import time
+import urllib.request
+import zlib
+from urllib.parse import parse_qsl, quote, urlencode, urljoin, urlsplit
+
+# 없어도 동작한다: orjson이 없으면 표준 json, brotli가 없으면 gzip만 쓴다
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 app = Flask(__name__)
+# /api/boards/1/...을 기본 보드용 예전 주소(/api/links 등)로 리다이렉트하지 않는다
+app.url_map.redirect_defaults = False
+logger = logging.getLogger(__name__)
 
-# 데이터베이스 연결 함수
-def get_db_connection():
+SQLITE_PATH = 'property_links.db'
+
+# 연결 풀 설정 (gunicorn 워커 프로세스 하나당 적용됨)
+DB_POOL_MIN = int(os.environ.get('DB_POOL_MIN', 1))
+DB_POOL_MAX = int(os.environ.get('DB_POOL_MAX', 5))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+DB_POOL_WAIT_WARN = float(os.environ.get('DB_POOL_WAIT_WARN', 0.5))
+
+# 읽기 전용 복제본 - 쉼표로 구분한 주소 (PostgreSQL은 DSN, SQLite는 복제해 둔 DB 파일 경로). 비어 있으면 모두 주 DB에서 읽는다
+DATABASE_REPLICA_URLS = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+REPLICA_CHECK_INTERVAL = float(os.environ.get('REPLICA_CHECK_INTERVAL', 2))  # 복제 지연을 확인하는 주기 (초)
+REPLICA_MAX_LAG = int(os.environ.get('REPLICA_MAX_LAG', 50))  # 주 DB보다 이만큼(모든 보드 버전 합) 넘게 뒤처지면 쓰지 않는다
+# 쓰기 응답에 보드별 버전을 남겨 두고, 그 버전까지 따라오지 못한 복제본은 이 클라이언트에게 쓰지 않는다
+REPLICA_WRITE_COOKIE = 'db_write_seq'
+REPLICA_WRITE_COOKIE_MAX_AGE = int(os.environ.get('REPLICA_WRITE_COOKIE_MAX_AGE', 300))
+# 복제본에서 읽는 GET 엔드포인트 (첫 화면은 고객 정보를 페이지 캐시에 담으므로 주 DB에서만 읽는다)
+REPLICA_ENDPOINTS = {'links', 'link_memo', 'link_stats', 'link_changes', 'backup_data'}
+
+# 링크 목록 페이지 크기
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# 워커마다 보관하는 목록 응답 캐시 크기 (필터 조합 수)
+LINKS_CACHE_SIZE = int(os.environ.get('LINKS_CACHE_SIZE', 256))
+
+# 응답 압축 - Accept-Encoding에 맞춰 brotli(br) 또는 gzip으로, 이보다 작은 응답은 그대로 보낸다
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+CONTENT_ENCODINGS = ['br', 'gzip'] if brotli is not None else ['gzip']
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/html', 'text/css', 'text/javascript',
+                          'application/javascript', 'text/plain'}
+
+# 목록 응답의 링크 필드 - ?fields=id,url,rating처럼 일부만 고르면 그 컬럼만 읽는다 (?format=columnar면 필드마다 값 배열 하나)
+LINK_FIELDS = ['id', 'number', 'url', 'platform', 'added_by', 'date_added', 'rating', 'liked', 'disliked', 'memo']
+BOOLEAN_LINK_FIELDS = {'liked', 'disliked', 'archived'}
+
+# 지문이 붙은 정적 파일(/assets/...)의 브라우저 캐시 시간
+STATIC_MAX_AGE = 365 * 24 * 3600
+
+# 백업 스트리밍 때 한 번에 읽는 행 수
+BACKUP_BATCH_SIZE = 1000
+
+# 백업에 넣는 링크 컬럼 (검색 토큰 같은 파생 컬럼은 복원 때 다시 만든다)
+BACKUP_LINK_COLUMNS = ['id', 'url', 'platform', 'added_by', 'date_added', 'rating', 'liked', 'disliked', 'memo',
+                       'customer_name', 'move_in_date', 'change_seq', 'updated_at']
+
+# 복원 때 한 번에 INSERT하는 행 수
+RESTORE_BATCH_SIZE = 1000
+
+# PATCH /api/links/batch 한 번에 받는 최대 수정 개수
+MAX_BATCH_OPERATIONS = 500
+
+# 매물 정보 보강 (링크 url에서 제목/가격/면적/썸네일을 가져와 link_metadata에 캐시)
+METADATA_FETCHER = os.environ.get('METADATA_FETCHER', 'http')  # http, stub(네트워크 없이 가짜 정보), off
+METADATA_WORKERS = int(os.environ.get('METADATA_WORKERS', 2))
+METADATA_QUEUE_SIZE = 1000
+METADATA_TTL_HOURS = float(os.environ.get('METADATA_TTL_HOURS', 24))
+METADATA_RETRY_MINUTES = float(os.environ.get('METADATA_RETRY_MINUTES', 30))  # 가져오기에 실패한 url은 이만큼 뒤에 다시
+METADATA_FETCH_TIMEOUT = float(os.environ.get('METADATA_FETCH_TIMEOUT', 5))
+METADATA_MAX_BYTES = 512 * 1024  # 페이지 앞부분(head)만 읽는다
+
+# 보관함 - 오래된 링크(좋아요 제외)와 싫어요를 누른 지 오래된 링크를 archived_links로 옮겨서 목록/백업이 읽지 않게 한다
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 180))  # 추가한 지 이만큼 지난 링크 (0이면 끔)
+ARCHIVE_DISLIKED_AFTER_DAYS = int(os.environ.get('ARCHIVE_DISLIKED_AFTER_DAYS', 30))  # 싫어요 후 이만큼 지난 링크 (0이면 끔)
+ARCHIVE_INTERVAL_HOURS = float(os.environ.get('ARCHIVE_INTERVAL_HOURS', 6))  # 워커 안에서 도는 주기 (0이면 archive.py로만)
+ARCHIVE_BATCH_SIZE = 500  # 한 트랜잭션에서 옮기는 링크 수
+ARCHIVE_LOCK_ID = 7301  # PostgreSQL advisory lock (ARCHIVE_LOCK_ID, board_id)
+# 삭제 기록(link_tombstones)을 남겨 두는 기간 - 보관 작업이 이보다 오래된 기록을 지운다 (0이면 지우지 않음)
+TOMBSTONE_RETENTION_DAYS = int(os.environ.get('TOMBSTONE_RETENTION_DAYS', 30))
+
+# 보관함으로 옮길 때 그대로 복사하는 links 컬럼
+ARCHIVE_COLUMNS = ['id', 'board_id', 'url', 'platform', 'added_by', 'date_added', 'rating', 'liked', 'disliked', 'memo',
+                   'customer_name', 'move_in_date', 'change_seq', 'updated_at', 'url_tokens', 'memo_tokens', 'url_key']
+
+# 보드 = 고객 한 명의 매물 목록 (customer_info 행 하나). 예전 주소(/api/links 등)는 기본 보드를 가리킨다
+DEFAULT_BOARD_ID = 1
+DEFAULT_CUSTOMER_NAME = '제일좋은집 찾아드릴분'
+
+# PostgreSQL links 테이블의 board_id 해시 파티션 개수
+LINK_PARTITIONS = 16
+
+# 검색 토큰 - 한글(CJK)은 띄어쓰기와 상관없이 찾을 수 있게 글자 1-gram/2-gram으로,
+# 영문/숫자는 단어 단위로 쪼갠다. ("강남역 원룸" -> "강 남 역 강남 남역 원 룸 원룸")
+SEARCH_WORD_PATTERN = re.compile(r'[\u3131-\u318e\uac00-\ud7a3\u4e00-\u9fff]+|[a-z0-9]+')
+
+def is_cjk_word(word):
+    return not word[0].isascii()
+
+def search_tokens(text):
+    tokens = []
+    for word in SEARCH_WORD_PATTERN.findall((text or '').lower()):
+        if is_cjk_word(word):
+            tokens.extend(word)
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return ' '.join(tokens)
+
+def query_tokens(text):
+    # 검색어는 2-gram만 (한 글자 검색어는 1-gram) - 모든 토큰을 포함하는 링크를 찾는다
+    tokens = []
+    for word in SEARCH_WORD_PATTERN.findall((text or '').lower()):
+        if is_cjk_word(word) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return list(dict.fromkeys(tokens))
+
+def backfill_search_tokens(cursor, db_type):
+    cursor.execute('SELECT id, url, memo FROM links')
+    rows = [(search_tokens(url), search_tokens(memo), link_id) for link_id, url, memo in cursor.fetchall()]
+    run_many(cursor, db_type, 'UPDATE links SET url_tokens = %s, memo_tokens = %s WHERE id = %s', rows)
+
+# url 정규화 - 같은 매물을 추적 파라미터만 다르게 여러 번 추가하지 않도록 링크마다 정규화한 키(url_key)를 저장한다.
+# 매물 번호를 알 수 있는 사이트는 'naver:2412345'처럼 번호만, 그 밖에는 추적 파라미터를 뺀 url이 키가 된다.
+# (플랫폼, 호스트, 매물 번호가 들어 있는 쿼리 파라미터, 매물 번호가 들어 있는 경로 패턴)
+LISTING_URL_RULES = [
+    ('naver', 'land.naver.com', ('articleNo', 'articleId'), [re.compile(r'/articles?/(?:info/)?(\d+)')]),
+    ('zigbang', 'zigbang.com', ('itemId', 'item_id'), [re.compile(r'/items?/(\d+)'), re.compile(r'/share/\w+/(\d+)')]),
+]
+TRACKING_PARAMS = {'fbclid', 'gclid', 'igshid', 'mc_cid', 'mc_eid', 'ref', 'referrer', 'share', 'shared', 'source'}
+TRACKING_PARAM_PREFIXES = ('utm_', 'n_')
+
+def is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+def canonical_url_key(url):
+    url = (url or '').strip()
+    if '://' not in url:
+        url = 'https://' + url
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower().removeprefix('www.')
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    
+    for platform, domain, id_params, path_patterns in LISTING_URL_RULES:
+        if host == domain or host.endswith('.' + domain):
+            for name, value in query:
+                if name in id_params and value.isdigit():
+                    return f'{platform}:{value}'
+            for pattern in path_patterns:
+                match = pattern.search(parts.path)
+                if match:
+                    return f'{platform}:{match.group(1)}'
+    
+    # http/https, 끝의 /, 파라미터 순서, #조각은 구분하지 않는다
+    kept = urlencode(sorted((name, value) for name, value in query if not is_tracking_param(name)))
+    try:
+        port = f':{parts.port}' if parts.port and parts.port not in (80, 443) else ''
+    except ValueError:
+        port = ''
+    return f"{host}{port}{parts.path.rstrip('/')}" + (f'?{kept}' if kept else '')
+
+def backfill_url_keys(cursor, db_type):
+    cursor.execute("SELECT id, url FROM links WHERE url_key = ''")
+    rows = [(canonical_url_key(url), link_id) for link_id, url in cursor.fetchall()]
+    run_many(cursor, db_type, 'UPDATE links SET url_key = %s WHERE id = %s', rows)
+
+# 보드 요약 카운터 (link_counters) - 차원(dimension)과 값(name)마다 링크 수와 평점 합계
+# links/archived_links 트리거가 같은 트랜잭션 안에서 맞춰 두므로 쓰기 경로(ASGI, 일괄 수정, 정리, 보관, 복원)와 상관없이 맞는다.
+# 'archived'만 보관한 링크를 세고 나머지는 목록에 나오는(보관하지 않은) 링크를 센다. 값 식의 {row}는 new/old/테이블 이름
+LINK_COUNTER_DIMENSIONS = [
+    ('total', None),
+    ('platform', '{row}.platform'),
+    ('added_by', "COALESCE({row}.added_by, '')"),
+    ('date_added', "COALESCE({row}.date_added, '')"),
+    ('liked', "CASE WHEN {row}.liked THEN 'yes' ELSE 'no' END"),
+    ('disliked', "CASE WHEN {row}.disliked THEN 'yes' ELSE 'no' END"),
+]
+LINK_COUNTER_UPSERT = '''ON CONFLICT (board_id, dimension, name) DO UPDATE SET
+    link_count = link_counters.link_count + EXCLUDED.link_count, rating_sum = link_counters.rating_sum + EXCLUDED.rating_sum'''
+
+def link_counter_deltas(row, sign, dimensions=LINK_COUNTER_DIMENSIONS):
+    """행 하나(row)가 카운터에 더하는 값 (board_id, dimension, name, 링크 수, 평점 합) 목록 - SQL 식 문자열"""
+    rating = f'COALESCE({row}.rating, 0)' if sign > 0 else f'-COALESCE({row}.rating, 0)'
+    return [(f'{row}.board_id', f"'{dimension}'", expression.format(row=row) if expression else "''", str(sign), rating)
+            for dimension, expression in dimensions]
+
+def sqlite_counter_trigger(row, sign, dimensions=LINK_COUNTER_DIMENSIONS):
+    values = ', '.join(f"({', '.join(delta)})" for delta in link_counter_deltas(row, sign, dimensions))
+    return f'INSERT INTO link_counters (board_id, dimension, name, link_count, rating_sum) VALUES {values} {LINK_COUNTER_UPSERT};'
+
+def postgres_counter_apply(sources, dimensions=LINK_COUNTER_DIMENSIONS):
+    """전이 테이블(sources: [(new_rows, 1), (old_rows, -1)])의 변화를 (보드, 차원, 값)마다 합쳐서 한 번에 반영하는 SQL"""
+    deltas = ' UNION ALL '.join(
+        f'SELECT {board_id} AS board_id, {dimension} AS dimension, {name} AS name, {count} AS link_count, '
+        f'{rating} AS rating_sum FROM {source}'
+        for source, sign in sources for board_id, dimension, name, count, rating in link_counter_deltas(source, sign, dimensions))
+    return f'''INSERT INTO link_counters (board_id, dimension, name, link_count, rating_sum)
+        SELECT board_id, dimension, name, SUM(link_count), SUM(rating_sum) FROM ({deltas}) AS deltas
+        GROUP BY board_id, dimension, name HAVING SUM(link_count) <> 0 OR SUM(rating_sum) <> 0
+        {LINK_COUNTER_UPSERT};'''
+
+def postgres_counter_function(name, dimensions):
+    return f'''CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {postgres_counter_apply([('new_rows', 1)], dimensions)}
+        ELSIF TG_OP = 'DELETE' THEN
+            {postgres_counter_apply([('old_rows', -1)], dimensions)}
+        ELSE
+            {postgres_counter_apply([('new_rows', 1), ('old_rows', -1)], dimensions)}
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql'''
+
+def counted_link_rows_sql(where=''):
+    """테이블에서 직접 센 카운터 행 (board_id, dimension, name, link_count, rating_sum) - 재계산과 점검용"""
+    parts = []
+    for dimension, expression in LINK_COUNTER_DIMENSIONS:
+        name = expression.format(row='links') if expression else "''"
+        group = f', {name}' if expression else ''
+        parts.append(f"SELECT board_id, '{dimension}', {name}, COUNT(*), COALESCE(SUM(rating), 0) FROM links {where} "
+                     f'GROUP BY board_id{group}')
+    parts.append(f"SELECT board_id, 'archived', '', COUNT(*), COALESCE(SUM(rating), 0) FROM archived_links {where} GROUP BY board_id")
+    return ' UNION ALL '.join(parts)
+
+def rebuild_link_counters(cursor, db_type, board_id=None, dry_run=False):
+    """카운터를 테이블에서 다시 세고, 어긋나 있던 (차원, 값) 수를 보드마다 돌려준다 {보드 id: 수}"""
+    if db_type == 'postgresql':
+        # 트리거로 카운터를 고치는 쓰기는 다시 세는 동안 기다린다 (끝나면 그 변화가 그대로 더해진다)
+        cursor.execute('LOCK TABLE link_counters IN SHARE ROW EXCLUSIVE MODE')
+    where, params = ('WHERE board_id = %s', (board_id,)) if board_id is not None else ('', ())
+    
+    run_statement(cursor, db_type, counted_link_rows_sql(where), params * (len(LINK_COUNTER_DIMENSIONS) + 1), prepare=False)
+    counted = {row[:3]: tuple(row[3:]) for row in cursor.fetchall()}
+    run_statement(cursor, db_type, f'SELECT board_id, dimension, name, link_count, rating_sum FROM link_counters {where}', params,
+                  prepare=False)
+    stored = {row[:3]: tuple(row[3:]) for row in cursor.fetchall() if row[3] or row[4]}
+    
+    drift = {}
+    for key in counted.keys() | stored.keys():
+        if counted.get(key) != stored.get(key):
+            drift[key[0]] = drift.get(key[0], 0) + 1
+    if dry_run or not drift:
+        return drift
+    
+    run_statement(cursor, db_type, f'DELETE FROM link_counters {where}', params, prepare=False)
+    rows = [key + value for key, value in counted.items()]
+    insert_values(cursor, db_type, 'INSERT INTO link_counters (board_id, dimension, name, link_count, rating_sum) VALUES %s', rows)
+    return drift
+
+# 변경 알림 (SSE)
+CHANGE_CHANNEL = 'link_changes'
+MAX_EVENT_IDS = 100  # NOTIFY 페이로드 한도(8000바이트) 안에 들어가도록
+# SSE 연결은 열려 있는 동안 gthread 워커의 스레드 하나를 계속 잡는다 (Procfile --threads ${GUNICORN_THREADS:-16}).
+# 워커 하나당 스레드의 1/4까지만 받고 (많아도 절반까지) 나머지 스레드는 일반 요청에 남긴다.
+# 그래서 gunicorn 모드의 실제 한도는 기본 설정에서 워커당 4개, 서버 전체로 워커 수 x 4개다.
+# 더 받지 못한 화면은 SSE_RETRY_AFTER마다 /api/links/stats의 버전을 확인한다 (app.js pollChanges).
+# 한 보드를 여러 화면이 계속 열어 두는 배포는 ASGI 모드(uvicorn asgi_app:app)로 띄운다 - 거기서는 /api/events를
+# 이벤트 루프에서 처리해서 연결마다 스레드를 잡지 않는다 (asgi_app.SSE_ASYNC_MAX_CLIENTS)
+GUNICORN_THREADS = int(os.environ.get('GUNICORN_THREADS', 16))
+SSE_MAX_CLIENTS = min(int(os.environ.get('SSE_MAX_CLIENTS', GUNICORN_THREADS // 4)), GUNICORN_THREADS // 2)
+SSE_RETRY_AFTER = 30  # 연결을 받지 못한 화면이 버전을 확인하는 주기 (초)
+SSE_HEARTBEAT = 15
+SSE_POLL_INTERVAL = float(os.environ.get('SSE_POLL_INTERVAL', 1))
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """PREPARE해 둔 문장 이름을 기억하는 연결 (연결을 새로 만들면 빈 상태로 시작)"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+class PostgresPool:
+    """PostgreSQL 연결 풀 (워커 프로세스마다 하나씩 생성)
+    
+    ThreadedConnectionPool은 연결이 모자라면 바로 에러를 내므로,
+    세마포어로 빈 연결이 생길 때까지 기다리고 대기 시간을 기록한다.
+    """
+    
+    def __init__(self, dsn, minconn, maxconn, timeout):
+        self._pool = pg_pool.ThreadedConnectionPool(minconn, maxconn, dsn, connection_factory=PreparingConnection)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.in_use = 0
+        self.peak_in_use = 0
+    
+    def getconn(self):
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise pg_pool.PoolError(f'{self.timeout}초 동안 사용 가능한 DB 연결이 없습니다.')
+        try:
+            conn = self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+        waited = time.perf_counter() - start
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            if waited >= 0.001:
+                self.waits += 1
+        if waited >= DB_POOL_WAIT_WARN:
+            logger.warning('DB 연결 풀 대기 %.3fs (사용 중 %d/%d)', waited, self.in_use, self.maxconn)
+        return conn
+    
+    def putconn(self, conn, close=False):
+        try:
+            self._pool.putconn(conn, close=close)
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._slots.release()
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'postgresql',
+                'max_size': self.maxconn,
+                'in_use': self.in_use,
+                'peak_in_use': self.peak_in_use,
+                'saturation': self.in_use / self.maxconn,
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'avg_wait_ms': self.total_wait * 1000 / self.checkouts if self.checkouts else 0.0,
+                'max_wait_ms': self.max_wait * 1000,
+            }
+
+_pg_pool = None
+_pg_pool_pid = None
+_pg_pool_lock = threading.Lock()
+
+def get_pg_pool(database_url):
+    # fork 이후 부모 프로세스의 소켓을 공유하지 않도록 pid가 바뀌면 새로 만든다
+    global _pg_pool, _pg_pool_pid
+    if _pg_pool is None or _pg_pool_pid != os.getpid():
+        with _pg_pool_lock:
+            if _pg_pool is None or _pg_pool_pid != os.getpid():
+                _pg_pool = PostgresPool(database_url, DB_POOL_MIN, DB_POOL_MAX, DB_POOL_TIMEOUT)
+                _pg_pool_pid = os.getpid()
+    return _pg_pool
+
+# SQLite 동시성 설정 (gunicorn 워커 여러 개가 같은 파일을 쓸 때)
+# WAL이면 읽기는 쓰기를 기다리지 않고, 쓰기는 파일 전체에서 한 번에 하나씩 (다른 워커는 busy timeout만큼 기다림)
+SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')  # WAL + NORMAL: 전원이 나가면 마지막 커밋만 잃을 수 있고 파일은 안전
+SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 16384))
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+# 연결마다 컴파일해 두는 SQL 문 수 (기본 128은 목록 필터 조합보다 적다)
+SQLITE_CACHED_STATEMENTS = int(os.environ.get('SQLITE_CACHED_STATEMENTS', 512))
+
+# 워커 안의 쓰기(링크 추가/수정/삭제)는 쓰기 전용 스레드 하나가 모아서 한 번에 커밋한다 (0이면 요청 스레드에서 바로 커밋)
+SQLITE_WRITE_QUEUE = os.environ.get('SQLITE_WRITE_QUEUE', '1') != '0'
+SQLITE_GROUP_COMMIT_MAX = int(os.environ.get('SQLITE_GROUP_COMMIT_MAX', 64))
+# 큐 작업 하나가 이보다 오래 쓰기 잠금을 잡으면 경고를 남기고 write_slow_jobs로 센다
+SLOW_WRITE_JOB_MS = float(os.environ.get('SLOW_WRITE_JOB_MS', 100))
+
+def sqlite_pragmas():
+    return [
+        f'PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}',
+        f'PRAGMA synchronous = {SQLITE_SYNCHRONOUS}',
+        f'PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB}',
+        f'PRAGMA mmap_size = {SQLITE_MMAP_SIZE}',
+        'PRAGMA temp_store = MEMORY',
+        f'PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}',
+    ]
+
+def connect_sqlite(path, **kwargs):
+    kwargs.setdefault('cached_statements', SQLITE_CACHED_STATEMENTS)
+    conn = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000, **kwargs)
+    for pragma in sqlite_pragmas():
+        conn.execute(pragma)
+    return conn
+
+# SQLite는 스레드마다 연결 하나를 만들어 계속 재사용
+_sqlite_local = threading.local()
+_sqlite_stats = {'connects': 0, 'checkouts': 0}
+
+def get_sqlite_connection():
+    conn = getattr(_sqlite_local, 'conn', None)
+    if conn is None or getattr(_sqlite_local, 'pid', None) != os.getpid():
+        conn = connect_sqlite(SQLITE_PATH)
+        _sqlite_local.conn = conn
+        _sqlite_local.pid = os.getpid()
+        _sqlite_stats['connects'] += 1
+    _sqlite_stats['checkouts'] += 1
+    return conn
+
+class WriteJob:
+    __slots__ = ('work', 'queued_at', 'done', 'result', 'error')
+    
+    def __init__(self, work):
+        self.work = work
+        self.queued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SQLiteWriteQueue:
+    """워커 프로세스의 SQLite 쓰기를 전용 스레드 하나가 묶어서 실행 (그룹 커밋)
+    
+    요청 스레드는 작업 work(cursor, db_type)를 넣고 끝날 때까지 기다린다.
+    쓰기 스레드는 그동안 쌓인 작업들을 BEGIN IMMEDIATE 트랜잭션 하나에서 SAVEPOINT로 하나씩 실행하고
+    한 번만 커밋한다 (fsync 한 번). 작업 하나가 실패하면 그 작업만 되돌리고 예외는 그 요청으로 전달한다.
+    
+    작업은 쓰기 잠금을 잡은 채 차례로 실행되므로 DB 문장만 실행해야 한다. 요청 본문 읽기, 네트워크, 파일 같은 I/O는
+    작업을 넣기 전에 요청 스레드에서 끝낸다 - 작업 하나가 기다리면 그 뒤의 쓰기가 모두 기다린다.
+    SLOW_WRITE_JOB_MS보다 오래 걸린 작업은 경고로 남긴다.
+    """
+    
+    def __init__(self, path, max_batch):
+        self.path = path
+        self.max_batch = max_batch
+        self.pid = os.getpid()
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.jobs = 0
+        self.failed_batches = 0
+        self.slow_jobs = 0
+        self.max_batch_jobs = 0
+        self.total_wait = 0.0
+        threading.Thread(target=self._run, name='sqlite-writer', daemon=True).start()
+    
+    def submit(self, work):
+        job = WriteJob(work)
+        self._jobs.put(job)
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+    
+    def close(self):
+        self._jobs.put(None)
+    
+    def _run(self):
+        # isolation_level=None: BEGIN/COMMIT을 직접 보낸다
+        conn = connect_sqlite(self.path, isolation_level=None)
+        cursor = conn.cursor()
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                conn.close()
+                return
+            jobs = [job]
+            while len(jobs) < self.max_batch:
+                try:
+                    job = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    self._jobs.put(None)
+                    break
+                jobs.append(job)
+            self._run_batch(conn, cursor, jobs)
+    
+    def _run_batch(self, conn, cursor, jobs):
+        try:
+            # 처음부터 쓰기 잠금을 잡는다 (다른 워커가 쓰는 중이면 busy timeout까지 기다림)
+            cursor.execute('BEGIN IMMEDIATE')
+            for job in jobs:
+                cursor.execute('SAVEPOINT write_job')
+                started = time.perf_counter()
+                try:
+                    job.result = job.work(cursor, 'sqlite')
+                except Exception as e:
+                    cursor.execute('ROLLBACK TO write_job')
+                    job.error = e
+                cursor.execute('RELEASE write_job')
+                self._check_duration(job, time.perf_counter() - started)
+            cursor.execute('COMMIT')
+        except Exception as e:
+            # 잠금 시간 초과나 커밋 실패면 묶음 전체가 실패
+            logger.exception('SQLite 쓰기 묶음 실패 (%d건)', len(jobs))
+            if conn.in_transaction:
+                conn.rollback()
+            for job in jobs:
+                if job.error is None:
+                    job.result = None
+                    job.error = e
+            with self._lock:
+                self.failed_batches += 1
+        finally:
+            now = time.perf_counter()
+            with self._lock:
+                self.batches += 1
+                self.jobs += len(jobs)
+                self.max_batch_jobs = max(self.max_batch_jobs, len(jobs))
+                self.total_wait += sum(now - job.queued_at for job in jobs)
+            for job in jobs:
+                job.done.set()
+    
+    def _check_duration(self, job, elapsed):
+        if elapsed * 1000 <= SLOW_WRITE_JOB_MS:
+            return
+        logger.warning('SQLite 쓰기 작업 %r이(가) 쓰기 잠금을 %.0fms 잡았습니다 - 큐 작업 안에서 I/O를 하지 않는지 확인하세요',
+                       getattr(job.work, '__qualname__', job.work), elapsed * 1000)
+        with self._lock:
+            self.slow_jobs += 1
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'write_batches': self.batches,
+                'write_jobs': self.jobs,
+                'write_failed_batches': self.failed_batches,
+                'write_slow_jobs': self.slow_jobs,
+                'write_avg_batch': self.jobs / self.batches if self.batches else 0.0,
+                'write_max_batch': self.max_batch_jobs,
+                'write_avg_wait_ms': self.total_wait * 1000 / self.jobs if self.jobs else 0.0,
+            }
+
+_sqlite_writer = None
+_sqlite_writer_lock = threading.Lock()
+
+def get_sqlite_writer():
+    # fork 이후나 SQLITE_PATH가 바뀌면 (벤치마크/테스트) 새로 만든다
+    global _sqlite_writer
+    writer = _sqlite_writer
+    if writer is None or writer.pid != os.getpid() or writer.path != SQLITE_PATH:
+        with _sqlite_writer_lock:
+            writer = _sqlite_writer
+            if writer is None or writer.pid != os.getpid() or writer.path != SQLITE_PATH:
+                if writer is not None and writer.pid == os.getpid():
+                    writer.close()
+                writer = _sqlite_writer = SQLiteWriteQueue(SQLITE_PATH, SQLITE_GROUP_COMMIT_MAX)
+    return writer
+
+def checkout_connection():
     database_url = os.environ.get('DATABASE_URL')
     if database_url:
         # PostgreSQL 연결
-        conn = psycopg2.connect(database_url)
-        return conn, 'postgresql'
+        return get_pg_pool(database_url).getconn(), 'postgresql'
     else:
         # SQLite 연결 (로컬 개발용)
-        conn = sqlite3.connect('property_links.db')
-        return conn, 'sqlite'
+        return get_sqlite_connection(), 'sqlite'
+
+def primary_db_type():
+    return 'postgresql' if os.environ.get('DATABASE_URL') else 'sqlite'
+
+def replica_sqlite_path(url):
+    # SQLite 복제본은 파일 경로 (sqlite:///경로 형식도 받는다)
+    return url[len('sqlite:///'):] if url.startswith('sqlite:///') else url
+
+def connect_sqlite_replica(path):
+    """복제본 파일을 읽기 전용으로 연다 (저널 모드/동기화 설정은 복제하는 쪽 것을 그대로 쓴다)"""
+    conn = sqlite3.connect(f'file:{quote(os.path.abspath(path))}?mode=ro', uri=True,
+                           timeout=SQLITE_BUSY_TIMEOUT_MS / 1000, cached_statements=SQLITE_CACHED_STATEMENTS)
+    conn.execute(f'PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB}')
+    conn.execute(f'PRAGMA mmap_size = {SQLITE_MMAP_SIZE}')
+    conn.execute(f'PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}')
+    return conn
+
+class ReplicaRouter:
+    """읽기 요청을 보낼 복제본 고르기 (워커마다 하나)
+    
+    백그라운드 스레드가 REPLICA_CHECK_INTERVAL마다 주 DB와 복제본의 data_version 합을 비교해서 지연(밀린 쓰기 수)을 재고,
+    연결되지 않거나 REPLICA_MAX_LAG보다 뒤처진 복제본은 빼고 남은 복제본을 돌아가며 고른다.
+    요청에 필요한 보드 버전(방금 쓴 클라이언트의 쿠키 등)이 있으면 고른 복제본의 그 보드 버전을 확인하고, 모자라면 주 DB를 쓴다.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._pools = {}
+        self._local = threading.local()
+        self._health = {}
+        self._next = 0
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+        self.read_your_writes_fallbacks = 0
+    
+    def ensure_started(self):
+        if not DATABASE_REPLICA_URLS or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            # fork 이후 부모 프로세스의 연결은 쓰지 않는다. 첫 확인 전까지는 모두 주 DB에서 읽는다
+            self._pools = {}
+            self._health = {url: {'healthy': False, 'lag': None, 'error': '', 'checked_at': ''} for url in DATABASE_REPLICA_URLS}
+        threading.Thread(target=self._run, name='replica-monitor', daemon=True).start()
+    
+    def _run(self):
+        monitor_conns = {}
+        while True:
+            self.check(monitor_conns)
+            time.sleep(REPLICA_CHECK_INTERVAL)
+    
+    def _monitor_connection(self, conns, url):
+        # 확인용 연결은 풀과 따로 두고, 매번 최신 커밋을 보도록 트랜잭션 없이 읽는다
+        conn = conns.get(url)
+        if conn is None:
+            if primary_db_type() == 'postgresql':
+                conn = psycopg2.connect(url)
+                conn.autocommit = True
+            elif url is None:
+                conn = connect_sqlite(SQLITE_PATH)
+            else:
+                conn = connect_sqlite_replica(replica_sqlite_path(url))
+            conns[url] = conn
+        return conn
+    
+    def _version_sum(self, conns, url):
+        try:
+            cursor = self._monitor_connection(conns, url).cursor()
+            cursor.execute('SELECT COALESCE(SUM(version), 0) FROM data_version')
+            return cursor.fetchone()[0]
+        except Exception:
+            conn = conns.pop(url, None)
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            raise
+    
+    def check(self, conns):
+        """복제본마다 지연을 다시 잰다 (주 DB 키는 None)"""
+        try:
+            primary = self._version_sum(conns, os.environ.get('DATABASE_URL'))
+        except Exception:
+            # 주 DB를 읽지 못하면 지연을 모르니 상태를 그대로 둔다
+            logger.exception('복제 지연 확인 중 주 DB 오류')
+            return
+        for url in DATABASE_REPLICA_URLS:
+            try:
+                lag = max(primary - self._version_sum(conns, url), 0)
+                health = {'healthy': lag <= REPLICA_MAX_LAG, 'lag': lag, 'error': ''}
+            except Exception as e:
+                health = {'healthy': False, 'lag': None, 'error': str(e).strip()}
+            with self._lock:
+                previous = self._health.get(url, {})
+                self._health[url] = dict(health, checked_at=change_timestamp())
+            if previous.get('healthy') != health['healthy'] and previous.get('checked_at'):
+                logger.warning('복제본 %d %s (지연 %s) %s', DATABASE_REPLICA_URLS.index(url),
+                               '복구' if health['healthy'] else '제외', health['lag'], health['error'])
+    
+    def _getconn(self, url):
+        if primary_db_type() == 'postgresql':
+            with self._lock:
+                replica_pool = self._pools.get(url)
+                if replica_pool is None:
+                    replica_pool = self._pools[url] = PostgresPool(url, DB_POOL_MIN, DB_POOL_MAX, DB_POOL_TIMEOUT)
+            return replica_pool.getconn()
+        # SQLite는 주 DB처럼 스레드마다 복제본 연결 하나씩
+        conns = getattr(self._local, 'conns', None)
+        if conns is None or getattr(self._local, 'pid', None) != os.getpid():
+            conns = self._local.conns = {}
+            self._local.pid = os.getpid()
+        conn = conns.get(url)
+        if conn is None:
+            conn = conns[url] = connect_sqlite_replica(replica_sqlite_path(url))
+        return conn
+    
+    def putconn(self, conn, url):
+        broken = False
+        try:
+            conn.rollback()
+        except Exception:
+            broken = True
+        
+        if primary_db_type() == 'postgresql':
+            self._pools[url].putconn(conn, close=broken or bool(conn.closed))
+        elif broken:
+            getattr(self._local, 'conns', {}).pop(url, None)
+            try:
+                conn.close()
+            except Exception:
+                pass
+    
+    def _mark_down(self, url, error):
+        with self._lock:
+            self._health[url] = {'healthy': False, 'lag': None, 'error': str(error).strip(), 'checked_at': change_timestamp()}
+    
+    def checkout(self, board_id, required_version):
+        """(연결, 복제본 주소) - 쓸 수 있는 복제본이 없거나 보드가 required_version까지 따라오지 못했으면 None"""
+        with self._lock:
+            healthy = [url for url in DATABASE_REPLICA_URLS if self._health.get(url, {}).get('healthy')]
+            if not healthy:
+                self.primary_fallbacks += 1
+                return None
+            url = healthy[self._next % len(healthy)]
+            self._next += 1
+        
+        try:
+            conn = self._getconn(url)
+        except Exception as e:
+            logger.warning('복제본 %d 연결 실패: %s', DATABASE_REPLICA_URLS.index(url), e)
+            self._mark_down(url, e)
+            with self._lock:
+                self.primary_fallbacks += 1
+            return None
+        
+        if required_version:
+            try:
+                cursor = conn.cursor()
+                run_statement(cursor, primary_db_type(), 'SELECT version FROM data_version WHERE id = %s', (board_id,))
+                row = cursor.fetchone()
+            except Exception as e:
+                self.putconn(conn, url)
+                self._mark_down(url, e)
+                with self._lock:
+                    self.primary_fallbacks += 1
+                return None
+            if row is None or row[0] < required_version:
+                self.putconn(conn, url)
+                with self._lock:
+                    self.read_your_writes_fallbacks += 1
+                return None
+        
+        with self._lock:
+            self.replica_reads += 1
+        return conn, url
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'replica_reads': self.replica_reads,
+                'primary_fallbacks': self.primary_fallbacks,
+                'read_your_writes_fallbacks': self.read_your_writes_fallbacks,
+                # 주소에는 비밀번호가 들어 있을 수 있으니 순서 번호로만 보여준다
+                'replicas': [dict(self._health.get(url, {}), index=index) for index, url in enumerate(DATABASE_REPLICA_URLS)],
+            }
+
+replica_router = ReplicaRouter()
+
+def return_connection(conn, db_type):
+    # 커밋되지 않은 트랜잭션은 되돌리고 풀에 반납
+    broken = False
+    try:
+        conn.rollback()
+    except Exception:
+        broken = True
+    
+    if db_type == 'postgresql':
+        get_pg_pool(os.environ.get('DATABASE_URL')).putconn(conn, close=broken or bool(conn.closed))
+    elif broken:
+        _sqlite_local.conn = None
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+# 자주 실행하는 조회문 - PostgreSQL 문법(%s)으로 한 번만 쓰고 방언마다 한 번씩만 변환해 둔다.
+# PostgreSQL은 연결마다 처음 실행할 때 PREPARE해 두고 그다음부터 EXECUTE만 보내서 파싱/계획을 건너뛰고,
+# SQLite는 같은 문자열을 쓰므로 sqlite3 모듈의 연결별 문장 캐시(cached_statements)에서 컴파일된 문장을 다시 쓴다.
+# (pgbouncer 트랜잭션 모드처럼 세션이 바뀌는 연결에서는 PG_PREPARED_STATEMENTS=0)
+PG_PREPARED_STATEMENTS = os.environ.get('PG_PREPARED_STATEMENTS', '1') != '0'
+
+class Statement:
+    __slots__ = ('sql', 'sqlite', 'numbered', 'name', 'prepare', 'execute')
+    
+    def __init__(self, sql, name):
+        numbers = iter(range(1, sql.count('%s') + 1))
+        self.sql = sql
+        self.sqlite = sql.replace('%s', '?')
+        self.numbered = re.sub(r'%s', lambda _: f'${next(numbers)}', sql)  # PREPARE, asyncpg 형식 ($1, $2, ...)
+        self.name = name
+        self.prepare = f'PREPARE {name} AS {self.numbered}'
+        self.execute = f'EXECUTE {name}' + (f" ({', '.join(['%s'] * sql.count('%s'))})" if '%s' in sql else '')
+
+_statements = {}
+_statements_lock = threading.Lock()
+
+def statement(sql):
+    """sql을 변환한 Statement - 같은 문자열은 프로세스에서 한 번만 만든다 (목록 필터 조합도 조합마다 하나)"""
+    stmt = _statements.get(sql)
+    if stmt is None:
+        with _statements_lock:
+            stmt = _statements.get(sql)
+            if stmt is None:
+                stmt = _statements[sql] = Statement(sql, f'stmt_{len(_statements) + 1}')
+    return stmt
+
+def run_statement(cursor, db_type, sql, params=(), prepare=True):
+    """방언에 맞게 변환한 sql을 실행한다 (PostgreSQL은 준비된 문장으로)
+    
+    prepare=False면 PostgreSQL에서도 준비하지 않는다 - INSERT ... SELECT 목록의 파라미터처럼
+    PREPARE가 타입을 text로 정해 버리는 문장용.
+    """
+    stmt = statement(sql)
+    if db_type == 'sqlite':
+        return cursor.execute(stmt.sqlite, params)
+    prepared = getattr(cursor.connection, 'prepared', None)
+    if prepared is None or not PG_PREPARED_STATEMENTS or not prepare:
+        return cursor.execute(stmt.sql, params)
+    if stmt.name not in prepared:
+        # PREPARE는 트랜잭션이 롤백되어도 세션이 끝날 때까지 남는다
+        cursor.execute(stmt.prepare)
+        prepared.add(stmt.name)
+    return cursor.execute(stmt.execute, params)
+
+def run_many(cursor, db_type, sql, rows):
+    """run_statement()의 executemany 판 (준비하지 않는다)"""
+    return cursor.executemany(statement(sql).sqlite if db_type == 'sqlite' else sql, rows)
+
+def id_list_condition(db_type, column, ids):
+    """(column이 ids 중 하나라는 조건, 파라미터) - PostgreSQL은 배열 하나라 id 수와 상관없이 같은 준비된 문장을 쓴다"""
+    if db_type == 'postgresql':
+        return f'{column} = ANY(%s)', [list(ids)]
+    return f"{column} IN ({', '.join(['%s'] * len(ids))})", list(ids)
+
+def insert_values(cursor, db_type, sql, rows, page_size=100, returning_id=False):
+    """sql의 'VALUES %s'에 rows를 넣는다 (PostgreSQL은 execute_values로 page_size개씩 묶어서, SQLite는 executemany)
+    
+    returning_id면 새 행의 id 목록을 돌려준다 (SQLite는 lastrowid를 읽으려고 한 행씩 넣는다).
+    """
+    if db_type == 'postgresql':
+        if returning_id:
+            return [row[0] for row in execute_values(cursor, sql + ' RETURNING id', rows, page_size=page_size, fetch=True)]
+        execute_values(cursor, sql, rows, page_size=page_size)
+        return None
+    if not rows:
+        return [] if returning_id else None
+    sqlite_sql = sql.replace('VALUES %s', f"VALUES ({', '.join('?' * len(rows[0]))})", 1)
+    if not returning_id:
+        cursor.executemany(sqlite_sql, rows)
+        return None
+    new_ids = []
+    for row in rows:
+        cursor.execute(sqlite_sql, row)
+        new_ids.append(cursor.lastrowid)
+    return new_ids
+
+def insert_returning_id(cursor, db_type, sql, params):
+    """INSERT 문을 실행하고 새 행의 id를 돌려준다"""
+    if db_type == 'postgresql':
+        run_statement(cursor, db_type, sql + ' RETURNING id', params)
+        return cursor.fetchone()[0]
+    run_statement(cursor, db_type, sql, params)
+    return cursor.lastrowid
+
+# 요청 계측 - 요청마다 단계별 시간(연결, 쿼리 실행, 행 가져오기, 목록 만들기, JSON 직렬화, 압축),
+# 쿼리 수, 가져온 행 수를 모아서 Server-Timing 헤더와 구조화 로그로 남기고 /metrics에 누적한다
+REQUEST_PHASES = ('connect', 'db', 'fetch', 'build', 'serialize', 'compress')
+METRICS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', 500))
+request_logger = logging.getLogger(__name__ + '.requests')
+
+class RequestMetrics:
+    __slots__ = ('start', 'phases', 'queries', 'rows')
+    
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = dict.fromkeys(REQUEST_PHASES, 0.0)
+        self.queries = 0
+        self.rows = 0
+    
+    def server_timing(self, duration):
+        entries = [f'{phase};dur={seconds * 1000:.2f}' for phase, seconds in self.phases.items() if seconds]
+        entries.append(f'total;dur={duration * 1000:.2f};desc="{self.queries} queries, {self.rows} rows"')
+        return ', '.join(entries)
+
+def current_metrics():
+    return g.get('request_metrics') if has_app_context() else None
+
+@contextmanager
+def timed(phase):
+    metrics = current_metrics()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.phases[phase] += time.perf_counter() - start
+
+class InstrumentedCursor:
+    """DB-API 커서 래퍼 - 실행/가져오기 시간, 쿼리 수, 행 수를 요청 계측에 더한다"""
+    
+    def __init__(self, cursor, metrics):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_metrics', metrics)
+    
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+    
+    def __setattr__(self, name, value):
+        # itersize 같은 커서 설정은 원래 커서에
+        setattr(self._cursor, name, value)
+    
+    def _run(self, method, args, kwargs):
+        start = time.perf_counter()
+        try:
+            method(*args, **kwargs)
+        finally:
+            self._metrics.phases['db'] += time.perf_counter() - start
+            self._metrics.queries += 1
+        return self
+    
+    def execute(self, *args, **kwargs):
+        return self._run(self._cursor.execute, args, kwargs)
+    
+    def executemany(self, *args, **kwargs):
+        return self._run(self._cursor.executemany, args, kwargs)
+    
+    def _fetch(self, method, *args):
+        start = time.perf_counter()
+        rows = method(*args)
+        self._metrics.phases['fetch'] += time.perf_counter() - start
+        return rows
+    
+    def fetchone(self):
+        row = self._fetch(self._cursor.fetchone)
+        if row is not None:
+            self._metrics.rows += 1
+        return row
+    
+    def fetchmany(self, *args):
+        rows = self._fetch(self._cursor.fetchmany, *args)
+        self._metrics.rows += len(rows)
+        return rows
+    
+    def fetchall(self):
+        rows = self._fetch(self._cursor.fetchall)
+        self._metrics.rows += len(rows)
+        return rows
+    
+    def __iter__(self):
+        for row in self._cursor:
+            self._metrics.rows += 1
+            yield row
+
+class InstrumentedConnection:
+    """커서만 InstrumentedCursor로 감싸고 나머지(commit, rollback 등)는 원래 연결에 맡긴다"""
+    
+    def __init__(self, conn, metrics):
+        self._conn = conn
+        self._metrics = metrics
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+    
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs), self._metrics)
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """jsonify()와 app.json.dumps()의 직렬화 시간을 serialize 단계로 잰다
+    
+    orjson이 있으면 orjson으로 직렬화한다 (공백 없는 UTF-8 JSON, 한글을 \\uXXXX로 바꾸지 않는다).
+    날짜 같은 값은 표준 json과 똑같이 self.default로 바꾼다. 들여쓰기(디버그 모드)는 표준 json으로.
+    """
+    
+    ORJSON_OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                      | orjson.OPT_PASSTHROUGH_DATACLASS) if orjson is not None else 0
+    
+    def encode(self, obj, **kwargs):
+        if orjson is not None and 'indent' not in kwargs:
+            return orjson.dumps(obj, default=self.default, option=self.ORJSON_OPTIONS).decode('utf-8')
+        return super().dumps(obj, **kwargs)
+    
+    def dumps(self, obj, **kwargs):
+        metrics = current_metrics()
+        if metrics is None:
+            return self.encode(obj, **kwargs)
+        start = time.perf_counter()
+        try:
+            return self.encode(obj, **kwargs)
+        finally:
+            metrics.phases['serialize'] += time.perf_counter() - start
+
+app.json = TimedJSONProvider(app)
+
+class MetricsRegistry:
+    """워커 프로세스 안에 누적되는 카운터/히스토그램 (gunicorn 워커마다 따로 모인다)"""
+    
+    HELP = {
+        'http_requests_total': ('counter', '응답 상태별 요청 수'),
+        'http_request_duration_seconds': ('histogram', '요청 처리 시간 (스트리밍 응답은 첫 바이트까지)'),
+        'http_request_phase_seconds': ('histogram', '요청 안의 단계별 시간'),
+        'db_queries_total': ('counter', '실행한 쿼리 수'),
+        'db_rows_fetched_total': ('counter', '가져온 행 수'),
+    }
+    
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+    
+    def inc(self, name, labels, amount=1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+    
+    def observe(self, name, labels, value):
+        key = (name, labels)
+        with self._lock:
+            # 버킷별 개수로 세고, 누적 개수는 render()에서 계산한다
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            histogram[bisect_left(self.buckets, value)] += 1
+            histogram[-1] += value
+    
+    def record_request(self, endpoint, method, status, duration, metrics):
+        self.inc('http_requests_total', (('endpoint', endpoint), ('method', method), ('status', str(status))))
+        self.observe('http_request_duration_seconds', (('endpoint', endpoint), ('method', method)), duration)
+        for phase, seconds in metrics.phases.items():
+            if seconds:
+                self.observe('http_request_phase_seconds', (('endpoint', endpoint), ('phase', phase)), seconds)
+        self.inc('db_queries_total', (('endpoint', endpoint),), metrics.queries)
+        self.inc('db_rows_fetched_total', (('endpoint', endpoint),), metrics.rows)
+    
+    def render(self):
+        """Prometheus 텍스트 형식"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, list(value)) for key, value in self._histograms.items())
+        
+        lines = []
+        written = set()
+        def header(name):
+            if name not in written:
+                written.add(name)
+                metric_type, help_text = self.HELP[name]
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {metric_type}')
+        
+        for (name, labels), value in counters:
+            header(name)
+            lines.append(f'{name}{format_labels(labels)} {value}')
+        for (name, labels), histogram in histograms:
+            header(name)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), histogram):
+                cumulative += count
+                lines.append(f'{name}_bucket{format_labels(labels + (("le", str(bound)),))} {cumulative}')
+            lines.append(f'{name}_sum{format_labels(labels)} {histogram[-1]}')
+            lines.append(f'{name}_count{format_labels(labels)} {cumulative}')
+        return lines
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + '}'
+
+request_stats = MetricsRegistry(METRICS_BUCKETS)
+
+@app.before_request
+def start_request_metrics():
+    g.request_metrics = RequestMetrics()
+
+@app.after_request
+def finish_request_metrics(response):
+    metrics = g.pop('request_metrics', None)
+    if metrics is None:
+        return response
+    
+    duration = time.perf_counter() - metrics.start
+    endpoint = request.endpoint or 'unmatched'
+    response.headers['Server-Timing'] = metrics.server_timing(duration)
+    request_stats.record_request(endpoint, request.method, response.status_code, duration, metrics)
+    
+    duration_ms = duration * 1000
+    level = logging.WARNING if duration_ms >= SLOW_REQUEST_MS else logging.INFO
+    if not request_logger.isEnabledFor(level):
+        return response
+    request_logger.log(level, json.dumps({
+        'method': request.method,
+        'path': request.path,
+        'endpoint': endpoint,
+        'status': response.status_code,
+        'duration_ms': round(duration_ms, 2),
+        'phases_ms': {phase: round(seconds * 1000, 2) for phase, seconds in metrics.phases.items()},
+        'queries': metrics.queries,
+        'rows': metrics.rows,
+    }))
+    return response
+
+# 응답 압축 - 목록 응답은 links()에서 압축한 본문까지 캐시하고, 나머지 JSON/HTML 응답은 여기서 압축한다
+# (after_request는 등록 역순으로 불리므로 finish_request_metrics보다 먼저 실행되어 압축 시간도 계측된다)
+def negotiate_encoding(accept_encodings):
+    """Accept-Encoding에서 고른 압축 방식 ('br' 또는 'gzip'), 압축을 받지 않으면 None"""
+    return accept_encodings.best_match(CONTENT_ENCODINGS)
+
+class PrecompressedBody:
+    """본문 하나와 압축 방식별로 한 번씩만 압축해 둔 본문 (첫 화면 HTML, 정적 파일)"""
+    
+    __slots__ = ('body', 'etag', '_encoded')
+    
+    def __init__(self, body, etag):
+        self.body = body
+        self.etag = etag
+        self._encoded = {}
+    
+    def encode(self, encoding):
+        """(본문, Content-Encoding) - 압축한 본문은 처음 요청될 때 만든다"""
+        if encoding is None or len(self.body) < COMPRESS_MIN_BYTES:
+            return self.body, None
+        data = self._encoded.get(encoding)
+        if data is None:
+            data = self._encoded[encoding] = compress_body(self.body, encoding)
+        return data, encoding
+
+def compress_body(data, encoding):
+    with timed('compress'):
+        if encoding == 'br':
+            return brotli.compress(data, quality=BROTLI_QUALITY)
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+def stream_compressor(encoding):
+    """(조각 압축 함수, 마무리 함수) - 조각마다 압축한 바이트를 돌려주고 마무리 함수가 남은 바이트를 내보낸다"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush
+
+def compress_stream(chunks, encoding):
+    """스트리밍 응답을 조각마다 압축한다 (백업처럼 본문 전체를 메모리에 올리지 않는다)"""
+    compress, finish = stream_compressor(encoding)
+    for chunk in chunks:
+        data = compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield finish()
+
+@app.after_request
+def compress_response(response):
+    if (response.status_code != 200 or response.direct_passthrough or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    encoding = negotiate_encoding(request.accept_encodings)
+    response.vary.add('Accept-Encoding')
+    if encoding is None:
+        return response
+    
+    if response.is_streamed:
+        # 원래 이터레이터(stream_with_context)도 닫아야 요청 컨텍스트와 DB 연결이 반납된다
+        if hasattr(response.response, 'close'):
+            response.call_on_close(response.response.close)
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        response.set_data(compress_body(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+# 데이터베이스 연결 함수
+def get_db_connection():
+    """요청(앱 컨텍스트)마다 연결 하나를 빌려 쓰고, 컨텍스트가 끝나면 반납한다"""
+    if 'db_conn' in g:
+        return g.db_handle, g.db_type
+    with timed('connect'):
+        # 복제본에서 읽어도 되는 GET 요청이면 복제본부터 (쓸 수 있는 복제본이 없으면 주 DB)
+        target = read_replica_target()
+        replica = replica_router.checkout(*target) if target is not None else None
+        if replica is not None:
+            conn, g.db_replica = replica
+            db_type = primary_db_type()
+        else:
+            conn, db_type = checkout_connection()
+    g.db_conn = conn
+    g.db_type = db_type
+    # 요청 안에서는 쿼리 시간/행 수를 재는 래퍼를 돌려준다 (풀에는 원래 연결을 반납)
+    metrics = current_metrics()
+    g.db_handle = InstrumentedConnection(conn, metrics) if metrics is not None else conn
+    return g.db_handle, db_type
+
+@app.teardown_appcontext
+def release_db_connection(exc):
+    g.pop('db_handle', None)
+    conn = g.pop('db_conn', None)
+    db_type = g.pop('db_type', None)
+    replica = g.pop('db_replica', None)
+    if conn is not None and replica is not None:
+        replica_router.putconn(conn, replica)
+    elif conn is not None:
+        return_connection(conn, db_type)
+
+# 읽기/쓰기 나누기 - REPLICA_ENDPOINTS의 GET 요청만 복제본에서 읽고, 쓰기와 나머지 읽기는 주 DB에서 한다.
+# 쓰기 요청이 성공하면 그 보드의 새 버전을 쿠키(REPLICA_WRITE_COOKIE, "보드:버전_보드:버전")에 남겨서
+# 같은 클라이언트의 다음 읽기는 그 버전까지 따라온 복제본이나 주 DB에서 읽는다 (자기가 쓴 내용은 바로 보인다)
+REPLICA_COOKIE_BOARDS = 20
+
+def parse_write_versions(cookie):
+    """REPLICA_WRITE_COOKIE 값 -> {보드 id: 이 클라이언트가 마지막으로 쓴 버전} (ASGI 앱도 함께 사용)"""
+    versions = {}
+    for entry in cookie.split('_'):
+        board_id, _, version = entry.partition(':')
+        if board_id.isdigit() and version.isdigit():
+            versions[int(board_id)] = int(version)
+    return versions
+
+def write_versions_cookie(versions, board_id, version):
+    """versions에 board_id의 새 버전을 맨 뒤로 넣은 쿠키 값 - 최근에 쓴 보드만 남긴다"""
+    versions = dict(versions)
+    versions.pop(board_id, None)
+    versions[board_id] = version
+    return '_'.join(f'{key}:{value}' for key, value in list(versions.items())[-REPLICA_COOKIE_BOARDS:])
+
+def written_versions():
+    """쿠키에 남은 {보드 id: 이 클라이언트가 마지막으로 쓴 버전}"""
+    return parse_write_versions(request.cookies.get(REPLICA_WRITE_COOKIE, ''))
+
+def read_replica_target():
+    """복제본에서 읽을 요청이면 (보드 id, 복제본에 있어야 하는 최소 보드 버전), 아니면 None"""
+    if (not DATABASE_REPLICA_URLS or not has_request_context() or request.method != 'GET'
+            or request.endpoint not in REPLICA_ENDPOINTS):
+        return None
+    replica_router.ensure_started()
+    board_id = (request.view_args or {}).get('board_id', DEFAULT_BOARD_ID)
+    # 방금 쓴 버전(쿠키), 변경 알림으로 받은 버전(?min_version=), 클라이언트가 이미 받은 버전(?since=)보다 뒤처지면 안 된다
+    required_version = max(written_versions().get(board_id, 0), request.args.get('min_version', 0, type=int),
+                           request.args.get('since', 0, type=int))
+    return board_id, required_version
+
+@app.after_request
+def remember_write_version(response):
+    if (not DATABASE_REPLICA_URLS or request.method not in ('POST', 'PUT', 'PATCH', 'DELETE')
+            or response.status_code >= 400):
+        return response
+    board_id = (request.view_args or {}).get('board_id')
+    if board_id is None and request.endpoint == 'boards':
+        # 새 보드는 응답의 id (작은 응답이라 아직 압축되지 않았다)
+        board_id = (response.get_json(silent=True) or {}).get('id')
+    if board_id is None:
+        return response
+    
+    conn, db_type = get_db_connection()
+    try:
+        version = get_data_version(conn.cursor(), db_type, board_id)
+    except BoardNotFound:
+        return response
+    value = write_versions_cookie(written_versions(), board_id, version)
+    response.set_cookie(REPLICA_WRITE_COOKIE, value, max_age=REPLICA_WRITE_COOKIE_MAX_AGE, httponly=True, samesite='Lax')
+    return response
+
+class NothingWritten(Exception):
+    """run_write 작업이 결국 바꾼 것이 없을 때 던진다 - 작업을 되돌리고 result를 run_write의 결과로 돌려준다"""
+    
+    def __init__(self, result=None):
+        super().__init__()
+        self.result = result
+
+def run_write(work):
+    """쓰기 작업 work(cursor, db_type)를 트랜잭션 하나로 실행하고 커밋한 뒤 결과를 돌려준다
+    
+    SQLite는 쓰기 큐로 보내서 같은 워커의 다른 쓰기와 함께 커밋한다.
+    work는 DB 문장만 실행한다 - 요청 본문이나 외부 자원은 미리 읽어서 넘긴다 (SQLiteWriteQueue 참고).
+    """
+    conn, db_type = get_db_connection()
+    try:
+        if db_type == 'sqlite' and SQLITE_WRITE_QUEUE:
+            with timed('db'):
+                return get_sqlite_writer().submit(work)
+        cursor = conn.cursor()
+        result = work(cursor, db_type)
+        conn.commit()
+        return result
+    except NothingWritten as e:
+        if not (db_type == 'sqlite' and SQLITE_WRITE_QUEUE):
+            conn.rollback()
+        return e.result
+
+def pool_stats():
+    if os.environ.get('DATABASE_URL'):
+        stats = get_pg_pool(os.environ.get('DATABASE_URL')).stats()
+    else:
+        stats = {
+            'backend': 'sqlite',
+            'connects': _sqlite_stats['connects'],
+            'checkouts': _sqlite_stats['checkouts'],
+        }
+        if _sqlite_writer is not None:
+            stats.update(_sqlite_writer.stats())
+    if DATABASE_REPLICA_URLS:
+        stats.update(replica_router.stats())
+    return stats
 
 # 데이터베이스 초기화
-def init_db():
+def init_db(schema_version=None):
+    """테이블을 만들고 schema_version까지 마이그레이션 (None이면 최신 버전까지)"""
+    if not has_app_context():
+        with app.app_context():
+            return init_db(schema_version)
+    
     conn, db_type = get_db_connection()
     cursor = conn.cursor()
     
@@ -75,72 +1388,1258 @@ def init_db():
             )
         ''')
         
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS customer_info (
-                id INTEGER PRIMARY KEY,
-                customer_name TEXT DEFAULT '000',
-                move_in_date TEXT DEFAULT ''
-            )
-        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS customer_info (
+                id INTEGER PRIMARY KEY,
+                customer_name TEXT DEFAULT '000',
+                move_in_date TEXT DEFAULT ''
+            )
+        ''')
+        
+        cursor.execute('INSERT OR IGNORE INTO customer_info (id, customer_name, move_in_date) VALUES (1, "제일좋은집 찾아드릴분", "")')
+    
+    conn.commit()
+    
+    return migrate_db(conn, db_type, schema_version)
+
+# 스키마 마이그레이션 (버전, 설명, 방언별 SQL) - 버전 순서대로 한 번씩만 적용
+MIGRATIONS = [
+    (1, '목록 필터 조합용 인덱스 (id DESC 정렬, liked/disliked는 커버링 컬럼)', {
+        'postgresql': [
+            'CREATE INDEX IF NOT EXISTS idx_links_platform_id ON links (platform, id) INCLUDE (liked, disliked)',
+            'CREATE INDEX IF NOT EXISTS idx_links_platform_added_by_id ON links (platform, added_by, id) INCLUDE (liked, disliked)',
+            'CREATE INDEX IF NOT EXISTS idx_links_added_by_id ON links (added_by, id) INCLUDE (liked, disliked)',
+            'CREATE INDEX IF NOT EXISTS idx_links_date_added_id ON links (date_added, id)',
+            'CREATE INDEX IF NOT EXISTS idx_links_liked_id ON links (id) WHERE liked = TRUE',
+            'CREATE INDEX IF NOT EXISTS idx_links_disliked_id ON links (id) WHERE disliked = TRUE',
+        ],
+        'sqlite': [
+            'CREATE INDEX IF NOT EXISTS idx_links_platform_id ON links (platform, id, liked, disliked)',
+            'CREATE INDEX IF NOT EXISTS idx_links_platform_added_by_id ON links (platform, added_by, id, liked, disliked)',
+            'CREATE INDEX IF NOT EXISTS idx_links_added_by_id ON links (added_by, id, liked, disliked)',
+            'CREATE INDEX IF NOT EXISTS idx_links_date_added_id ON links (date_added, id)',
+            'CREATE INDEX IF NOT EXISTS idx_links_liked_id ON links (id) WHERE liked = 1',
+            'CREATE INDEX IF NOT EXISTS idx_links_disliked_id ON links (id) WHERE disliked = 1',
+            'ANALYZE',
+        ],
+    }),
+    (2, '목록 응답 캐시/ETag용 데이터 버전', {
+        'postgresql': [
+            'CREATE TABLE IF NOT EXISTS data_version (id INTEGER PRIMARY KEY, version BIGINT NOT NULL)',
+            'INSERT INTO data_version (id, version) VALUES (1, 1) ON CONFLICT (id) DO NOTHING',
+        ],
+        'sqlite': [
+            'CREATE TABLE IF NOT EXISTS data_version (id INTEGER PRIMARY KEY, version INTEGER NOT NULL)',
+            'INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 1)',
+        ],
+    }),
+    (3, '변경분 동기화용 변경 순번, 수정 시각, 삭제 기록', {
+        'postgresql': [
+            'ALTER TABLE links ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT 0',
+            "ALTER TABLE links ADD COLUMN IF NOT EXISTS updated_at TEXT DEFAULT ''",
+            'CREATE INDEX IF NOT EXISTS idx_links_change_seq ON links (change_seq)',
+            '''CREATE TABLE IF NOT EXISTS link_tombstones (
+                link_id INTEGER PRIMARY KEY,
+                change_seq BIGINT NOT NULL,
+                deleted_at TEXT NOT NULL
+            )''',
+            'CREATE INDEX IF NOT EXISTS idx_link_tombstones_change_seq ON link_tombstones (change_seq)',
+            'ALTER TABLE data_version ADD COLUMN IF NOT EXISTS reset_seq BIGINT NOT NULL DEFAULT 0',
+        ],
+        'sqlite': [
+            'ALTER TABLE links ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0',
+            "ALTER TABLE links ADD COLUMN updated_at TEXT DEFAULT ''",
+            'CREATE INDEX IF NOT EXISTS idx_links_change_seq ON links (change_seq)',
+            '''CREATE TABLE IF NOT EXISTS link_tombstones (
+                link_id INTEGER PRIMARY KEY,
+                change_seq INTEGER NOT NULL,
+                deleted_at TEXT NOT NULL
+            )''',
+            'CREATE INDEX IF NOT EXISTS idx_link_tombstones_change_seq ON link_tombstones (change_seq)',
+            'ALTER TABLE data_version ADD COLUMN reset_seq INTEGER NOT NULL DEFAULT 0',
+        ],
+    }),
+    (4, 'url/메모 검색 (n-gram 토큰 컬럼과 전문 검색 인덱스)', {
+        'postgresql': [
+            "ALTER TABLE links ADD COLUMN IF NOT EXISTS url_tokens TEXT NOT NULL DEFAULT ''",
+            "ALTER TABLE links ADD COLUMN IF NOT EXISTS memo_tokens TEXT NOT NULL DEFAULT ''",
+            lambda cursor, db_type: backfill_search_tokens(cursor, db_type),
+            "CREATE INDEX IF NOT EXISTS idx_links_search ON links USING GIN (to_tsvector('simple', url_tokens || ' ' || memo_tokens))",
+        ],
+        'sqlite': [
+            "ALTER TABLE links ADD COLUMN url_tokens TEXT NOT NULL DEFAULT ''",
+            "ALTER TABLE links ADD COLUMN memo_tokens TEXT NOT NULL DEFAULT ''",
+            lambda cursor, db_type: backfill_search_tokens(cursor, db_type),
+            "CREATE VIRTUAL TABLE IF NOT EXISTS links_fts USING fts5(url_tokens, memo_tokens, content='links', content_rowid='id')",
+            "INSERT INTO links_fts(links_fts) VALUES ('rebuild')",
+            '''CREATE TRIGGER IF NOT EXISTS links_fts_insert AFTER INSERT ON links BEGIN
+                INSERT INTO links_fts (rowid, url_tokens, memo_tokens) VALUES (new.id, new.url_tokens, new.memo_tokens);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS links_fts_delete AFTER DELETE ON links BEGIN
+                INSERT INTO links_fts (links_fts, rowid, url_tokens, memo_tokens) VALUES ('delete', old.id, old.url_tokens, old.memo_tokens);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS links_fts_update AFTER UPDATE OF url_tokens, memo_tokens ON links BEGIN
+                INSERT INTO links_fts (links_fts, rowid, url_tokens, memo_tokens) VALUES ('delete', old.id, old.url_tokens, old.memo_tokens);
+                INSERT INTO links_fts (rowid, url_tokens, memo_tokens) VALUES (new.id, new.url_tokens, new.memo_tokens);
+            END''',
+        ],
+    }),
+    (5, '보드(고객)별 링크 - board_id, 보드별 데이터 버전, 보드로 시작하는 인덱스/파티션', {
+        # PostgreSQL은 links를 board_id 해시 파티션 테이블로 옮긴다 (보드 하나는 파티션 하나 안에 있음)
+        'postgresql': [
+            'ALTER TABLE links ADD COLUMN IF NOT EXISTS board_id INTEGER NOT NULL DEFAULT 1',
+            'ALTER TABLE link_tombstones ADD COLUMN IF NOT EXISTS board_id INTEGER NOT NULL DEFAULT 1',
+            'INSERT INTO data_version (id, version) SELECT id, 1 FROM customer_info ON CONFLICT (id) DO NOTHING',
+            'ALTER SEQUENCE links_id_seq OWNED BY NONE',
+            'ALTER TABLE links RENAME TO links_single',
+            'ALTER TABLE links_single RENAME CONSTRAINT links_pkey TO links_single_pkey',
+            '''CREATE TABLE links (
+                LIKE links_single INCLUDING DEFAULTS,
+                PRIMARY KEY (board_id, id)
+            ) PARTITION BY HASH (board_id)''',
+            lambda cursor, db_type: create_link_partitions(cursor),
+            'INSERT INTO links SELECT * FROM links_single',
+            'DROP TABLE links_single',
+            'ALTER SEQUENCE links_id_seq OWNED BY links.id',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_platform_id ON links (board_id, platform, id) INCLUDE (liked, disliked)',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_platform_added_by_id ON links (board_id, platform, added_by, id) INCLUDE (liked, disliked)',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_added_by_id ON links (board_id, added_by, id) INCLUDE (liked, disliked)',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_date_added_id ON links (board_id, date_added, id)',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_liked_id ON links (board_id, id) WHERE liked = TRUE',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_disliked_id ON links (board_id, id) WHERE disliked = TRUE',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_change_seq ON links (board_id, change_seq)',
+            "CREATE INDEX IF NOT EXISTS idx_links_search ON links USING GIN (to_tsvector('simple', url_tokens || ' ' || memo_tokens))",
+            'DROP INDEX IF EXISTS idx_link_tombstones_change_seq',
+            'CREATE INDEX IF NOT EXISTS idx_link_tombstones_board_change_seq ON link_tombstones (board_id, change_seq)',
+        ],
+        # SQLite는 파티션이 없으므로 모든 인덱스를 board_id로 시작해서 보드 하나의 행이 인덱스에서 붙어 있게 한다
+        'sqlite': [
+            'ALTER TABLE links ADD COLUMN board_id INTEGER NOT NULL DEFAULT 1',
+            'ALTER TABLE link_tombstones ADD COLUMN board_id INTEGER NOT NULL DEFAULT 1',
+            'INSERT OR IGNORE INTO data_version (id, version) SELECT id, 1 FROM customer_info',
+            'DROP INDEX IF EXISTS idx_links_platform_id',
+            'DROP INDEX IF EXISTS idx_links_platform_added_by_id',
+            'DROP INDEX IF EXISTS idx_links_added_by_id',
+            'DROP INDEX IF EXISTS idx_links_date_added_id',
+            'DROP INDEX IF EXISTS idx_links_liked_id',
+            'DROP INDEX IF EXISTS idx_links_disliked_id',
+            'DROP INDEX IF EXISTS idx_links_change_seq',
+            'DROP INDEX IF EXISTS idx_link_tombstones_change_seq',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_id ON links (board_id, id, liked, disliked)',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_platform_id ON links (board_id, platform, id, liked, disliked)',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_platform_added_by_id ON links (board_id, platform, added_by, id, liked, disliked)',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_added_by_id ON links (board_id, added_by, id, liked, disliked)',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_date_added_id ON links (board_id, date_added, id)',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_liked_id ON links (board_id, id) WHERE liked = 1',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_disliked_id ON links (board_id, id) WHERE disliked = 1',
+            'CREATE INDEX IF NOT EXISTS idx_links_board_change_seq ON links (board_id, change_seq)',
+            'CREATE INDEX IF NOT EXISTS idx_link_tombstones_board_change_seq ON link_tombstones (board_id, change_seq)',
+            'ANALYZE',
+        ],
+    }),
+    (6, '매물 정보(제목, 가격, 면적, 썸네일) 캐시 - url마다 한 행 (보드가 달라도 같은 url이면 공유)', {
+        'postgresql': [
+            '''CREATE TABLE IF NOT EXISTS link_metadata (
+                url TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                title TEXT NOT NULL DEFAULT '',
+                price TEXT NOT NULL DEFAULT '',
+                area TEXT NOT NULL DEFAULT '',
+                thumbnail TEXT NOT NULL DEFAULT '',
+                error TEXT NOT NULL DEFAULT '',
+                fetched_at TEXT NOT NULL,
+                expires_at TEXT NOT NULL
+            )''',
+        ],
+        'sqlite': [
+            '''CREATE TABLE IF NOT EXISTS link_metadata (
+                url TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                title TEXT NOT NULL DEFAULT '',
+                price TEXT NOT NULL DEFAULT '',
+                area TEXT NOT NULL DEFAULT '',
+                thumbnail TEXT NOT NULL DEFAULT '',
+                error TEXT NOT NULL DEFAULT '',
+                fetched_at TEXT NOT NULL,
+                expires_at TEXT NOT NULL
+            )''',
+        ],
+    }),
+    (7, '정규화한 url 키 (보드 안 중복 매물 찾기)', {
+        'postgresql': [
+            "ALTER TABLE links ADD COLUMN IF NOT EXISTS url_key TEXT NOT NULL DEFAULT ''",
+            lambda cursor, db_type: backfill_url_keys(cursor, db_type),
+            'CREATE INDEX IF NOT EXISTS idx_links_board_url_key ON links (board_id, url_key)',
+        ],
+        'sqlite': [
+            "ALTER TABLE links ADD COLUMN url_key TEXT NOT NULL DEFAULT ''",
+            lambda cursor, db_type: backfill_url_keys(cursor, db_type),
+            'CREATE INDEX IF NOT EXISTS idx_links_board_url_key ON links (board_id, url_key)',
+        ],
+    }),
+    (8, '보관함 - 오래된/싫어요 링크를 옮겨 두는 archived_links (파티션 없음, id는 links와 같은 번호를 유지)', {
+        'postgresql': [
+            '''CREATE TABLE IF NOT EXISTS archived_links (
+                LIKE links INCLUDING DEFAULTS,
+                archived_at TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (board_id, id)
+            )''',
+        ],
+        'sqlite': [
+            '''CREATE TABLE IF NOT EXISTS archived_links (
+                id INTEGER NOT NULL,
+                board_id INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                added_by TEXT NOT NULL,
+                date_added TEXT NOT NULL,
+                rating INTEGER DEFAULT 5,
+                liked BOOLEAN DEFAULT 0,
+                disliked BOOLEAN DEFAULT 0,
+                memo TEXT DEFAULT '',
+                customer_name TEXT DEFAULT '000',
+                move_in_date TEXT DEFAULT '',
+                change_seq INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT DEFAULT '',
+                url_tokens TEXT NOT NULL DEFAULT '',
+                memo_tokens TEXT NOT NULL DEFAULT '',
+                url_key TEXT NOT NULL DEFAULT '',
+                archived_at TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (board_id, id)
+            )''',
+        ],
+    }),
+    (9, '보드 요약 카운터 (link_counters) - 트리거로 맞추고 기존 링크로 한 번 채운다', {
+        'postgresql': [
+            '''CREATE TABLE IF NOT EXISTS link_counters (
+                board_id INTEGER NOT NULL,
+                dimension TEXT NOT NULL,
+                name TEXT NOT NULL,
+                link_count BIGINT NOT NULL DEFAULT 0,
+                rating_sum BIGINT NOT NULL DEFAULT 0,
+                PRIMARY KEY (board_id, dimension, name)
+            )''',
+            # 문장 단위 트리거 - 일괄 INSERT/DELETE도 (보드, 차원, 값)마다 한 번씩만 고친다
+            postgres_counter_function('link_counters_apply', LINK_COUNTER_DIMENSIONS),
+            postgres_counter_function('archived_counters_apply', [('archived', None)]),
+            'DROP TRIGGER IF EXISTS link_counters_insert ON links',
+            'CREATE TRIGGER link_counters_insert AFTER INSERT ON links REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE PROCEDURE link_counters_apply()',
+            'DROP TRIGGER IF EXISTS link_counters_update ON links',
+            'CREATE TRIGGER link_counters_update AFTER UPDATE ON links REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE PROCEDURE link_counters_apply()',
+            'DROP TRIGGER IF EXISTS link_counters_delete ON links',
+            'CREATE TRIGGER link_counters_delete AFTER DELETE ON links REFERENCING OLD TABLE AS old_rows '
+            'FOR EACH STATEMENT EXECUTE PROCEDURE link_counters_apply()',
+            'DROP TRIGGER IF EXISTS archived_counters_insert ON archived_links',
+            'CREATE TRIGGER archived_counters_insert AFTER INSERT ON archived_links REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE PROCEDURE archived_counters_apply()',
+            'DROP TRIGGER IF EXISTS archived_counters_update ON archived_links',
+            'CREATE TRIGGER archived_counters_update AFTER UPDATE ON archived_links REFERENCING OLD TABLE AS old_rows '
+            'NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE PROCEDURE archived_counters_apply()',
+            'DROP TRIGGER IF EXISTS archived_counters_delete ON archived_links',
+            'CREATE TRIGGER archived_counters_delete AFTER DELETE ON archived_links REFERENCING OLD TABLE AS old_rows '
+            'FOR EACH STATEMENT EXECUTE PROCEDURE archived_counters_apply()',
+            rebuild_link_counters,
+        ],
+        'sqlite': [
+            '''CREATE TABLE IF NOT EXISTS link_counters (
+                board_id INTEGER NOT NULL,
+                dimension TEXT NOT NULL,
+                name TEXT NOT NULL,
+                link_count INTEGER NOT NULL DEFAULT 0,
+                rating_sum INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (board_id, dimension, name)
+            ) WITHOUT ROWID''',
+            f'''CREATE TRIGGER IF NOT EXISTS link_counters_insert AFTER INSERT ON links BEGIN
+                {sqlite_counter_trigger('new', 1)}
+            END''',
+            f'''CREATE TRIGGER IF NOT EXISTS link_counters_delete AFTER DELETE ON links BEGIN
+                {sqlite_counter_trigger('old', -1)}
+            END''',
+            f'''CREATE TRIGGER IF NOT EXISTS link_counters_update
+            AFTER UPDATE OF board_id, platform, added_by, date_added, rating, liked, disliked ON links BEGIN
+                {sqlite_counter_trigger('old', -1)}
+                {sqlite_counter_trigger('new', 1)}
+            END''',
+            f'''CREATE TRIGGER IF NOT EXISTS archived_counters_insert AFTER INSERT ON archived_links BEGIN
+                {sqlite_counter_trigger('new', 1, [('archived', None)])}
+            END''',
+            f'''CREATE TRIGGER IF NOT EXISTS archived_counters_delete AFTER DELETE ON archived_links BEGIN
+                {sqlite_counter_trigger('old', -1, [('archived', None)])}
+            END''',
+            f'''CREATE TRIGGER IF NOT EXISTS archived_counters_update AFTER UPDATE OF board_id, rating ON archived_links BEGIN
+                {sqlite_counter_trigger('old', -1, [('archived', None)])}
+                {sqlite_counter_trigger('new', 1, [('archived', None)])}
+            END''',
+            rebuild_link_counters,
+        ],
+    }),
+    (10, '삭제 기록을 지운 마지막 변경 순번 (그보다 오래된 since는 전체 다시 읽기)', {
+        'postgresql': [
+            'ALTER TABLE data_version ADD COLUMN IF NOT EXISTS pruned_seq BIGINT NOT NULL DEFAULT 0',
+        ],
+        'sqlite': [
+            'ALTER TABLE data_version ADD COLUMN pruned_seq INTEGER NOT NULL DEFAULT 0',
+        ],
+    }),
+    (11, '보관한 링크도 중복 추가 검사에 쓰도록 archived_links (보드, url_key) 인덱스', {
+        'postgresql': [
+            'CREATE INDEX IF NOT EXISTS idx_archived_links_board_url_key ON archived_links (board_id, url_key)',
+        ],
+        'sqlite': [
+            'CREATE INDEX IF NOT EXISTS idx_archived_links_board_url_key ON archived_links (board_id, url_key)',
+        ],
+    }),
+]
+
+def create_link_partitions(cursor):
+    for remainder in range(LINK_PARTITIONS):
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS links_p{remainder} PARTITION OF links
+            FOR VALUES WITH (MODULUS {LINK_PARTITIONS}, REMAINDER {remainder})
+        ''')
+
+def get_schema_version(cursor):
+    cursor.execute('SELECT MAX(version) FROM schema_version')
+    row = cursor.fetchone()
+    return row[0] if row and row[0] is not None else 0
+
+def migrate_db(conn, db_type, target=None):
+    """적용되지 않은 마이그레이션을 차례로 적용하고 현재 스키마 버전을 돌려준다"""
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    ''')
+    if db_type == 'postgresql':
+        # 여러 워커가 동시에 시작해도 한 곳에서만 마이그레이션하도록 잠금
+        cursor.execute('SELECT pg_advisory_xact_lock(72521001)')
+    
+    current = get_schema_version(cursor)
+    for version, description, statements in MIGRATIONS:
+        if version <= current or (target is not None and version > target):
+            continue
+        
+        # sqlite3 모듈은 DDL 앞에서 트랜잭션을 열지 않으므로 직접 열어서
+        # 마이그레이션 하나(문장들 + schema_version 기록)를 통째로 적용하거나 통째로 되돌린다.
+        # 중간에 실패해도 다음 실행이 "duplicate column name" 없이 처음부터 다시 적용한다.
+        # PostgreSQL은 잠금을 잡은 트랜잭션 하나로 전부 적용한다.
+        if db_type == 'sqlite':
+            cursor.execute('BEGIN IMMEDIATE')
+        try:
+            for statement in statements[db_type]:
+                # 문자열은 SQL, 함수는 파이썬으로 처리해야 하는 단계 (데이터 채우기 등)
+                if callable(statement):
+                    statement(cursor, db_type)
+                else:
+                    cursor.execute(statement)
+            
+            run_statement(cursor, db_type, 'INSERT INTO schema_version (version, description, applied_at) VALUES (%s, %s, %s)',
+                          (version, description, datetime.now().isoformat()))
+        except Exception:
+            conn.rollback()
+            raise
+        if db_type == 'sqlite':
+            conn.commit()
+        logger.info('스키마 마이그레이션 %d 적용: %s', version, description)
+        current = version
+    
+    conn.commit()
+    return current
+
+# 링크 데이터 버전 - 보드마다 하나 (data_version.id = 보드 id).
+# 링크를 바꾸는 모든 쓰기에서 같은 트랜잭션 안에서 올린다.
+# DB에 저장하므로 다른 gunicorn 워커의 캐시도 다음 조회 때 무효화된다.
+# 올린 버전은 바뀐 행의 change_seq로도 쓴다 (변경분 동기화).
+class BoardNotFound(Exception):
+    def __init__(self, board_id):
+        super().__init__(f'보드 {board_id}를 찾을 수 없습니다.')
+        self.board_id = board_id
+
+@app.errorhandler(BoardNotFound)
+def board_not_found(e):
+    return jsonify({'success': False, 'error': str(e)}), 404
+
+def get_data_version(cursor, db_type, board_id):
+    run_statement(cursor, db_type, 'SELECT version FROM data_version WHERE id = %s', (board_id,))
+    row = cursor.fetchone()
+    if row is None:
+        raise BoardNotFound(board_id)
+    return row[0]
+
+def bump_data_version(cursor, db_type, board_id):
+    """보드 버전을 올리고 새 버전을 돌려준다
+    
+    data_version 행 잠금이 커밋까지 유지되므로 같은 보드의 쓰기 트랜잭션은 이 순번 순서대로 커밋된다.
+    다른 보드의 쓰기는 서로 기다리지 않는다.
+    """
+    run_statement(cursor, db_type, 'UPDATE data_version SET version = version + 1 WHERE id = %s', (board_id,))
+    if cursor.rowcount == 0:
+        raise BoardNotFound(board_id)
+    return get_data_version(cursor, db_type, board_id)
+
+def change_timestamp():
+    return datetime.now().isoformat(timespec='seconds')
+
+# 변경 알림 (SSE) - 이벤트에는 무엇이 바뀌었는지만 담고, 내용은 /api/links/changes로 가져간다
+def notify_change(cursor, db_type, event):
+    """쓰기 트랜잭션 안에서 부른다. PostgreSQL은 커밋될 때 모든 워커에 NOTIFY가 전달된다.
+    
+    SQLite는 워커마다 도는 ChangeHub 폴러가 data_version 변화를 보고 알린다.
+    """
+    if db_type == 'postgresql':
+        if len(event.get('ids', ())) > MAX_EVENT_IDS:
+            event = {key: value for key, value in event.items() if key != 'ids'}
+        cursor.execute('SELECT pg_notify(%s, %s)', (CHANGE_CHANNEL, json.dumps(event)))
+
+class ChangeHub:
+    """워커 프로세스 안의 구독/발행 허브 - SSE 연결마다 큐 하나, 이벤트는 그 보드 구독자에게만"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # board_id -> 구독 큐 set
+        self._count = 0
+        self._pid = None
+    
+    def subscribe(self, board_id, subscriber=None, max_clients=None):
+        """board_id의 이벤트를 받을 큐 (put_nowait가 있으면 무엇이든) - 연결이 max_clients(기본 SSE_MAX_CLIENTS)개면 None"""
+        if subscriber is None:
+            subscriber = queue.Queue(maxsize=100)
+        with self._lock:
+            if self._count >= (SSE_MAX_CLIENTS if max_clients is None else max_clients):
+                return None
+            self._subscribers.setdefault(board_id, set()).add(subscriber)
+            self._count += 1
+        return subscriber
+    
+    def unsubscribe(self, board_id, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(board_id)
+            if subscribers and subscriber in subscribers:
+                subscribers.discard(subscriber)
+                self._count -= 1
+                if not subscribers:
+                    del self._subscribers[board_id]
+    
+    def board_ids(self):
+        with self._lock:
+            return list(self._subscribers)
+    
+    def client_count(self):
+        with self._lock:
+            return self._count
+    
+    def publish(self, event):
+        if event.get('type') in ('customer_info', 'reset'):
+            index_page_cache.invalidate(event.get('board_id'))
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.get('board_id'), ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # 밀린 클라이언트는 이벤트를 버려도 다음 이벤트 때 변경분을 한꺼번에 가져간다
+                pass
+    
+    def ensure_started(self):
+        # fork된 워커마다 수신 스레드를 하나씩 띄운다
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._subscribers = {}
+            self._count = 0
+        
+        database_url = os.environ.get('DATABASE_URL')
+        if database_url:
+            target, args = self._listen_postgres, (database_url,)
+        else:
+            target, args = self._poll_sqlite, (SQLITE_PATH,)
+        threading.Thread(target=target, args=args, name='change-hub', daemon=True).start()
+    
+    def _listen_postgres(self, database_url):
+        while True:
+            try:
+                conn = psycopg2.connect(database_url)
+                conn.autocommit = True
+                conn.cursor().execute(f'LISTEN {CHANGE_CHANNEL}')
+                # 다시 연결된 경우 그동안 놓친 변경이 있을 수 있으니 동기화하라고 알린다
+                index_page_cache.clear()
+                for board_id in self.board_ids():
+                    self.publish({'type': 'links', 'board_id': board_id})
+                while True:
+                    if select.select([conn], [], [], SSE_HEARTBEAT) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self.publish(json.loads(conn.notifies.pop(0).payload))
+            except Exception:
+                logger.exception('변경 알림 LISTEN 연결 오류, 다시 연결합니다')
+                time.sleep(5)
+    
+    def _poll_sqlite(self, path):
+        # 구독자가 있는 보드와 첫 화면을 캐시한 보드만 본다
+        conn = connect_sqlite(path)
+        last = {}
+        while True:
+            try:
+                cached_pages = index_page_cache.customers()
+                board_ids = sorted(set(self.board_ids()) | set(cached_pages))
+                current = {}
+                customers = {}
+                if board_ids:
+                    placeholders = ', '.join('?' * len(board_ids))
+                    versions = conn.execute(f'SELECT id, version, reset_seq FROM data_version WHERE id IN ({placeholders})',
+                                            board_ids).fetchall()
+                    customers = dict((row[0], row[1:]) for row in conn.execute(
+                        f'SELECT id, customer_name, move_in_date FROM customer_info WHERE id IN ({placeholders})', board_ids))
+                    conn.rollback()
+                    for board_id, version, reset_seq in versions:
+                        current[board_id] = (version, reset_seq, customers.get(board_id))
+                
+                # 캐시한 첫 화면은 렌더링할 때의 고객 정보와 비교한다 (폴링을 시작하기 전의 변경도 놓치지 않는다)
+                for board_id, customer in cached_pages.items():
+                    if customers.get(board_id) != customer:
+                        index_page_cache.invalidate(board_id)
+                
+                for board_id, state in current.items():
+                    previous = last.get(board_id)
+                    if previous is None:
+                        continue
+                    version, reset_seq, customer = state
+                    if reset_seq != previous[1]:
+                        self.publish({'type': 'reset', 'board_id': board_id, 'version': version})
+                    elif version != previous[0]:
+                        self.publish({'type': 'links', 'board_id': board_id, 'version': version})
+                    if customer != previous[2]:
+                        self.publish({'type': 'customer_info', 'board_id': board_id})
+                last = current
+            except Exception:
+                logger.exception('변경 알림 폴링 오류')
+            time.sleep(SSE_POLL_INTERVAL)
+
+change_hub = ChangeHub()
+
+# 매물 정보 보강 - 링크 추가 요청은 기다리지 않고 워커 스레드가 url을 가져와서 link_metadata에 저장한다.
+# 같은 url은 보드가 달라도 한 번만 가져오고, METADATA_TTL_HOURS가 지나면 다음에 볼 때 다시 가져온다.
+class MetadataPageParser(HTMLParser):
+    """<title>과 <meta property/name=... content=...>만 모은다"""
+    
+    def __init__(self):
+        super().__init__()
+        self.meta = {}
+        self.title = ''
+        self._in_title = False
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'meta':
+            key = attrs.get('property') or attrs.get('name')
+            if key and attrs.get('content'):
+                self.meta.setdefault(key.lower(), attrs['content'].strip())
+        elif tag == 'title':
+            self._in_title = True
+    
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self._in_title = False
+    
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+PRICE_PATTERN = re.compile(r'(매매|전세|반전세|월세)\s*([0-9][0-9,.]*\s*억(?:\s*[0-9][0-9,]*(?:천만|천|만)?)?|[0-9][0-9,.]*\s*[만천]?)(?:\s*/\s*([0-9][0-9,]*))?')
+AREA_PATTERN = re.compile(r'([0-9]+(?:\.[0-9]+)?)\s*(㎡|m²|m2|평)')
+
+def parse_listing_text(text):
+    """제목/설명 글에서 가격('전세 3억 5,000')과 면적('84.5㎡')을 찾는다"""
+    price = PRICE_PATTERN.search(text)
+    area = AREA_PATTERN.search(text)
+    return {
+        'price': f"{price.group(1)} {price.group(2).strip()}{'/' + price.group(3) if price.group(3) else ''}" if price else '',
+        'area': ''.join(area.group(1, 2)) if area else '',
+    }
+
+def is_public_url(url):
+    # 서버 안쪽(사설/루프백 주소)으로 요청을 보내지 않는다
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return False
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(parts.hostname, parts.port or 443)}
+    except OSError:
+        return False
+    return all(ipaddress.ip_address(address.split('%')[0]).is_global for address in addresses)
+
+def fetch_metadata_http(url):
+    """페이지를 받아서 Open Graph 태그와 제목에서 매물 정보를 뽑는다"""
+    if not is_public_url(url):
+        raise ValueError('가져올 수 없는 주소입니다.')
+    req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0 (property-links preview)'})
+    with urllib.request.urlopen(req, timeout=METADATA_FETCH_TIMEOUT) as response:
+        charset = response.headers.get_content_charset() or 'utf-8'
+        page = response.read(METADATA_MAX_BYTES).decode(charset, errors='replace')
+    
+    parser = MetadataPageParser()
+    parser.feed(page)
+    title = parser.meta.get('og:title') or parser.title.strip()
+    description = parser.meta.get('og:description') or parser.meta.get('description', '')
+    return dict(parse_listing_text(f'{title} {description}'),
+                title=title[:200],
+                thumbnail=urljoin(url, parser.meta['og:image']) if parser.meta.get('og:image') else '')
+
+def fetch_metadata_stub(url):
+    """네트워크 없이 url로 정해지는 가짜 정보 (로컬 개발/테스트용)"""
+    digest = int(hashlib.md5(url.encode()).hexdigest(), 16)
+    return {
+        'title': f'테스트 매물 {digest % 10000}',
+        'price': f'전세 {digest % 9 + 1}억',
+        'area': f'{digest % 80 + 20}㎡',
+        'thumbnail': '',
+    }
+
+# METADATA_FETCHER 이름 -> url을 받아 {'title', 'price', 'area', 'thumbnail'}을 돌려주는 함수
+METADATA_FETCHERS = {
+    'http': fetch_metadata_http,
+    'stub': fetch_metadata_stub,
+}
+
+def metadata_expiry(hours):
+    return (datetime.now() + timedelta(hours=hours)).isoformat(timespec='seconds')
+
+def store_link_metadata(cursor, db_type, url, status, metadata, error, ttl_hours):
+    row = (url, status, metadata.get('title', ''), metadata.get('price', ''), metadata.get('area', ''),
+           metadata.get('thumbnail', ''), error, change_timestamp(), metadata_expiry(ttl_hours))
+    run_statement(cursor, db_type, '''
+        INSERT INTO link_metadata (url, status, title, price, area, thumbnail, error, fetched_at, expires_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (url) DO UPDATE SET status = EXCLUDED.status, title = EXCLUDED.title, price = EXCLUDED.price,
+            area = EXCLUDED.area, thumbnail = EXCLUDED.thumbnail, error = EXCLUDED.error,
+            fetched_at = EXCLUDED.fetched_at, expires_at = EXCLUDED.expires_at
+    ''', row)
+
+class MetadataEnricher:
+    """워커 프로세스마다 작업 큐 하나와 가져오기 스레드 METADATA_WORKERS개
+    
+    큐에 이미 있거나 가져오는 중인 url은 다시 넣지 않는다. 큐가 가득 차면 버리고,
+    그 url은 다음에 목록에서 볼 때 다시 들어온다.
+    """
+    
+    def __init__(self):
+        self._queue = queue.Queue(METADATA_QUEUE_SIZE)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._pid = None
+        self.fetched = 0
+        self.failed = 0
+        self.dropped = 0
+    
+    def enqueue(self, url):
+        fetcher = METADATA_FETCHERS.get(METADATA_FETCHER)
+        if fetcher is None or not url:
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # fork 이후에는 부모의 스레드가 없으므로 새로 띄운다
+                self._pending = set()
+                self._queue = queue.Queue(METADATA_QUEUE_SIZE)
+                for _ in range(METADATA_WORKERS):
+                    threading.Thread(target=self._run, args=(self._queue,), name='metadata-fetcher', daemon=True).start()
+                self._pid = os.getpid()
+            if url in self._pending:
+                return
+            try:
+                self._queue.put_nowait(url)
+            except queue.Full:
+                self.dropped += 1
+                return
+            self._pending.add(url)
+    
+    def _run(self, jobs):
+        while True:
+            url = jobs.get()
+            try:
+                self.refresh(url)
+            except Exception:
+                logger.exception('매물 정보 저장 실패: %s', url)
+            finally:
+                with self._lock:
+                    self._pending.discard(url)
+    
+    def refresh(self, url):
+        with app.app_context():
+            # 다른 워커 프로세스가 그사이 가져왔으면 건너뛴다
+            conn, db_type = get_db_connection()
+            cursor = conn.cursor()
+            run_statement(cursor, db_type, 'SELECT expires_at FROM link_metadata WHERE url = %s', (url,))
+            row = cursor.fetchone()
+            if row and row[0] > change_timestamp():
+                return
+        
+        # 네트워크를 기다리는 동안은 DB 연결을 잡고 있지 않는다
+        try:
+            metadata = METADATA_FETCHERS[METADATA_FETCHER](url)
+            status, error, ttl_hours = 'ok', '', METADATA_TTL_HOURS
+        except Exception as e:
+            logger.info('매물 정보를 가져오지 못했습니다: %s (%s)', url, e)
+            metadata, status, error, ttl_hours = {}, 'error', str(e)[:200], METADATA_RETRY_MINUTES / 60
+        with self._lock:
+            if status == 'ok':
+                self.fetched += 1
+            else:
+                self.failed += 1
+        
+        with app.app_context():
+            run_write(lambda cursor, db_type: store_link_metadata(cursor, db_type, url, status, metadata, error, ttl_hours))
+    
+    def stats(self):
+        return {
+            'queued': self._queue.qsize(),
+            'fetched': self.fetched,
+            'failed': self.failed,
+            'dropped': self.dropped,
+        }
+
+metadata_enricher = MetadataEnricher()
+
+class LinksResponseCache:
+    """보드 데이터 버전별 목록 응답(JSON 바이트와 압축한 본문) 캐시 - 보드 버전이 바뀌면 그 보드 항목만 비운다"""
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._entries = OrderedDict()
+    
+    def get(self, board_id, version, key):
+        with self._lock:
+            if version != self._versions.get(board_id):
+                return None
+            payload = self._entries.get((board_id, key))
+            if payload is not None:
+                self._entries.move_to_end((board_id, key))
+            return payload
+    
+    def put(self, board_id, version, key, payload):
+        with self._lock:
+            current = self._versions.get(board_id)
+            if current is not None and version < current:
+                return
+            if version != current:
+                for stale in [entry for entry in self._entries if entry[0] == board_id]:
+                    del self._entries[stale]
+                self._versions[board_id] = version
+            self._entries[(board_id, key)] = payload
+            self._entries.move_to_end((board_id, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+links_cache = LinksResponseCache(LINKS_CACHE_SIZE)
+
+def links_cache_key(args, paginated, after_id, limit):
+    # 기본값과 같은 필터는 생략한 것과 같은 키가 되도록 정규화
+    return (
+        args.get('platform', 'all'),
+        args.get('user', 'all'),
+        args.get('like', 'all') if args.get('like') in ('liked', 'disliked') else 'all',
+        args.get('date', ''),
+        tuple(query_tokens(args.get('q', ''))),
+        paginated,
+        after_id if paginated else None,
+        limit if paginated else None,
+        'columnar' if args.get('format') == 'columnar' else 'rows',
+        include_archived(args),
+        link_fields(args),
+        after_number_arg(args) if paginated and after_id is not None else None,
+    )
+
+def links_etag(board_id, version, cache_key, encoding=None):
+    # 압축 방식마다 본문이 다르므로 ETag도 다르다
+    etag = f'b{board_id}-v{version}-{hashlib.md5(repr(cache_key).encode()).hexdigest()[:12]}'
+    return f'{etag}-{encoding}' if encoding else etag
+
+def encode_links_payload(board_id, version, cache_key, payload, encoding):
+    """목록 본문을 encoding으로 압축한 (본문, Content-Encoding) - 압축한 본문도 목록 캐시에 넣어 다시 압축하지 않는다"""
+    if encoding is None or len(payload) < COMPRESS_MIN_BYTES:
+        return payload, None
+    compressed = links_cache.get(board_id, version, (cache_key, encoding))
+    if compressed is None:
+        compressed = compress_body(payload, encoding)
+        links_cache.put(board_id, version, (cache_key, encoding), compressed)
+    return compressed, encoding
+
+# 목록 필터 조건 (WHERE 절과 파라미터)
+def build_links_filter(args, db_type, board_id):
+    """(WHERE 절, 파라미터) - 자리표시자는 %s (run_statement/statement()가 방언에 맞게 바꾼다)
+    
+    절은 값이 아니라 어떤 필터가 있는지에 따라서만 달라지므로 조합마다 준비된 문장 하나를 다시 쓴다.
+    """
+    platform_filter = args.get('platform', 'all')
+    user_filter = args.get('user', 'all')
+    like_filter = args.get('like', 'all')
+    date_filter = args.get('date', '')
+    # SQLite 부분 인덱스(WHERE liked = 1)와 같은 모양이어야 인덱스를 쓴다
+    true = 'TRUE' if db_type == 'postgresql' else '1'
+    
+    # 모든 조건은 board_id로 시작한다 (인덱스와 파티션이 보드 단위)
+    where = 'board_id = %s'
+    params = [board_id]
+    
+    if platform_filter != 'all':
+        where += ' AND platform = %s'
+        params.append(platform_filter)
+    
+    if user_filter != 'all':
+        where += ' AND added_by = %s'
+        params.append(user_filter)
+    
+    if like_filter == 'liked':
+        where += f' AND liked = {true}'
+    elif like_filter == 'disliked':
+        where += f' AND disliked = {true}'
+    
+    if date_filter:
+        where += ' AND date_added = %s'
+        params.append(date_filter)
+    
+    return where, params
+
+def link_fields(args):
+    """?fields=로 고른 목록 필드 (LINK_FIELDS 순서) - 없으면 전부, 모르는 필드가 있으면 ValueError
+    
+    id는 커서와 번호 계산에 쓰므로 항상 넣는다. archived는 include_archived=1 목록에서만 고를 수 있다.
+    """
+    available = LINK_FIELDS + ['archived'] if include_archived(args) else LINK_FIELDS
+    requested = args.get('fields')
+    if not requested:
+        return tuple(available)
+    names = {name.strip() for name in requested.split(',') if name.strip()}
+    unknown = names.difference(available)
+    if unknown:
+        raise ValueError(', '.join(sorted(unknown)))
+    return tuple(field for field in available if field == 'id' or field in names)
+
+def link_columns(fields):
+    """fields를 만드는 데 필요한 컬럼 (number는 행 순서로 계산하므로 빼고, id가 맨 앞)"""
+    return [field for field in fields if field != 'number']
+
+def build_links_result(links_data, fields, first_number, columnar):
+    """DB 행(link_columns(fields) 순서의 튜플)을 바로 응답 목록으로 만든다
+    
+    columnar면 고른 컬럼마다 행 튜플에서 그 위치의 값만 꺼내 필드마다 값 배열 하나로 ({"columns": {...}, "count": 링크 수}) -
+    링크마다 객체나 뒤집은 중간 튜플을 만들지 않는다. 아니면 링크마다 고른 필드만 담은 객체 하나.
+    최신순으로 정렬되어 있으므로 번호(number)는 첫 행 번호부터 역순으로 계산한다 (첫 번째=1, 두 번째=2...).
+    """
+    columns = link_columns(fields)
+    with timed('build'):
+        if columnar:
+            # 고른 컬럼마다 값 배열을 행 튜플에서 위치로 바로 꺼낸다
+            result = {
+                column: [bool(row[index]) for row in links_data] if column in BOOLEAN_LINK_FIELDS else [row[index] for row in links_data]
+                for index, column in enumerate(columns)
+            }
+            if 'number' in fields:
+                result['number'] = list(range(first_number, first_number - len(links_data), -1))
+            return {'columns': result, 'count': len(links_data)}
+        
+        flags = [column for column in columns if column in BOOLEAN_LINK_FIELDS]
+        links_list = []
+        for index, link in enumerate(links_data):
+            link_dict = dict(zip(columns, link))
+            for flag in flags:
+                link_dict[flag] = bool(link_dict[flag])
+            if 'number' in fields:
+                link_dict['number'] = first_number - index
+            links_list.append(link_dict)
+        return links_list
+
+# ?include_archived=1 목록은 보관함까지 합쳐서 본다 (목록에 필요한 컬럼과 보관 여부만)
+LIST_SOURCE_COLUMNS = 'id, url, platform, added_by, date_added, rating, liked, disliked, memo, board_id'
+LINKS_WITH_ARCHIVE = (f'(SELECT {LIST_SOURCE_COLUMNS}, 0 AS archived FROM links '
+                      f'UNION ALL SELECT {LIST_SOURCE_COLUMNS}, 1 AS archived FROM archived_links) AS links')
+
+def include_archived(args):
+    return args.get('include_archived') == '1'
+
+def search_columns(fields):
+    # 검색은 보관하지 않은 링크만 찾으므로 archived는 항상 거짓
+    return ', '.join('0 AS archived' if column == 'archived' else f'links.{column}' for column in link_columns(fields))
+
+def links_page(links_data, fields, first_number, columnar, paginated, next_cursor, limit):
+    """build_links_result()에 페이지 응답이면 next_cursor, next_number, limit을 붙인다 (paginated가 아닌 rows 형식은 목록 그대로)
+    
+    next_number는 이 페이지 마지막 행의 번호 - 다음 페이지를 after_id=next_cursor&after_number=next_number로 요청하면
+    서버가 행 번호를 세지 않고 이어서 매긴다.
+    """
+    result = build_links_result(links_data, fields, first_number, columnar)
+    if not paginated:
+        return result
+    if not columnar:
+        result = {'links': result}
+    result['next_cursor'] = next_cursor
+    result['next_number'] = first_number - len(links_data) + 1 if next_cursor is not None else None
+    result['limit'] = limit
+    return result
+
+def after_number_arg(args):
+    # 앞 페이지 마지막 행의 번호 (?after_number=, 페이지 응답의 next_number) - 없거나 숫자가 아니면 None
+    try:
+        return int(args['after_number'])
+    except (KeyError, ValueError):
+        return None
+
+def counter_filter_keys(args):
+    """목록 필터에 해당하는 link_counters (차원, 값) 목록"""
+    keys = []
+    if args.get('platform', 'all') != 'all':
+        keys.append(('platform', args['platform']))
+    if args.get('user', 'all') != 'all':
+        keys.append(('added_by', args['user']))
+    if args.get('like') in ('liked', 'disliked'):
+        keys.append((args['like'], 'yes'))
+    if args.get('date'):
+        keys.append(('date_added', args['date']))
+    return keys
+
+def link_count_query(args, board_id, source, where, params):
+    """필터 결과 링크 수를 세는 (SQL, 파라미터)
+    
+    필터가 없거나 하나뿐이면 link_counters에서 한두 행만 읽는다 (보관함 포함이면 'archived' 카운터를 더한다).
+    필터가 여럿이면 카운터로는 알 수 없으므로 그 필터의 링크를 직접 센다.
+    """
+    keys = counter_filter_keys(args)
+    archived = include_archived(args)
+    if len(keys) > 1 or (keys and archived):
+        return f'SELECT COUNT(*) FROM {source} WHERE {where}', params
+    keys = (keys or [('total', '')]) + ([('archived', '')] if archived else [])
+    match = ' OR '.join('(dimension = %s AND name = %s)' for _ in keys)
+    return (f'SELECT COALESCE(SUM(link_count), 0) FROM link_counters WHERE board_id = %s AND ({match})',
+            [board_id] + [value for key in keys for value in key])
+
+class LinksQuery:
+    """목록 조회 한 번의 SQL - fetch_links()와 ASGI 앱이 같은 문장을 만들어 각자의 드라이버로 실행한다
+    
+    rows_query()의 행을 읽고, number_query()가 있으면 그 수까지 읽어서 page()에 넘긴다.
+    ?fields=로 고른 필드의 컬럼만 읽는다 (link_fields()로 미리 확인한 args).
+    기본은 links(보관하지 않은 링크)만 읽는다. include_archived=1이면 보관함도 합쳐서 읽고 링크마다 archived를 넣는다
+    (검색은 보관하지 않은 링크에서만).
+    """
+    
+    def __init__(self, db_type, board_id, args, paginated, after_id, limit):
+        self.db_type = db_type
+        self.board_id = board_id
+        self.args = args
+        self.paginated = paginated
+        self.after_id = after_id
+        self.limit = limit
+        self.where, self.params = build_links_filter(args, db_type, board_id)
+        self.source = LINKS_WITH_ARCHIVE if include_archived(args) else 'links'
+        self.fields = link_fields(args)
+        self.columnar = args.get('format') == 'columnar'
+        self.tokens = query_tokens(args.get('q', ''))
+    
+    def rows_query(self):
+        """(SELECT 문, 파라미터) - 검색이면 관련도순, 아니면 최신순 (link_columns(fields) 순서의 행)"""
+        where, params, fields = self.where, self.params, self.fields
+        if self.tokens:
+            # 검색어 토큰을 모두 포함하는 링크를 관련도순으로 (같으면 최신순) - 더 있는지 알기 위해 한 건 더 가져온다
+            limit, limit_params = (' LIMIT %s', [self.limit + 1]) if self.paginated else ('', [])
+            if self.db_type == 'postgresql':
+                return f'''
+                    SELECT {search_columns(fields)} FROM links, plainto_tsquery('simple', %s) AS search_query
+                    WHERE to_tsvector('simple', url_tokens || ' ' || memo_tokens) @@ search_query AND {where}
+                    ORDER BY ts_rank(to_tsvector('simple', url_tokens || ' ' || memo_tokens), search_query) DESC, id DESC
+                ''' + limit, [' '.join(self.tokens)] + params + limit_params
+            return f'''
+                SELECT {search_columns(fields)} FROM links_fts JOIN links ON links.id = links_fts.rowid
+                WHERE links_fts MATCH %s AND {where}
+                ORDER BY bm25(links_fts), links.id DESC
+            ''' + limit, [' '.join(f'"{token}"' for token in self.tokens)] + params + limit_params
+        
+        query = f"SELECT {', '.join(link_columns(fields))} FROM {self.source} WHERE {where}"
+        if not self.paginated:
+            return query + ' ORDER BY id DESC', params  # 최신순으로 정렬 (최신이 맨 위)
         
-        cursor.execute('INSERT OR IGNORE INTO customer_info (id, customer_name, move_in_date) VALUES (1, "제일좋은집 찾아드릴분", "")')
+        page_params = list(params)
+        if self.after_id is not None:
+            query += ' AND id < %s'
+            page_params.append(self.after_id)
+        
+        # 다음 페이지가 있는지 알기 위해 한 건 더 가져온다
+        return query + ' ORDER BY id DESC LIMIT %s', page_params + [self.limit + 1]
     
-    conn.commit()
-    conn.close()
+    def number_query(self, links_data):
+        """페이지 첫 행의 번호를 세는 (SELECT 문, 파라미터) - 셀 필요가 없으면 None
+        
+        첫 페이지는 필터 결과 수, 다음 페이지는 앞 페이지 마지막 번호(after_number) - 1이라 세지 않는다.
+        after_number를 보내지 않는 클라이언트는 필터 조건에서 id가 그 행 이하인 링크 수를 센다.
+        """
+        if self.tokens or not self.paginated or not links_data:
+            return None
+        if self.after_id is None:
+            return link_count_query(self.args, self.board_id, self.source, self.where, self.params)
+        if after_number_arg(self.args) is not None:
+            return None
+        return f'SELECT COUNT(*) FROM {self.source} WHERE {self.where} AND id <= %s', self.params + [links_data[0][0]]
+    
+    def page(self, links_data, number=None):
+        """응답 (paginated면 커서 페이지 dict, 아니면 전체 list - format=columnar면 필드별 배열 dict)
+        
+        number는 number_query()로 센 수 (세지 않았으면 None).
+        검색 결과는 관련도순이라 커서가 없다. limit개보다 많으면 truncated가 true다 (검색어를 좁혀야 한다).
+        """
+        if not self.paginated:
+            # 전체 링크 개수 = 첫 행 번호
+            return links_page(links_data, self.fields, len(links_data), self.columnar, False, None, self.limit)
+        
+        has_more = len(links_data) > self.limit
+        links_data = links_data[:self.limit]
+        if self.tokens:
+            result = links_page(links_data, self.fields, len(links_data), self.columnar, True, None, self.limit)
+            result['truncated'] = has_more
+            return result
+        if number is None:
+            after_number = after_number_arg(self.args)
+            number = after_number - 1 if links_data and after_number is not None else 0
+        return links_page(links_data, self.fields, number, self.columnar, True, links_data[-1][0] if has_more else None,
+                          self.limit)
 
-@app.route('/')
-def index():
-    conn, db_type = get_db_connection()
-    cursor = conn.cursor()
+def list_page_args(args):
+    """목록 요청의 (paginated, after_id, limit) - limit이 숫자가 아니면 ValueError
     
-    # 고객 정보 가져오기
-    cursor.execute('SELECT customer_name, move_in_date FROM customer_info WHERE id = 1')
-    customer_info = cursor.fetchone()
+    목록은 항상 limit(기본 DEFAULT_PAGE_SIZE, 최대 MAX_PAGE_SIZE)개씩 커서 페이지로 돌려준다.
+    all=1일 때만 예전 형식(보드 전체를 한 번에, 페이지 정보 없는 목록)으로 돌려준다 - 페이지를 모르는 예전 클라이언트가
+    명시적으로 요청해야 하는 호환 모드라서 보드가 크면 느리다.
+    """
+    if args.get('all') == '1':
+        return False, None, None
+    try:
+        after_id = int(args.get('after_id'))
+    except (TypeError, ValueError):
+        after_id = None
+    limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    return True, after_id, max(1, min(limit, MAX_PAGE_SIZE))
+
+def fetch_links(cursor, db_type, board_id, args, paginated, after_id, limit):
+    """LinksQuery로 목록을 읽는다"""
+    query = LinksQuery(db_type, board_id, args, paginated, after_id, limit)
+    run_statement(cursor, db_type, *query.rows_query())
+    links_data = cursor.fetchall()
+    number = None
+    number_query = query.number_query(links_data)
+    if number_query is not None:
+        run_statement(cursor, db_type, *number_query)
+        number = cursor.fetchone()[0]
+    return query.page(links_data, number)
+
+class IndexPageCache:
+    """보드별로 렌더링한 첫 화면 HTML - 고객 정보가 바뀌면(수정, 복원) 그 보드 항목만 비운다
     
-    if db_type == 'postgresql':
-        customer_name = customer_info[0] if customer_info else '제일좋은집 찾아드릴분'
-        move_in_date = customer_info[1] if customer_info else ''
+    다른 워커의 변경은 ChangeHub가 알려준다 (PostgreSQL은 NOTIFY, SQLite는 폴러가 캐시한 고객 정보와 비교).
+    보드마다 무효화 순번을 두고 렌더링을 시작할 때의 순번이 그대로일 때만 넣어서,
+    렌더링하는 동안 바뀐 고객 정보로 만든 페이지가 캐시에 남지 않게 한다.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._generations = {}
+        self._pages = {}  # board_id -> (고객 정보 (이름, 입주일) 또는 None, PrecompressedBody)
+    
+    def generation(self, board_id):
+        with self._lock:
+            return self._epoch, self._generations.get(board_id, 0)
+    
+    def get(self, board_id):
+        with self._lock:
+            page = self._pages.get(board_id)
+        return page[1] if page else None
+    
+    def put(self, board_id, generation, customer, page):
+        with self._lock:
+            if generation == (self._epoch, self._generations.get(board_id, 0)):
+                self._pages[board_id] = (customer, page)
+    
+    def customers(self):
+        with self._lock:
+            return {board_id: page[0] for board_id, page in self._pages.items()}
+    
+    def invalidate(self, board_id):
+        with self._lock:
+            self._generations[board_id] = self._generations.get(board_id, 0) + 1
+            self._pages.pop(board_id, None)
+    
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._pages.clear()
+
+index_page_cache = IndexPageCache()
+
+# 정적 파일 (static/) - 주소에 내용 지문을 넣어서 내용이 바뀌면 주소도 바뀐다
+_static_assets = {}
+
+def load_static_asset(filename):
+    """(수정 시각, mimetype, PrecompressedBody) - 파일이 바뀌면 다시 읽는다, 없는 파일이면 None"""
+    path = safe_join(app.static_folder, filename)
+    if path is None or not os.path.isfile(path):
+        return None
+    mtime = os.path.getmtime(path)
+    asset = _static_assets.get(filename)
+    if asset is None or asset[0] != mtime:
+        with open(path, 'rb') as f:
+            body = f.read()
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        asset = _static_assets[filename] = (mtime, mimetype, PrecompressedBody(body, hashlib.md5(body).hexdigest()[:12]))
+    return asset
+
+@app.template_global()
+def asset_url(filename):
+    return url_for('static_asset', fingerprint=load_static_asset(filename)[2].etag, filename=filename)
+
+@app.route('/assets/<fingerprint>/<path:filename>')
+def static_asset(fingerprint, filename):
+    asset = load_static_asset(filename)
+    if asset is None:
+        return '파일을 찾을 수 없습니다.', 404
+    _, mimetype, content = asset
+    response = encoded_response(content, mimetype)
+    if fingerprint == content.etag:
+        response.headers['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE}, immutable'
     else:
-        customer_name = customer_info[0] if customer_info else '제일좋은집 찾아드릴분'
+        # 예전 지문으로 온 요청 - 지금 내용을 주되 오래 캐시하지 않는다
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def encoded_response(content, mimetype):
+    """PrecompressedBody를 Accept-Encoding에 맞춰 보낸다 (ETag가 맞으면 304)"""
+    encoding = negotiate_encoding(request.accept_encodings)
+    body, content_encoding = content.encode(encoding)
+    etag = f'{content.etag}-{content_encoding}' if content_encoding else content.etag
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype=mimetype)
+        if content_encoding:
+            response.headers['Content-Encoding'] = content_encoding
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.route('/', defaults={'board_id': DEFAULT_BOARD_ID})
+@app.route('/boards/<int:board_id>')
+def index(board_id):
+    # 다른 워커에서 고객 정보가 바뀐 것도 알 수 있게 변경 알림 수신을 켜 둔다
+    change_hub.ensure_started()
+    page = index_page_cache.get(board_id)
+    if page is None:
+        generation = index_page_cache.generation(board_id)
+        conn, db_type = get_db_connection()
+        cursor = conn.cursor()
+        
+        # 고객 정보 가져오기
+        run_statement(cursor, db_type, 'SELECT customer_name, move_in_date FROM customer_info WHERE id = %s', (board_id,))
+        customer_info = cursor.fetchone()
+        
+        if customer_info is None and board_id != DEFAULT_BOARD_ID:
+            return '보드를 찾을 수 없습니다.', 404
+        
+        customer_name = customer_info[0] if customer_info else DEFAULT_CUSTOMER_NAME
         move_in_date = customer_info[1] if customer_info else ''
+        
+        html = render_template('index.html', customer_name=customer_name, move_in_date=move_in_date, board_id=board_id).encode('utf-8')
+        page = PrecompressedBody(html, hashlib.md5(html).hexdigest()[:16])
+        index_page_cache.put(board_id, generation, tuple(customer_info) if customer_info else None, page)
     
-    conn.close()
-    
-    return render_template('index.html', customer_name=customer_name, move_in_date=move_in_date)
+    response = encoded_response(page, 'text/html')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
-@app.route('/api/customer_info', methods=['GET', 'POST'])
-def customer_info():
-    conn, db_type = get_db_connection()
-    cursor = conn.cursor()
+@app.route('/api/boards', methods=['GET', 'POST'])
+def boards():
+    """보드(고객) 목록과 새 보드 만들기"""
+    if request.method == 'POST':
+        data = request.json or {}
+        customer_name = data.get('customer_name', DEFAULT_CUSTOMER_NAME)
+        move_in_date = data.get('move_in_date', '')
+        
+        def create(cursor, db_type):
+            # 새 보드 id = 지금 가장 큰 id + 1 (SQLite는 INSERT ... SELECT 한 문장이라 원자적)
+            if db_type == 'postgresql':
+                cursor.execute('LOCK TABLE customer_info IN EXCLUSIVE MODE')
+            board_id = insert_returning_id(cursor, db_type, '''
+                INSERT INTO customer_info (id, customer_name, move_in_date)
+                SELECT COALESCE(MAX(id), 0) + 1, %s, %s FROM customer_info''', (customer_name, move_in_date))
+            run_statement(cursor, db_type, '''
+                INSERT INTO data_version (id, version) VALUES (%s, 1)
+                ON CONFLICT (id) DO UPDATE SET version = data_version.version + 1, reset_seq = data_version.version + 1
+            ''', (board_id,))
+            return board_id
+        
+        board_id = run_write(create)
+        
+        return jsonify({'success': True, 'id': board_id})
     
+    else:
+        conn, db_type = get_db_connection()
+        cursor = conn.cursor()
+        run_statement(cursor, db_type, 'SELECT id, customer_name, move_in_date FROM customer_info ORDER BY id')
+        return jsonify([
+            {'id': board[0], 'customer_name': board[1], 'move_in_date': board[2]}
+            for board in cursor.fetchall()
+        ])
+
+@app.route('/api/customer_info', methods=['GET', 'POST'], defaults={'board_id': DEFAULT_BOARD_ID})
+@app.route('/api/boards/<int:board_id>/customer_info', methods=['GET', 'POST'])
+def customer_info(board_id):
     if request.method == 'POST':
         data = request.json
         customer_name = data.get('customer_name', '제일좋은집 찾아드릴분')
         move_in_date = data.get('move_in_date', '')
         
-        if db_type == 'postgresql':
-            cursor.execute('UPDATE customer_info SET customer_name = %s, move_in_date = %s WHERE id = 1', 
-                          (customer_name, move_in_date))
-        else:
-            cursor.execute('UPDATE customer_info SET customer_name = ?, move_in_date = ? WHERE id = 1', 
-                          (customer_name, move_in_date))
-        conn.commit()
-        conn.close()
+        def update(cursor, db_type):
+            run_statement(cursor, db_type, 'UPDATE customer_info SET customer_name = %s, move_in_date = %s WHERE id = %s',
+                          (customer_name, move_in_date, board_id))
+            if cursor.rowcount == 0:
+                raise BoardNotFound(board_id)
+            notify_change(cursor, db_type, {'type': 'customer_info', 'board_id': board_id})
+        
+        run_write(update)
+        index_page_cache.invalidate(board_id)
         
         return jsonify({'success': True})
     
     else:
-        cursor.execute('SELECT customer_name, move_in_date FROM customer_info WHERE id = 1')
+        conn, db_type = get_db_connection()
+        cursor = conn.cursor()
+        run_statement(cursor, db_type, 'SELECT customer_name, move_in_date FROM customer_info WHERE id = %s', (board_id,))
         info = cursor.fetchone()
-        conn.close()
+        if info is None and board_id != DEFAULT_BOARD_ID:
+            raise BoardNotFound(board_id)
         
         return jsonify({
             'customer_name': info[0] if info else '제일좋은집 찾아드릴분',
             'move_in_date': info[1] if info else ''
         })
 
-@app.route('/api/links', methods=['GET', 'POST'])
-def links():
+# 새 링크 (POST /api/links - ASGI 앱도 같은 문장을 쓴다)
+INSERT_LINK_SQL = '''
+    INSERT INTO links (board_id, url, platform, added_by, date_added, memo, change_seq, updated_at, url_tokens, memo_tokens, url_key)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'''
+
+@app.route('/api/links', methods=['GET', 'POST'], defaults={'board_id': DEFAULT_BOARD_ID})
+@app.route('/api/boards/<int:board_id>/links', methods=['GET', 'POST'])
+def links(board_id):
     conn, db_type = get_db_connection()
     cursor = conn.cursor()
     
@@ -156,283 +2655,1137 @@ def links():
         
         date_added = datetime.now().strftime('%Y-%m-%d')
         
-        if db_type == 'postgresql':
-            cursor.execute('''
-                INSERT INTO links (url, platform, added_by, date_added, memo)
-                VALUES (%s, %s, %s, %s, %s) RETURNING id
-            ''', (url, platform, added_by, date_added, memo))
-            link_id = cursor.fetchone()[0]
-        else:
-            cursor.execute('''
-                INSERT INTO links (url, platform, added_by, date_added, memo)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (url, platform, added_by, date_added, memo))
-            link_id = cursor.lastrowid
+        url_key = canonical_url_key(url)
         
-        conn.commit()
-        conn.close()
+        def insert_link(cursor, db_type):
+            # 같은 보드에 같은 매물이 있으면 새로 넣지 않고 메모만 합친다.
+            # 보관한 링크면 그대로 두고 id만 알려준다 (클라이언트가 보관 해제를 권한다)
+            duplicate = find_duplicate_link(cursor, db_type, board_id, url_key)
+            if duplicate is not None:
+                link_id, existing_memo, archived = duplicate
+                if not archived and memo and memo not in existing_memo:
+                    change_seq = bump_data_version(cursor, db_type, board_id)
+                    apply_link_action(cursor, db_type, board_id, link_id, 'memo', merge_memos([existing_memo, memo]), change_seq)
+                    notify_change(cursor, db_type, {'type': 'links', 'board_id': board_id, 'action': 'update',
+                                                    'version': change_seq, 'ids': [link_id]})
+                return link_id, True, archived
+            
+            change_seq = bump_data_version(cursor, db_type, board_id)
+            link_id = insert_returning_id(cursor, db_type, INSERT_LINK_SQL, (
+                board_id, url, platform, added_by, date_added, memo, change_seq, change_timestamp(),
+                search_tokens(url), search_tokens(memo), url_key))
+            notify_change(cursor, db_type, {'type': 'links', 'board_id': board_id, 'action': 'insert', 'version': change_seq,
+                                            'ids': [link_id]})
+            return link_id, False, False
         
-        return jsonify({'success': True, 'id': link_id})
+        link_id, duplicate, archived = run_write(insert_link)
+        if not duplicate:
+            metadata_enricher.enqueue(url)
+        
+        return jsonify({'success': True, 'id': link_id, 'duplicate': duplicate, 'archived': archived})
     
     else:
-        # 필터 파라미터
-        platform_filter = request.args.get('platform', 'all')
-        user_filter = request.args.get('user', 'all')
-        like_filter = request.args.get('like', 'all')
-        date_filter = request.args.get('date', '')
-        
-        query = 'SELECT * FROM links WHERE 1=1'
-        params = []
-        
-        if platform_filter != 'all':
-            if db_type == 'postgresql':
-                query += ' AND platform = %s'
-            else:
-                query += ' AND platform = ?'
-            params.append(platform_filter)
-        
-        if user_filter != 'all':
-            if db_type == 'postgresql':
-                query += ' AND added_by = %s'
-            else:
-                query += ' AND added_by = ?'
-            params.append(user_filter)
-        
-        if like_filter == 'liked':
-            if db_type == 'postgresql':
-                query += ' AND liked = TRUE'
-            else:
-                query += ' AND liked = 1'
-        elif like_filter == 'disliked':
-            if db_type == 'postgresql':
-                query += ' AND disliked = TRUE'
-            else:
-                query += ' AND disliked = 1'
+        # 페이지 파라미터 (all=1이 아니면 커서 기반 페이지 응답 - list_page_args 참고)
+        try:
+            paginated, after_id, limit = list_page_args(request.args)
+        except ValueError:
+            return jsonify({'success': False, 'error': '잘못된 페이지 파라미터입니다.'})
+        try:
+            link_fields(request.args)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': f'알 수 없는 필드입니다: {e}'})
         
-        if date_filter:
-            if db_type == 'postgresql':
-                query += ' AND date_added = %s'
-            else:
-                query += ' AND date_added = ?'
-            params.append(date_filter)
+        # 같은 데이터 버전 + 같은 필터 조합이면 이전에 만든 응답을 그대로 쓴다
+        version = get_data_version(cursor, db_type, board_id)
+        cache_key = links_cache_key(request.args, paginated, after_id, limit)
+        encoding = negotiate_encoding(request.accept_encodings)
+        etag = links_etag(board_id, version, cache_key, encoding)
         
-        query += ' ORDER BY id DESC'  # 최신순으로 정렬 (최신이 맨 위)
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            payload = links_cache.get(board_id, version, cache_key)
+            if payload is None:
+                result = fetch_links(cursor, db_type, board_id, request.args, paginated, after_id, limit)
+                payload = app.json.dumps(result).encode('utf-8')
+                links_cache.put(board_id, version, cache_key, payload)
+            body, content_encoding = encode_links_payload(board_id, version, cache_key, payload, encoding)
+            response = app.response_class(body, mimetype='application/json')
+            if content_encoding:
+                response.headers['Content-Encoding'] = content_encoding
         
-        cursor.execute(query, params)
-        links_data = cursor.fetchall()
+        response.set_etag(etag)
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+# 링크 수정 동작 표 (PUT /api/links/<id>와 PATCH /api/links/batch가 함께 사용)
+# action: (요청에서 값을 읽는 키, 기본값, 값 -> [(컬럼, 저장할 값)], 값 검사)
+LINK_ACTIONS = {
+    'rating': ('rating', 5, lambda rating: [('rating', rating)],
+               lambda rating: isinstance(rating, int) and not isinstance(rating, bool) and 1 <= rating <= 10),
+    'like': ('liked', False, lambda liked: [('liked', liked), ('disliked', False)],
+             lambda liked: isinstance(liked, bool)),
+    'dislike': ('disliked', False, lambda disliked: [('disliked', disliked), ('liked', False)],
+                lambda disliked: isinstance(disliked, bool)),
+    'memo': ('memo', '', lambda memo: [('memo', memo), ('memo_tokens', search_tokens(memo))],
+             lambda memo: isinstance(memo, str)),
+}
+LINK_ACTION_ERRORS = {
+    'rating': '평점은 1에서 10 사이의 정수여야 합니다.',
+    'like': 'liked는 true나 false여야 합니다.',
+    'dislike': 'disliked는 true나 false여야 합니다.',
+    'memo': '메모는 문자열이어야 합니다.',
+}
+
+def link_action_error(action, value):
+    """동작 값이 잘못됐으면 오류 메시지 (SQL을 실행하기 전에 걸러서 트랜잭션이 깨지지 않게 한다)"""
+    return None if LINK_ACTIONS[action][3](value) else LINK_ACTION_ERRORS[action]
+
+def apply_link_action(cursor, db_type, board_id, link_id, action, value, change_seq):
+    """동작 하나를 실행하고 바뀐 행 수를 돌려준다"""
+    run_statement(cursor, db_type, *link_action_statement(board_id, link_id, action, value, change_seq))
+    return cursor.rowcount
+
+def link_action_statement(board_id, link_id, action, value, change_seq):
+    """apply_link_action의 (UPDATE 문, 파라미터) - ASGI 앱도 같은 문장을 쓴다"""
+    assignments = LINK_ACTIONS[action][2](value) + [('change_seq', change_seq), ('updated_at', change_timestamp())]
+    set_clause = ', '.join(f'{column} = %s' for column, _ in assignments)
+    return (f'UPDATE links SET {set_clause} WHERE board_id = %s AND id = %s',
+            [column_value for _, column_value in assignments] + [board_id, link_id])
+
+# 목록에 있는 링크를 먼저, 없으면 보관한 링크를 찾는다
+FIND_DUPLICATE_LINK_SQL = '''
+    SELECT id, memo, 0 AS archived FROM links WHERE board_id = %s AND url_key = %s
+    UNION ALL SELECT id, memo, 1 AS archived FROM archived_links WHERE board_id = %s AND url_key = %s
+    ORDER BY archived, id LIMIT 1'''
+
+def find_duplicate_link(cursor, db_type, board_id, url_key):
+    """같은 보드에서 url_key가 같은 링크 (id, 메모, 보관 여부) - 없으면 None"""
+    if db_type == 'postgresql':
+        # 같은 매물을 동시에 추가해도 하나만 들어가도록 (보드, 키)마다 트랜잭션 잠금
+        cursor.execute('SELECT pg_advisory_xact_lock(%s, hashtext(%s))', (board_id, url_key))
+    run_statement(cursor, db_type, FIND_DUPLICATE_LINK_SQL, (board_id, url_key, board_id, url_key))
+    row = cursor.fetchone()
+    return (row[0], row[1], bool(row[2])) if row is not None else None
+
+def merge_memos(memos):
+    # 비어 있지 않은 메모를 중복 없이 줄바꿈으로 잇는다
+    return '\n'.join(dict.fromkeys(memo for memo in memos if memo))
+
+def dedupe_links(cursor, db_type, board_id=None, dry_run=False):
+    """보드 안에서 url_key가 같은 링크들을 가장 먼저 추가된 링크 하나로 합친다 (일괄 정리용)
+    
+    평점은 가장 높은 값, 좋아요는 하나라도 있으면 좋아요, 메모는 모두 이어 붙인다.
+    나머지 링크는 삭제 기록을 남기고 지운다. {보드 id: 지운(dry_run이면 지울) 링크 수}를 돌려준다.
+    """
+    backfill_url_keys(cursor, db_type)
+    
+    where = "url_key <> ''"
+    params = []
+    if board_id is not None:
+        where += ' AND board_id = %s'
+        params.append(board_id)
+    run_statement(cursor, db_type, f'SELECT board_id, url_key FROM links WHERE {where} GROUP BY board_id, url_key HAVING COUNT(*) > 1',
+                  params)
+    groups = cursor.fetchall()
+    
+    removed = {}
+    change_seqs = {}
+    for group_board_id, url_key in groups:
+        run_statement(cursor, db_type, 'SELECT id, rating, liked, disliked, memo FROM links WHERE board_id = %s AND url_key = %s ORDER BY id',
+                      (group_board_id, url_key))
+        rows = cursor.fetchall()
+        removed[group_board_id] = removed.get(group_board_id, 0) + len(rows) - 1
+        if dry_run:
+            continue
         
-        # 전체 링크 개수 구하기 (번호 계산용)
-        total_count = len(links_data)
+        if group_board_id not in change_seqs:
+            change_seqs[group_board_id] = bump_data_version(cursor, db_type, group_board_id)
+        change_seq = change_seqs[group_board_id]
+        keep_id = rows[0][0]
+        drop_ids = [row[0] for row in rows[1:]]
+        liked = any(row[2] for row in rows)
+        disliked = not liked and any(row[3] for row in rows)
+        memo = merge_memos(row[4] for row in rows)
+        merged = (max(row[1] or 0 for row in rows), liked, disliked, memo, search_tokens(memo), change_seq, change_timestamp(),
+                  group_board_id, keep_id)
         
-        conn.close()
+        run_statement(cursor, db_type, '''
+            UPDATE links SET rating = %s, liked = %s, disliked = %s, memo = %s, memo_tokens = %s, change_seq = %s, updated_at = %s
+            WHERE board_id = %s AND id = %s
+        ''', merged)
+        delete_board_links(cursor, db_type, 'links', group_board_id, drop_ids)
+        write_tombstones(cursor, db_type, group_board_id, drop_ids, change_seq, change_timestamp())
+    
+    for group_board_id, change_seq in change_seqs.items():
+        notify_change(cursor, db_type, {'type': 'links', 'board_id': group_board_id, 'action': 'update', 'version': change_seq})
+    return removed
+
+def write_tombstones(cursor, db_type, board_id, link_ids, change_seq, deleted_at):
+    """link_ids의 삭제 기록을 남긴다 (변경분 동기화가 deleted로 돌려준다)"""
+    insert_values(cursor, db_type, '''
+        INSERT INTO link_tombstones (link_id, board_id, change_seq, deleted_at) VALUES %s
+        ON CONFLICT (link_id) DO UPDATE SET board_id = EXCLUDED.board_id, change_seq = EXCLUDED.change_seq,
+                                            deleted_at = EXCLUDED.deleted_at
+    ''', [(link_id, board_id, change_seq, deleted_at) for link_id in link_ids])
+
+def delete_tombstones(cursor, db_type, link_ids):
+    """다시 목록에 나오는 link_ids의 삭제 기록을 지운다"""
+    ids, id_params = id_list_condition(db_type, 'link_id', link_ids)
+    run_statement(cursor, db_type, f'DELETE FROM link_tombstones WHERE {ids}', id_params)
+
+def prune_tombstones(cursor, db_type, board_id, now=None):
+    """TOMBSTONE_RETENTION_DAYS보다 오래된 보드의 삭제 기록을 지우고 지운 수를 돌려준다
+    
+    지운 마지막 순번을 data_version.pruned_seq에 남긴다. since가 그보다 이전이면 변경분과 증분 백업 조각이
+    삭제를 빠뜨리므로 reset(전체 다시 읽기)으로 돌려준다.
+    """
+    if TOMBSTONE_RETENTION_DAYS <= 0:
+        return 0
+    cutoff = ((now or datetime.now()) - timedelta(days=TOMBSTONE_RETENTION_DAYS)).isoformat(timespec='seconds')
+    run_statement(cursor, db_type, 'SELECT MAX(change_seq) FROM link_tombstones WHERE board_id = %s AND deleted_at < %s',
+                  (board_id, cutoff))
+    pruned_seq = cursor.fetchone()[0]
+    if pruned_seq is None:
+        return 0
+    run_statement(cursor, db_type, 'DELETE FROM link_tombstones WHERE board_id = %s AND change_seq <= %s', (board_id, pruned_seq))
+    pruned = cursor.rowcount
+    run_statement(cursor, db_type, 'UPDATE data_version SET pruned_seq = %s WHERE id = %s AND pruned_seq < %s',
+                  (pruned_seq, board_id, pruned_seq))
+    return pruned
+
+def archive_cutoffs(now=None):
+    """(추가일 기준 날짜, 싫어요 기준 시각) - 꺼진 규칙은 None"""
+    now = now or datetime.now()
+    added_before = (now - timedelta(days=ARCHIVE_AFTER_DAYS)).strftime('%Y-%m-%d') if ARCHIVE_AFTER_DAYS > 0 else None
+    disliked_before = (now - timedelta(days=ARCHIVE_DISLIKED_AFTER_DAYS)).isoformat(timespec='seconds') if ARCHIVE_DISLIKED_AFTER_DAYS > 0 else None
+    return added_before, disliked_before
+
+def move_links(cursor, db_type, board_id, link_ids, source, target, extra):
+    """link_ids를 source 테이블에서 target 테이블로 옮긴다 (ARCHIVE_COLUMNS + extra {컬럼: 값}), 옮긴 행 수를 돌려준다"""
+    columns = [column for column in ARCHIVE_COLUMNS if column not in extra]
+    insert_columns = ', '.join(columns + list(extra))
+    values = ', '.join(columns + ['%s'] * len(extra))
+    ids, id_params = id_list_condition(db_type, 'id', link_ids)
+    run_statement(cursor, db_type, f'INSERT INTO {target} ({insert_columns}) SELECT {values} FROM {source} WHERE board_id = %s AND {ids}',
+                  list(extra.values()) + [board_id] + id_params, prepare=False)
+    run_statement(cursor, db_type, f'DELETE FROM {source} WHERE board_id = %s AND {ids}', [board_id] + id_params)
+    return cursor.rowcount
+
+def archive_links(cursor, db_type, board_id, now=None, limit=ARCHIVE_BATCH_SIZE):
+    """보드에서 보관할 링크를 limit개까지 archived_links로 옮기고 옮긴 id 목록을 돌려준다
+    
+    보관 대상: 좋아요가 아니고 추가한 지 ARCHIVE_AFTER_DAYS가 지난 링크,
+    싫어요를 누르고(마지막 수정 후) ARCHIVE_DISLIKED_AFTER_DAYS가 지난 링크.
+    변경 순번 마이그레이션(3) 전에 만든 행은 updated_at이 ''이므로 추가한 날짜를 마지막 수정 시각으로 본다.
+    옮긴 링크는 삭제 기록을 남겨서 변경분 동기화 중인 화면에서도 빠진다.
+    """
+    added_before, disliked_before = archive_cutoffs(now)
+    rules = []
+    params = [board_id]
+    if added_before:
+        rules.append('(liked = FALSE AND date_added < %s)')
+        params.append(added_before)
+    if disliked_before:
+        rules.append("(disliked = TRUE AND COALESCE(NULLIF(updated_at, ''), date_added) < %s)")
+        params.append(disliked_before)
+    if not rules:
+        return []
+    if db_type == 'postgresql':
+        # 다른 워커가 같은 보드를 옮기는 중이면 이번에는 건너뛴다 (SQLite는 쓰기 잠금이 하나라 필요 없다)
+        cursor.execute('SELECT pg_try_advisory_xact_lock(%s, %s)', (ARCHIVE_LOCK_ID, board_id))
+        if not cursor.fetchone()[0]:
+            return []
+    run_statement(cursor, db_type, f"SELECT id FROM links WHERE board_id = %s AND ({' OR '.join(rules)}) ORDER BY id LIMIT %s",
+                  params + [limit])
+    link_ids = [row[0] for row in cursor.fetchall()]
+    if not link_ids:
+        return []
+    
+    change_seq = bump_data_version(cursor, db_type, board_id)
+    archived_at = change_timestamp()
+    move_links(cursor, db_type, board_id, link_ids, 'links', 'archived_links', {'archived_at': archived_at})
+    write_tombstones(cursor, db_type, board_id, link_ids, change_seq, archived_at)
+    notify_change(cursor, db_type, {'type': 'links', 'board_id': board_id, 'action': 'delete', 'version': change_seq,
+                                    'ids': link_ids})
+    return link_ids
+
+def unarchive_links(cursor, db_type, board_id, link_ids):
+    """보관한 링크를 links로 되돌리고 되돌린 수를 돌려준다 (id는 그대로, 변경분 동기화에는 새로 추가된 것처럼 보인다)"""
+    change_seq = bump_data_version(cursor, db_type, board_id)
+    restored = move_links(cursor, db_type, board_id, link_ids, 'archived_links', 'links',
+                          {'change_seq': change_seq, 'updated_at': change_timestamp()})
+    if not restored:
+        return 0
+    delete_tombstones(cursor, db_type, link_ids)
+    notify_change(cursor, db_type, {'type': 'links', 'board_id': board_id, 'action': 'insert', 'version': change_seq,
+                                    'ids': link_ids})
+    return restored
+
+def run_archive(board_id=None, now=None):
+    """모든 보드(또는 board_id 하나)의 보관할 링크를 ARCHIVE_BATCH_SIZE개씩 트랜잭션을 나눠 옮긴다 - {보드 id: 옮긴 수}
+    
+    옮긴 다음 보드마다 오래된 삭제 기록도 지운다 (prune_tombstones).
+    """
+    with app.app_context():
+        if board_id is None:
+            conn, db_type = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute('SELECT id FROM data_version ORDER BY id')
+            board_ids = [row[0] for row in cursor.fetchall()]
+            conn.rollback()
+        else:
+            board_ids = [board_id]
         
-        links_list = []
-        for index, link in enumerate(links_data):  # 추가 순서대로 번호 매기기
-            # 최신순으로 정렬되어 있으므로, 번호는 역순으로 계산
-            link_number = total_count - index
-            links_list.append({
-                'id': link[0],
-                'number': link_number,  # 추가 순서대로 번호 (첫 번째=1, 두 번째=2...)
-                'url': link[1],
-                'platform': link[2],
-                'added_by': link[3],
-                'date_added': link[4],
-                'rating': link[5],
-                'liked': bool(link[6]),
-                'disliked': bool(link[7]),
-                'memo': link[8] if len(link) > 8 else ''
-            })
-        
-        return jsonify(links_list)
-
-@app.route('/api/links/<int:link_id>', methods=['PUT', 'DELETE'])
-def update_link(link_id):
-    conn, db_type = get_db_connection()
-    cursor = conn.cursor()
+        archived = {}
+        for target_board_id in board_ids:
+            while True:
+                link_ids = run_write(lambda cursor, db_type: archive_links(cursor, db_type, target_board_id, now))
+                if link_ids:
+                    archived[target_board_id] = archived.get(target_board_id, 0) + len(link_ids)
+                if len(link_ids) < ARCHIVE_BATCH_SIZE:
+                    break
+            pruned = run_write(lambda cursor, db_type: prune_tombstones(cursor, db_type, target_board_id, now))
+            if pruned:
+                logger.info('보드 %d: 삭제 기록 %d개 정리', target_board_id, pruned)
+    return archived
+
+class LinkArchiver:
+    """ARCHIVE_INTERVAL_HOURS마다 run_archive()를 실행하는 백그라운드 스레드 (워커마다 하나, 첫 실행은 한 주기 뒤)
+    
+    워커 수명이 주기보다 짧으면 cron에서 python archive.py로 돌린다.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self.runs = 0
+        self.failures = 0
+        self.archived = 0
+        self.last_run = ''
+    
+    def ensure_started(self):
+        if ARCHIVE_INTERVAL_HOURS <= 0 or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, name='link-archiver', daemon=True).start()
     
+    def _run(self):
+        while True:
+            time.sleep(ARCHIVE_INTERVAL_HOURS * 3600)
+            try:
+                archived = run_archive()
+                with self._lock:
+                    self.runs += 1
+                    self.archived += sum(archived.values())
+                    self.last_run = change_timestamp()
+                if archived:
+                    logger.info('보관함으로 옮긴 링크: %s', archived)
+            except Exception:
+                with self._lock:
+                    self.failures += 1
+                logger.exception('링크 보관 작업 오류')
+    
+    def stats(self):
+        with self._lock:
+            return {'runs': self.runs, 'failures': self.failures, 'archived': self.archived}
+
+link_archiver = LinkArchiver()
+
+@app.before_request
+def start_link_archiver():
+    link_archiver.ensure_started()
+
+@app.route('/api/links/<int:link_id>', methods=['PUT', 'DELETE'], defaults={'board_id': DEFAULT_BOARD_ID})
+@app.route('/api/boards/<int:board_id>/links/<int:link_id>', methods=['PUT', 'DELETE'])
+def update_link(board_id, link_id):
     if request.method == 'PUT':
-        data = request.json
+        data = request.json or {}
         action = data.get('action')
         
-        if action == 'rating':
-            rating = data.get('rating', 5)
-            if db_type == 'postgresql':
-                cursor.execute('UPDATE links SET rating = %s WHERE id = %s', (rating, link_id))
-            else:
-                cursor.execute('UPDATE links SET rating = ? WHERE id = ?', (rating, link_id))
-        
-        elif action == 'like':
-            liked = data.get('liked', False)
-            if db_type == 'postgresql':
-                cursor.execute('UPDATE links SET liked = %s, disliked = %s WHERE id = %s', 
-                              (liked, False, link_id))
-            else:
-                cursor.execute('UPDATE links SET liked = ?, disliked = ? WHERE id = ?', 
-                              (liked, False if liked else 0, link_id))
-        
-        elif action == 'dislike':
-            disliked = data.get('disliked', False)
-            if db_type == 'postgresql':
-                cursor.execute('UPDATE links SET disliked = %s, liked = %s WHERE id = %s', 
-                              (disliked, False, link_id))
-            else:
-                cursor.execute('UPDATE links SET disliked = ?, liked = ? WHERE id = ?', 
-                              (disliked, False if disliked else 0, link_id))
-        
-        elif action == 'memo':
-            memo = data.get('memo', '')
-            if db_type == 'postgresql':
-                cursor.execute('UPDATE links SET memo = %s WHERE id = %s', (memo, link_id))
-            else:
-                cursor.execute('UPDATE links SET memo = ? WHERE id = ?', (memo, link_id))
+        if not isinstance(action, str) or action not in LINK_ACTIONS:
+            return jsonify({'success': False, 'error': '알 수 없는 action입니다.'})
+        value_key, default = LINK_ACTIONS[action][:2]
+        value = data.get(value_key, default)
+        error = link_action_error(action, value)
+        if error:
+            return jsonify({'success': False, 'error': error})
         
-        conn.commit()
-        conn.close()
+        def update(cursor, db_type):
+            # 없는 링크면 버전을 올리지 않고 되돌린다 (update_links_batch와 같음)
+            change_seq = bump_data_version(cursor, db_type, board_id)
+            if apply_link_action(cursor, db_type, board_id, link_id, action, value, change_seq) == 0:
+                raise NothingWritten(False)
+            notify_change(cursor, db_type, {'type': 'links', 'board_id': board_id, 'action': 'update', 'version': change_seq,
+                                            'ids': [link_id]})
+            return True
         
+        if not run_write(update):
+            return jsonify({'success': False, 'error': f'링크 {link_id}를 찾을 수 없습니다.'}), 404
         return jsonify({'success': True})
     
     elif request.method == 'DELETE':
-        if db_type == 'postgresql':
-            cursor.execute('DELETE FROM links WHERE id = %s', (link_id,))
-        else:
-            cursor.execute('DELETE FROM links WHERE id = ?', (link_id,))
-        conn.commit()
-        conn.close()
+        def delete(cursor, db_type):
+            # 이미 지워진 링크면 올린 버전을 되돌린다 (삭제는 다시 보내도 성공)
+            change_seq = bump_data_version(cursor, db_type, board_id)
+            if not delete_board_links(cursor, db_type, 'links', board_id, [link_id]):
+                raise NothingWritten()
+            write_tombstones(cursor, db_type, board_id, [link_id], change_seq, change_timestamp())
+            notify_change(cursor, db_type, {'type': 'links', 'board_id': board_id, 'action': 'delete', 'version': change_seq,
+                                            'ids': [link_id]})
+        
+        run_write(delete)
         
         return jsonify({'success': True})
 
-@app.route('/api/backup', methods=['GET'])
-def backup_data():
-    """데이터베이스 내용을 JSON으로 백업"""
-    try:
-        conn, db_type = get_db_connection()
-        cursor = conn.cursor()
-        
-        backup_data = {
-            'backup_date': datetime.now().isoformat(),
-            'links': [],
-            'customer_info': None
-        }
-        
-        # 링크 데이터 백업
-        cursor.execute('SELECT * FROM links')
-        links = cursor.fetchall()
-        
-        # 컬럼 이름 가져오기
-        if db_type == 'postgresql':
-            columns = ['id', 'url', 'platform', 'added_by', 'date_added', 'rating', 'liked', 'disliked', 'memo', 'customer_name', 'move_in_date']
-        else:
-            cursor.execute("PRAGMA table_info(links)")
-            columns = [row[1] for row in cursor.fetchall()]
-        
-        for link in links:
-            link_dict = dict(zip(columns, link))
-            backup_data['links'].append(link_dict)
+@app.route('/api/links/unarchive', methods=['POST'], defaults={'board_id': DEFAULT_BOARD_ID})
+@app.route('/api/boards/<int:board_id>/links/unarchive', methods=['POST'])
+def unarchive(board_id):
+    """보관한 링크를 목록으로 되돌린다
+    
+    요청: {"ids": [3, 5]} / 응답: {"success": true, "restored": 되돌린 수}
+    """
+    data = request.json or {}
+    link_ids = data.get('ids')
+    if (not isinstance(link_ids, list) or not link_ids or len(link_ids) > MAX_BATCH_OPERATIONS
+            or not all(isinstance(link_id, int) for link_id in link_ids)):
+        return jsonify({'success': False, 'error': '되돌릴 링크 id가 없습니다.'})
+    
+    restored = run_write(lambda cursor, db_type: unarchive_links(cursor, db_type, board_id, link_ids))
+    return jsonify({'success': True, 'restored': restored})
+
+@app.route('/api/links/batch', methods=['PATCH'], defaults={'board_id': DEFAULT_BOARD_ID})
+@app.route('/api/boards/<int:board_id>/links/batch', methods=['PATCH'])
+def update_links_batch(board_id):
+    """여러 링크 수정을 한 트랜잭션으로 처리
+    
+    요청: [{"id": 3, "action": "rating", "value": 8}, ...] 또는 {"operations": [...]}
+    응답: 항목마다 {"id", "action", "success"(, "error")} - 실패한 항목이 있어도 나머지는 반영한다.
+    """
+    data = request.json
+    operations = data.get('operations') if isinstance(data, dict) else data
+    
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'success': False, 'error': '수정할 항목이 없습니다.'})
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return jsonify({'success': False, 'error': f'한 번에 최대 {MAX_BATCH_OPERATIONS}개까지 수정할 수 있습니다.'})
+    
+    def update(cursor, db_type):
+        change_seq = bump_data_version(cursor, db_type, board_id)
         
-        # 고객 정보 백업
-        cursor.execute('SELECT * FROM customer_info')
-        customer = cursor.fetchone()
-        if customer:
-            if db_type == 'postgresql':
-                customer_columns = ['id', 'customer_name', 'move_in_date']
+        results = []
+        for operation in operations:
+            if not isinstance(operation, dict):
+                results.append({'id': None, 'action': None, 'success': False, 'error': '잘못된 항목입니다.'})
+                continue
+            
+            link_id = operation.get('id')
+            action = operation.get('action')
+            result = {'id': link_id, 'action': action, 'success': False}
+            
+            if not isinstance(link_id, int) or isinstance(link_id, bool):
+                result['error'] = '링크 id가 필요합니다.'
+            elif not isinstance(action, str) or action not in LINK_ACTIONS:
+                result['error'] = '알 수 없는 action입니다.'
             else:
-                cursor.execute("PRAGMA table_info(customer_info)")
-                customer_columns = [row[1] for row in cursor.fetchall()]
-            backup_data['customer_info'] = dict(zip(customer_columns, customer))
-        
-        conn.close()
+                value = operation.get('value', LINK_ACTIONS[action][1])
+                error = link_action_error(action, value)
+                if error:
+                    result['error'] = error
+                elif apply_link_action(cursor, db_type, board_id, link_id, action, value, change_seq) == 0:
+                    result['error'] = '링크를 찾을 수 없습니다.'
+                else:
+                    result['success'] = True
+            results.append(result)
         
-        return jsonify(backup_data)
+        applied_ids = [result['id'] for result in results if result['success']]
+        if not applied_ids:
+            # 바뀐 링크가 없으면 버전도 올리지 않는다
+            raise NothingWritten(results)
+        notify_change(cursor, db_type, {
+            'type': 'links',
+            'board_id': board_id,
+            'action': 'update',
+            'version': change_seq,
+            'ids': applied_ids
+        })
+        return results
+    
+    results = run_write(update)
+    applied = sum(1 for result in results if result['success'])
+    
+    return jsonify({'success': True, 'applied': applied, 'results': results})
+
+@app.route('/api/links/metadata', methods=['GET'], defaults={'board_id': DEFAULT_BOARD_ID})
+@app.route('/api/boards/<int:board_id>/links/metadata', methods=['GET'])
+def links_metadata(board_id):
+    """링크들의 매물 정보 (?ids=3,2,1)
+    
+    응답: {"metadata": {"3": {"status": "ok", "title", "price", "area", "thumbnail", "fetched_at"}, "2": {"status": "pending"}}}
+    아직 가져오지 않았거나 기한이 지난 url은 백그라운드로 가져오게 하고, 기한이 지난 정보는 그대로 돌려준다.
+    """
+    try:
+        link_ids = [int(value) for value in request.args.get('ids', '').split(',') if value.strip()][:MAX_PAGE_SIZE]
+    except ValueError:
+        return jsonify({'success': False, 'error': '잘못된 링크 id입니다.'})
+    
+    conn, db_type = get_db_connection()
+    cursor = conn.cursor()
+    get_data_version(cursor, db_type, board_id)  # 없는 보드면 404
+    if not link_ids:
+        return jsonify({'metadata': {}})
+    
+    placeholders = ', '.join(['%s'] * len(link_ids))
+    run_statement(cursor, db_type, f'''
+        SELECT links.id, links.url, m.status, m.title, m.price, m.area, m.thumbnail, m.fetched_at, m.expires_at
+        FROM links LEFT JOIN link_metadata m ON m.url = links.url
+        WHERE links.board_id = %s AND links.id IN ({placeholders})
+    ''', [board_id] + link_ids)
+    
+    now = change_timestamp()
+    metadata = {}
+    for link_id, url, status, title, price, area, thumbnail, fetched_at, expires_at in cursor.fetchall():
+        if status is None or expires_at <= now:
+            metadata_enricher.enqueue(url)
+        if status is None:
+            metadata[link_id] = {'status': 'pending'}
+        elif status == 'ok':
+            metadata[link_id] = {'status': status, 'title': title, 'price': price, 'area': area, 'thumbnail': thumbnail,
+                                 'fetched_at': fetched_at}
+        else:
+            metadata[link_id] = {'status': status, 'fetched_at': fetched_at}
+    
+    return jsonify({'metadata': metadata})
+
+@app.route('/api/links/<int:link_id>/memo', methods=['GET'], defaults={'board_id': DEFAULT_BOARD_ID})
+@app.route('/api/boards/<int:board_id>/links/<int:link_id>/memo', methods=['GET'])
+def link_memo(board_id, link_id):
+    """링크 하나의 메모 - 목록을 ?fields=로 메모 없이 받고 메모는 열 때만 가져온다 (보관한 링크도)
+    
+    응답: {"id": 3, "memo": "...", "version": 보드 버전}
+    """
+    conn, db_type = get_db_connection()
+    cursor = conn.cursor()
+    version = get_data_version(cursor, db_type, board_id)
+    etag = f'b{board_id}-v{version}-memo{link_id}'
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        run_statement(cursor, db_type, 'SELECT memo FROM links WHERE board_id = %s AND id = %s '
+                      'UNION ALL SELECT memo FROM archived_links WHERE board_id = %s AND id = %s',
+                      (board_id, link_id, board_id, link_id))
+        row = cursor.fetchone()
+        if row is None:
+            return jsonify({'success': False, 'error': f'링크 {link_id}를 찾을 수 없습니다.'}), 404
+        response = jsonify({'id': link_id, 'memo': row[0], 'version': version})
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/links/stats', methods=['GET'], defaults={'board_id': DEFAULT_BOARD_ID})
+@app.route('/api/boards/<int:board_id>/links/stats', methods=['GET'])
+def link_stats(board_id):
+    """보드 요약 - 링크 수, 평균 평점, 좋아요/싫어요/보관 수, 플랫폼/추가한 사람/추가한 날짜별 링크 수와 평균 평점
+    
+    link_counters에서 읽으므로 보드 크기와 상관없이 (값 종류 수만큼만) 읽는다.
+    {"version", "total", "average_rating", "liked", "disliked", "archived",
+     "platform": {"naver": {"count", "average_rating"}}, "added_by": {...}, "date_added": {...}}
+    """
+    conn, db_type = get_db_connection()
+    cursor = conn.cursor()
+    version = get_data_version(cursor, db_type, board_id)
+    etag = f'b{board_id}-v{version}-stats'
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        run_statement(cursor, db_type, 'SELECT dimension, name, link_count, rating_sum FROM link_counters WHERE board_id = %s',
+                      (board_id,))
+        counters = {}
+        for dimension, name, link_count, rating_sum in cursor.fetchall():
+            if link_count:
+                counters.setdefault(dimension, {})[name] = {
+                    'count': link_count,
+                    'average_rating': round(rating_sum / link_count, 2)
+                }
+        total = counters.get('total', {}).get('', {'count': 0, 'average_rating': None})
+        response = jsonify({
+            'version': version,
+            'total': total['count'],
+            'average_rating': total['average_rating'],
+            'liked': counters.get('liked', {}).get('yes', {}).get('count', 0),
+            'disliked': counters.get('disliked', {}).get('yes', {}).get('count', 0),
+            'archived': counters.get('archived', {}).get('', {}).get('count', 0),
+            'platform': counters.get('platform', {}),
+            'added_by': counters.get('added_by', {}),
+            'date_added': counters.get('date_added', {})
+        })
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+# 변경분의 링크 필드 - 목록 필드(번호 제외)와 변경 순번, 수정 시각
+CHANGE_FIELDS = tuple(field for field in LINK_FIELDS if field != 'number') + ('change_seq', 'updated_at')
+
+@app.route('/api/links/changes', methods=['GET'], defaults={'board_id': DEFAULT_BOARD_ID})
+@app.route('/api/boards/<int:board_id>/links/changes', methods=['GET'])
+def link_changes(board_id):
+    """since 순번 이후에 추가/수정/삭제된 링크만 돌려준다
+    
+    응답의 version을 다음 요청의 since로 쓴다. reset이 true면 (복원 등으로, 또는 since 뒤의 삭제 기록을
+    prune_tombstones가 지워서) 변경분을 이어갈 수 없으니 /api/links로 전체를 다시 불러와야 한다.
+    """
+    since = request.args.get('since', 0, type=int)
+    
+    conn, db_type = get_db_connection()
+    cursor = conn.cursor()
+    
+    # 버전을 먼저 읽고 그 버전까지의 변경만 돌려줘야 다음 since에서 빠지는 변경이 없다
+    run_statement(cursor, db_type, 'SELECT version, reset_seq FROM data_version WHERE id = %s', (board_id,))
+    row = cursor.fetchone()
+    if row is None:
+        raise BoardNotFound(board_id)
+    version, reset_seq = row
+    
+    if since < reset_seq or since > version:
+        return jsonify({'version': version, 'reset': True, 'links': [], 'deleted': []})
+    
+    run_statement(cursor, db_type, f'''
+        SELECT {', '.join(link_columns(CHANGE_FIELDS))}
+        FROM links WHERE board_id = %s AND change_seq > %s AND change_seq <= %s ORDER BY change_seq, id
+    ''', (board_id, since, version))
+    changed = cursor.fetchall()
+    run_statement(cursor, db_type, '''
+        SELECT link_id FROM link_tombstones WHERE board_id = %s AND change_seq > %s AND change_seq <= %s ORDER BY change_seq
+    ''', (board_id, since, version))
+    deleted = [row[0] for row in cursor.fetchall()]
+    
+    # 삭제 기록을 읽은 뒤에 지운 순번을 본다 - 읽는 사이에 정리됐어도 여기서 보인다
+    run_statement(cursor, db_type, 'SELECT pruned_seq FROM data_version WHERE id = %s', (board_id,))
+    if since < cursor.fetchone()[0]:
+        return jsonify({'version': version, 'reset': True, 'links': [], 'deleted': []})
+    
+    links_list = build_links_result(changed, CHANGE_FIELDS, 0, False)
+    
+    return jsonify({'version': version, 'reset': False, 'links': links_list, 'deleted': deleted})
+
+# 전체 백업은 보드의 링크를 모두, 증분 백업 조각(?since=버전)은 그 버전 뒤에 바뀐 것만 읽는다 (변경 순번/삭제 기록 인덱스 범위)
+# 보관함으로 옮긴 링크는 삭제 기록이 남으므로, 아직 보관함에 있으면 조각에 삭제 대신 보관한 링크로 넣는다
+BACKUP_SNAPSHOT_SQL = {
+    table: f"SELECT {', '.join(BACKUP_LINK_COLUMNS)} FROM {table} WHERE board_id = %s ORDER BY id"
+    for table in ('links', 'archived_links')
+}
+BACKUP_SEGMENT_SQL = {
+    'links': f"SELECT {', '.join(BACKUP_LINK_COLUMNS)} FROM links "
+             'WHERE board_id = %s AND change_seq > %s AND change_seq <= %s ORDER BY id',
+    'archived_links': f"SELECT {', '.join('archived_links.' + column for column in BACKUP_LINK_COLUMNS)} "
+                      'FROM link_tombstones JOIN archived_links ON archived_links.board_id = link_tombstones.board_id '
+                      'AND archived_links.id = link_tombstones.link_id '
+                      'WHERE link_tombstones.board_id = %s AND link_tombstones.change_seq > %s '
+                      'AND link_tombstones.change_seq <= %s ORDER BY archived_links.id',
+    'deleted': 'SELECT link_id FROM link_tombstones WHERE board_id = %s AND change_seq > %s AND change_seq <= %s '
+               'AND NOT EXISTS (SELECT 1 FROM archived_links WHERE archived_links.board_id = link_tombstones.board_id '
+               'AND archived_links.id = link_tombstones.link_id) ORDER BY link_id',
+}
+
+def iter_backup_batches(conn, db_type, sql, params, name):
+    """백업 쿼리 sql(%s 자리표시자) 결과를 서버 측 커서로 BACKUP_BATCH_SIZE개씩 읽는다 (컬럼 이름, 행 목록)"""
+    if db_type == 'postgresql':
+        # 이름 있는 커서 = 서버 측 커서 (전체 결과를 클라이언트로 한 번에 받지 않음)
+        cursor = conn.cursor(name=name)
+        cursor.itersize = BACKUP_BATCH_SIZE
+        cursor.execute(sql, params)
+    else:
+        cursor = conn.cursor()
+        cursor.execute(statement(sql).sqlite, params)
+    columns = None
+    while True:
+        rows = cursor.fetchmany(BACKUP_BATCH_SIZE)
+        if not rows:
+            break
+        if columns is None:
+            columns = [column[0] for column in cursor.description]
+        yield columns, rows
+    cursor.close()
+
+def read_customer_backup(conn, db_type, board_id):
+    cursor = conn.cursor()
+    run_statement(cursor, db_type, 'SELECT * FROM customer_info WHERE id = %s', (board_id,))
+    customer = cursor.fetchone()
+    if not customer:
+        return None
+    customer_columns = [column[0] for column in cursor.description]
+    return dict(zip(customer_columns, customer))
+
+def read_backup_header(conn, db_type, board_id, since=None):
+    """백업 첫머리 {"backup_date", "customer_info", "version"[, "since"]} - since부터 이어지는 조각을 만들 수 없으면 None
+    
+    버전을 링크보다 먼저 읽으므로 백업에 이 버전 뒤의 변경이 섞일 수 있다. 그 변경은 다음 조각(since=version)에
+    한 번 더 들어가지만 병합 복원은 같은 내용으로 덮어쓰므로 결과는 같다.
+    since가 보드를 통째로 복원하기(reset)나 삭제 기록을 지운 순번(pruned_seq) 전이거나 지금 버전보다 크면 이어 붙일 수 없다.
+    """
+    cursor = conn.cursor()
+    run_statement(cursor, db_type, 'SELECT version, reset_seq, pruned_seq FROM data_version WHERE id = %s', (board_id,))
+    row = cursor.fetchone()
+    if row is None:
+        raise BoardNotFound(board_id)
+    version, reset_seq, pruned_seq = row
+    header = {
+        'backup_date': datetime.now().isoformat(),
+        'customer_info': read_customer_backup(conn, db_type, board_id),
+        'version': version
+    }
+    if since is not None:
+        if since < max(reset_seq, pruned_seq) or since > version:
+            return None
+        header['since'] = since
+    return header
+
+def iter_backup(conn, db_type, board_id, header, backup_format='json', archived=False):
+    """백업 본문을 문자열 조각으로 내보낸다 (header에 since가 있으면 증분 조각)
+    
+    JSON: {"backup_date", "customer_info", "version"[, "since"], "links": [...][, "deleted": [...]]}
+    NDJSON: 첫 줄이 헤더, 그다음 줄부터 링크 하나씩, 조각이면 마지막에 {"deleted": [id...]} 줄.
+    보관한 링크는 "archived": true를 붙여서 먼저 보낸다 (전체 백업은 archived일 때만, 조각은 항상)
+    복원하면 백업 순서대로 id가 매겨지므로, 대개 더 오래된 보관 링크가 앞에 와야 목록 순서가 비슷하게 남는다.
+    """
+    dumps = app.json.dumps
+    since = header.get('since')
+    if since is None:
+        queries, params = BACKUP_SNAPSHOT_SQL, (board_id,)
+        tables = ['archived_links', 'links'] if archived else ['links']
+    else:
+        queries, params = BACKUP_SEGMENT_SQL, (board_id, since, header['version'])
+        tables = ['archived_links', 'links']
+    
+    def link_batches():
+        for table in tables:
+            for columns, rows in iter_backup_batches(conn, db_type, queries[table], params, f'backup_{table}'):
+                if table == 'archived_links':
+                    yield [dict(zip(columns, link), archived=True) for link in rows]
+                else:
+                    yield [dict(zip(columns, link)) for link in rows]
+    
+    def deleted_batches():
+        if since is not None:
+            for _, rows in iter_backup_batches(conn, db_type, queries['deleted'], params, 'backup_deleted'):
+                yield [row[0] for row in rows]
+    
+    if backup_format == 'ndjson':
+        yield dumps(header) + '\n'
+        for links_batch in link_batches():
+            yield ''.join(dumps(link) + '\n' for link in links_batch)
+        for deleted in deleted_batches():
+            yield dumps({'deleted': deleted}) + '\n'
+        return
+    
+    yield dumps(header)[:-1] + ', "links": ['
+    separator = ''
+    for links_batch in link_batches():
+        yield separator + ', '.join(dumps(link) for link in links_batch)
+        separator = ', '
+    if since is not None:
+        yield '], "deleted": ['
+        separator = ''
+        for deleted in deleted_batches():
+            yield separator + ', '.join(str(link_id) for link_id in deleted)
+            separator = ', '
+    yield ']}'
+
+@app.route('/api/backup', methods=['GET'], defaults={'board_id': DEFAULT_BOARD_ID})
+@app.route('/api/boards/<int:board_id>/backup', methods=['GET'])
+def backup_data(board_id):
+    """보드 내용을 JSON으로 백업 (?format=ndjson이면 한 줄에 링크 하나)
     
+    링크는 묶음 단위로 읽어서 바로 내보내므로 링크 수와 상관없이 메모리 사용량이 일정하다.
+    JSON 응답의 모양은 예전과 같고 "version"이 더 붙는다: {"backup_date", "customer_info", "version", "links": [...]}
+    NDJSON은 첫 줄에 {"backup_date", "customer_info", "version"}, 그다음 줄부터 링크가 하나씩 온다.
+    ?include_archived=1이면 보관한 링크도 넣는다.
+    
+    ?since=버전이면 그 버전 뒤에 바뀐 링크와 지운 링크 id만 담은 증분 조각을 만든다 (비용이 바뀐 양에 비례).
+    전체 백업의 version부터 조각을 받고, 다음 조각은 앞 조각의 version부터 받는다.
+    복원은 전체 백업부터 조각 순서대로 /api/restore?mode=merge로 병합한다 (조각은 mode 없이도 병합).
+    보드를 통째로 복원한 뒤라서 이어 붙일 수 없으면 409와 함께 지금 version을 돌려준다 - 이때는 전체 백업부터 다시 받는다.
+    """
+    backup_format = request.args.get('format', 'json')
+    archived = include_archived(request.args)
+    since = request.args.get('since', type=int)
+    
+    try:
+        conn, db_type = get_db_connection()
+        header = read_backup_header(conn, db_type, board_id, since)
+    except BoardNotFound:
+        raise
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
+    if header is None:
+        version = get_data_version(conn.cursor(), db_type, board_id)
+        return jsonify({'success': False, 'error': '이 버전부터 이어지는 증분 백업을 만들 수 없습니다. 전체 백업을 받으세요.',
+                        'version': version}), 409
+    
+    mimetype = 'application/x-ndjson' if backup_format == 'ndjson' else 'application/json'
+    return app.response_class(stream_with_context(iter_backup(conn, db_type, board_id, header, backup_format, archived)),
+                              mimetype=mimetype)
+
+def read_ndjson_backup(stream):
+    """NDJSON 백업에서 (헤더, 링크 이터레이터)를 꺼낸다 - 링크(조각이면 {"deleted": [...]} 줄도)는 읽는 대로 하나씩 나온다"""
+    lines = (line for line in stream if line.strip())
+    first = next(lines, None)
+    if first is None:
+        return {}, iter(())
+    header = json.loads(first)
+    
+    # 헤더 줄 없이 링크만 있는 파일도 받는다
+    if 'url' in header:
+        return {}, chain([header], (json.loads(line) for line in lines))
+    return header, (json.loads(line) for line in lines)
 
-@app.route('/api/restore', methods=['POST'])
-def restore_data():
-    """JSON 백업 데이터로 데이터베이스 복원"""
+def snapshot_sqlite(target_path):
+    """SQLite DB 파일 전체를 온라인 백업 API로 target_path에 복사하고 {보드 id: 버전}을 돌려준다
+    
+    WAL 모드에서는 읽기 트랜잭션 하나로 페이지를 한 번에 복사하므로 쓰기를 막지 않는다.
+    (여러 번에 나눠 복사하면 그사이 다른 연결이 쓸 때마다 처음부터 다시 복사한다)
+    돌려준 버전부터 ?since= 조각을 받으면 이 파일에 이어 붙일 수 있다.
+    """
+    source = connect_sqlite(SQLITE_PATH)
+    target = sqlite3.connect(target_path)
     try:
-        backup_data = request.json
+        source.backup(target)
+        return dict(target.execute('SELECT id, version FROM data_version ORDER BY id').fetchall())
+    finally:
+        target.close()
+        source.close()
+
+# link_restore_row()의 행을 넣는 INSERT (insert_values로 묶어서 넣는다)
+RESTORE_INSERT_SQL = '''
+    INSERT INTO links (board_id, url, platform, added_by, date_added, rating, liked, disliked, memo, change_seq,
+                       updated_at, url_tokens, memo_tokens, url_key)
+    VALUES %s
+'''
+
+def link_restore_row(link_data, db_type, board_id, change_seq, updated_at):
+    if db_type == 'postgresql':
+        # SQLite 백업의 0/1 값도 BOOLEAN 컬럼에 들어가도록 변환
+        liked = bool(link_data.get('liked', False))
+        disliked = bool(link_data.get('disliked', False))
+    else:
+        liked = link_data.get('liked', 0)
+        disliked = link_data.get('disliked', 0)
+    return (
+        board_id,
+        link_data.get('url', ''),
+        link_data.get('platform', 'other'),
+        link_data.get('added_by', 'unknown'),
+        link_data.get('date_added', datetime.now().strftime('%Y-%m-%d')),
+        link_data.get('rating', 5),
+        liked,
+        disliked,
+        link_data.get('memo', ''),
+        change_seq,
+        updated_at,
+        search_tokens(link_data.get('url', '')),
+        search_tokens(link_data.get('memo', '')),
+        canonical_url_key(link_data.get('url', ''))
+    )
+
+# 병합 복원 때 id를 그대로 넣는 컬럼 (앞의 id 다음은 link_restore_row 순서)
+MERGE_LINK_COLUMNS = ['id', 'board_id', 'url', 'platform', 'added_by', 'date_added', 'rating', 'liked', 'disliked', 'memo',
+                      'change_seq', 'updated_at', 'url_tokens', 'memo_tokens', 'url_key']
+
+def delete_board_links(cursor, db_type, table, board_id, link_ids):
+    """table에서 보드의 link_ids를 지우고 지운 행 수를 돌려준다"""
+    ids, id_params = id_list_condition(db_type, 'id', link_ids)
+    run_statement(cursor, db_type, f'DELETE FROM {table} WHERE board_id = %s AND {ids}', [board_id] + id_params)
+    return cursor.rowcount
+
+def upsert_links(cursor, db_type, table, rows, extra_columns=()):
+    """MERGE_LINK_COLUMNS (+ extra_columns) 행을 (board_id, id) 기준으로 넣거나 덮어쓴다
+    
+    PostgreSQL links는 board_id 해시 파티션이라 기본 키가 (board_id, id)이고 id만의 유일 제약은 없다.
+    SQLite links는 id가 rowid(기본 키)라 (board_id, id) 유일 인덱스를 충돌 대상으로 쓸 수 없으므로 id로 맞춘다
+    (다른 보드가 쓰는 id는 foreign_link_ids()로 미리 걸러서 결과는 같다).
+    """
+    columns = MERGE_LINK_COLUMNS + list(extra_columns)
+    conflict = 'id' if db_type == 'sqlite' and table == 'links' else 'board_id, id'
+    updates = ', '.join(f'{column} = EXCLUDED.{column}' for column in columns if column not in ('id', 'board_id'))
+    insert_values(cursor, db_type, f'''
+        INSERT INTO {table} ({', '.join(columns)}) VALUES %s
+        ON CONFLICT ({conflict}) DO UPDATE SET {updates}
+    ''', rows, page_size=RESTORE_BATCH_SIZE)
+
+def foreign_link_ids(cursor, db_type, board_id, link_ids):
+    """link_ids 중 다른 보드가 쓰는 id (병합 복원에서 건너뛴다)"""
+    ids, id_params = id_list_condition(db_type, 'id', link_ids)
+    run_statement(cursor, db_type, f'''
+        SELECT id FROM links WHERE {ids} AND board_id <> %s
+        UNION SELECT id FROM archived_links WHERE {ids} AND board_id <> %s
+    ''', id_params + [board_id] + id_params + [board_id])
+    return {row[0] for row in cursor.fetchall()}
+
+def merge_backup(cursor, db_type, board_id, customer_info, items):
+    """백업(전체 또는 증분 조각)을 보드에 병합하고 {restored, archived, deleted, skipped}를 돌려준다
+    
+    백업에 있는 링크만 id 기준으로 넣거나 덮어쓰고 나머지 링크(복원 중에 다른 사람이 고친 것 포함)는 그대로 둔다.
+    "archived": true인 링크는 보관함으로 넣고, {"deleted": [id...]} 항목의 링크는 지운다.
+    id가 없는 예전 백업의 링크는 새 링크로 넣는다. 다른 보드가 쓰는 id는 건너뛴다.
+    병합한 링크는 새 변경 순번을 받으므로 변경분 동기화 중인 화면은 전체를 다시 읽지 않는다.
+    """
+    change_seq = bump_data_version(cursor, db_type, board_id)
+    updated_at = change_timestamp()
+    counts = {'restored': 0, 'archived': 0, 'deleted': 0, 'skipped': 0}
+    changed_ids = []
+    max_id = 0
+    
+    if customer_info:
+        customer = (customer_info.get('customer_name', DEFAULT_CUSTOMER_NAME), customer_info.get('move_in_date', ''), board_id)
+        run_statement(cursor, db_type, 'UPDATE customer_info SET customer_name = %s, move_in_date = %s WHERE id = %s', customer)
+        notify_change(cursor, db_type, {'type': 'customer_info', 'board_id': board_id})
+    
+    items = iter(items)
+    while True:
+        batch = list(islice(items, RESTORE_BATCH_SIZE))
+        if not batch:
+            break
+        deleted_ids = [link_id for item in batch if 'deleted' in item for link_id in item['deleted']]
+        link_items = [item for item in batch if 'deleted' not in item]
+        foreign = foreign_link_ids(cursor, db_type, board_id,
+                                   [item['id'] for item in link_items if item.get('id') is not None] + deleted_ids)
         
-        if not backup_data or 'links' not in backup_data:
-            return jsonify({'success': False, 'error': '잘못된 백업 데이터입니다.'})
+        new_rows, hot_rows, archived_rows = [], [], []
+        for item in link_items:
+            row = link_restore_row(item, db_type, board_id, change_seq, updated_at)
+            if item.get('id') is None:
+                new_rows.append(row)
+            elif item['id'] in foreign:
+                counts['skipped'] += 1
+            elif item.get('archived'):
+                archived_rows.append((item['id'],) + row + (updated_at,))
+            else:
+                hot_rows.append((item['id'],) + row)
+        kept_ids = [link_id for link_id in deleted_ids if link_id not in foreign]
+        counts['skipped'] += len(deleted_ids) - len(kept_ids)
+        deleted_ids = kept_ids
         
-        conn, db_type = get_db_connection()
-        cursor = conn.cursor()
+        if hot_rows:
+            hot_ids = [row[0] for row in hot_rows]
+            delete_board_links(cursor, db_type, 'archived_links', board_id, hot_ids)
+            upsert_links(cursor, db_type, 'links', hot_rows)
+            delete_tombstones(cursor, db_type, hot_ids)
+            changed_ids.extend(hot_ids)
+            counts['restored'] += len(hot_rows)
         
-        # 기존 데이터 삭제
-        cursor.execute('DELETE FROM links')
-        cursor.execute('DELETE FROM customer_info')
+        # 보관함으로 가거나 지워지는 링크는 links에서 빼고 삭제 기록을 남긴다
+        removed_ids = [row[0] for row in archived_rows] + deleted_ids
+        if removed_ids:
+            delete_board_links(cursor, db_type, 'links', board_id, removed_ids)
+            write_tombstones(cursor, db_type, board_id, removed_ids, change_seq, updated_at)
+            changed_ids.extend(removed_ids)
+        if archived_rows:
+            upsert_links(cursor, db_type, 'archived_links', archived_rows, ['archived_at'])
+            counts['archived'] += len(archived_rows)
+        if deleted_ids:
+            delete_board_links(cursor, db_type, 'archived_links', board_id, deleted_ids)
+            counts['deleted'] += len(deleted_ids)
         
-        # 고객 정보 복원
-        if backup_data.get('customer_info'):
-            customer_info = backup_data['customer_info']
-            if db_type == 'postgresql':
-                cursor.execute('''
-                    INSERT INTO customer_info (id, customer_name, move_in_date)
-                    VALUES (%s, %s, %s)
-                ''', (
-                    customer_info.get('id', 1),
-                    customer_info.get('customer_name', '제일좋은집 찾아드릴분'),
-                    customer_info.get('move_in_date', '')
-                ))
-            else:
-                cursor.execute('''
-                    INSERT INTO customer_info (id, customer_name, move_in_date)
-                    VALUES (?, ?, ?)
-                ''', (
-                    customer_info.get('id', 1),
-                    customer_info.get('customer_name', '제일좋은집 찾아드릴분'),
-                    customer_info.get('move_in_date', '')
-                ))
+        if new_rows:
+            changed_ids.extend(insert_values(cursor, db_type, RESTORE_INSERT_SQL, new_rows, RESTORE_BATCH_SIZE, returning_id=True))
+            counts['restored'] += len(new_rows)
+        
+        max_id = max([max_id] + [row[0] for row in hot_rows + archived_rows])
+    
+    # id를 직접 넣었으므로 시퀀스가 그 뒤부터 나가게 한다 (SQLite AUTOINCREMENT는 알아서 맞춘다)
+    if db_type == 'postgresql' and max_id:
+        cursor.execute('''
+            SELECT setval(pg_get_serial_sequence('links', 'id'), %s)
+            WHERE %s > COALESCE(pg_sequence_last_value(pg_get_serial_sequence('links', 'id')::regclass), 0)
+        ''', (max_id, max_id))
+    
+    notify_change(cursor, db_type, {'type': 'links', 'board_id': board_id, 'action': 'update', 'version': change_seq,
+                                    'ids': changed_ids})
+    return counts
+
+@app.route('/api/restore', methods=['POST'], defaults={'board_id': DEFAULT_BOARD_ID})
+@app.route('/api/boards/<int:board_id>/restore', methods=['POST'])
+def restore_data(board_id):
+    """JSON 백업 데이터로 보드 복원 (다른 보드는 건드리지 않는다)
+    
+    백업의 고객 정보 id와 상관없이 요청한 보드로 복원한다.
+    Content-Type이 application/x-ndjson이면 /api/backup?format=ndjson 형식을 한 줄씩 읽으므로 본문 전체를
+    문자열로 올리지 않는다. 본문은 쓰기 트랜잭션을 열기 전에 요청 스레드에서 끝까지 읽는다 - SQLite 쓰기 스레드가
+    느린 업로드를 기다리며 쓰기 잠금을 잡고 있으면 다른 쓰기가 모두 밀린다 (run_write 참고).
+    "archived": true인 링크는 보관함으로 복원한다. 이런 링크가 있는 백업이면 보드의 보관함도 백업 내용으로 바꾸고,
+    없으면(예전 백업) 보관함은 그대로 둔다.
+    
+    ?mode=merge거나 증분 조각("since"가 있는 백업)이면 보드를 비우지 않고 merge_backup()으로 병합한다.
+    전체 백업부터 조각을 순서대로 병합하면 백업 체인을 복원할 수 있고, 그사이 다른 사람이 고친 링크도 남는다.
+    """
+    try:
+        start = time.perf_counter()
+        
+        if request.mimetype == 'application/x-ndjson':
+            # werkzeug LimitedStream을 그대로 줄 단위로 읽으면 아주 느리므로 버퍼를 씌운다
+            # (gunicorn은 자체 버퍼가 있는 Body를 그대로 넘겨주는데, 이건 io 스트림이 아니라서 감쌀 수 없다)
+            stream = request.stream
+            if isinstance(stream, io.RawIOBase):
+                stream = io.BufferedReader(stream, 1 << 16)
+            header, link_items = read_ndjson_backup(stream)
         else:
-            # 기본 고객 정보 삽입
-            if db_type == 'postgresql':
-                cursor.execute('INSERT INTO customer_info (id, customer_name, move_in_date) VALUES (1, %s, %s)', ('제일좋은집 찾아드릴분', ''))
-            else:
-                cursor.execute('INSERT INTO customer_info (id, customer_name, move_in_date) VALUES (1, "제일좋은집 찾아드릴분", "")')
+            backup_data = request.json
+            
+            if not backup_data or 'links' not in backup_data:
+                return jsonify({'success': False, 'error': '잘못된 백업 데이터입니다.'})
+            header = backup_data
+            link_items = backup_data['links']
+            if 'deleted' in backup_data:
+                link_items = chain(link_items, [{'deleted': backup_data['deleted']}])
+        link_items = list(link_items)
+        customer_info = header.get('customer_info')
         
-        # 링크 데이터 복원
-        for link_data in backup_data['links']:
-            if db_type == 'postgresql':
-                cursor.execute('''
-                    INSERT INTO links (url, platform, added_by, date_added, rating, liked, disliked, memo)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ''', (
-                    link_data.get('url', ''),
-                    link_data.get('platform', 'other'),
-                    link_data.get('added_by', 'unknown'),
-                    link_data.get('date_added', datetime.now().strftime('%Y-%m-%d')),
-                    link_data.get('rating', 5),
-                    link_data.get('liked', False),
-                    link_data.get('disliked', False),
-                    link_data.get('memo', '')
-                ))
-            else:
-                cursor.execute('''
-                    INSERT INTO links (url, platform, added_by, date_added, rating, liked, disliked, memo)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    link_data.get('url', ''),
-                    link_data.get('platform', 'other'),
-                    link_data.get('added_by', 'unknown'),
-                    link_data.get('date_added', datetime.now().strftime('%Y-%m-%d')),
-                    link_data.get('rating', 5),
-                    link_data.get('liked', 0),
-                    link_data.get('disliked', 0),
-                    link_data.get('memo', '')
-                ))
+        if request.args.get('mode') == 'merge' or 'since' in header:
+            counts = run_write(lambda cursor, db_type: merge_backup(cursor, db_type, board_id, customer_info, link_items))
+            if customer_info:
+                index_page_cache.invalidate(board_id)
+            
+            elapsed = time.perf_counter() - start
+            merged = counts['restored'] + counts['archived'] + counts['deleted']
+            return jsonify(dict(counts, **{
+                'success': True,
+                'message': f"{counts['restored'] + counts['archived']}개의 링크를 병합하고 {counts['deleted']}개를 지웠습니다.",
+                'elapsed_seconds': round(elapsed, 3),
+                'rows_per_sec': round(merged / elapsed) if elapsed > 0 else merged
+            }))
         
-        conn.commit()
-        conn.close()
+        def replace(cursor, db_type):
+            # 기존 데이터 삭제 - 링크 id가 모두 바뀌므로 이전 순번의 변경분 동기화는 전체 재조회로 돌린다
+            change_seq = bump_data_version(cursor, db_type, board_id)
+            updated_at = change_timestamp()
+            run_statement(cursor, db_type, 'DELETE FROM links WHERE board_id = %s', (board_id,))
+            run_statement(cursor, db_type, 'DELETE FROM customer_info WHERE id = %s', (board_id,))
+            run_statement(cursor, db_type, 'DELETE FROM link_tombstones WHERE board_id = %s', (board_id,))
+            run_statement(cursor, db_type, 'UPDATE data_version SET reset_seq = %s WHERE id = %s', (change_seq, board_id))
+            
+            # 고객 정보 복원 (없으면 기본 고객 정보)
+            customer = customer_info or {}
+            run_statement(cursor, db_type, 'INSERT INTO customer_info (id, customer_name, move_in_date) VALUES (%s, %s, %s)', (
+                board_id,
+                customer.get('customer_name', '제일좋은집 찾아드릴분'),
+                customer.get('move_in_date', '')
+            ))
+            
+            # 링크 데이터 복원 (묶음 단위 일괄 INSERT, 전체가 한 트랜잭션)
+            # 보관할 링크는 change_seq 0으로 links에 넣었다가 마지막에 보관함으로 옮긴다
+            restored = 0
+            has_archived = False
+            items = iter(link_items)
+            while True:
+                batch = [link_restore_row(link_data, db_type, board_id, 0 if link_data.get('archived') else change_seq, updated_at)
+                         for link_data in islice(items, RESTORE_BATCH_SIZE)]
+                if not batch:
+                    break
+                if not has_archived and any(row[9] == 0 for row in batch):
+                    has_archived = True
+                    run_statement(cursor, db_type, 'DELETE FROM archived_links WHERE board_id = %s', (board_id,))
+                insert_values(cursor, db_type, RESTORE_INSERT_SQL, batch, RESTORE_BATCH_SIZE)
+                restored += len(batch)
+            
+            if has_archived:
+                run_statement(cursor, db_type, 'SELECT id FROM links WHERE board_id = %s AND change_seq = 0', (board_id,))
+                archived_ids = [row[0] for row in cursor.fetchall()]
+                for start_index in range(0, len(archived_ids), ARCHIVE_BATCH_SIZE):
+                    move_links(cursor, db_type, board_id, archived_ids[start_index:start_index + ARCHIVE_BATCH_SIZE], 'links',
+                               'archived_links', {'change_seq': change_seq, 'archived_at': updated_at})
+            
+            notify_change(cursor, db_type, {'type': 'reset', 'board_id': board_id, 'version': change_seq})
+            return restored
         
+        restored = run_write(replace)
+        index_page_cache.invalidate(board_id)
+        
+        elapsed = time.perf_counter() - start
         return jsonify({
             'success': True, 
-            'message': f'{len(backup_data["links"])}개의 링크가 복원되었습니다.'
+            'message': f'{restored}개의 링크가 복원되었습니다.',
+            'restored': restored,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_sec': round(restored / elapsed) if elapsed > 0 else restored
         })
     
+    except BoardNotFound:
+        raise
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/events', methods=['GET'], defaults={'board_id': DEFAULT_BOARD_ID})
+@app.route('/api/boards/<int:board_id>/events', methods=['GET'])
+def events(board_id):
+    """보드의 링크/고객 정보 변경을 Server-Sent Events로 알린다
+    
+    이벤트 종류: links (version, action, ids), reset (복원됨 - 전체 다시 조회), customer_info
+    기다리는 동안 DB 연결은 잡지 않는다.
+    """
+    change_hub.ensure_started()
+    subscriber = change_hub.subscribe(board_id)
+    if subscriber is None:
+        response = jsonify({'success': False, 'error': '실시간 연결이 너무 많습니다.'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(SSE_RETRY_AFTER)
+        return response
+    
+    def generate():
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    event = subscriber.get(timeout=SSE_HEARTBEAT)
+                except queue.Empty:
+                    yield ': ping\n\n'
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            change_hub.unsubscribe(board_id, subscriber)
+    
+    return app.response_class(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/db/pool', methods=['GET'])
+def db_pool_stats():
+    """연결 풀 사용률과 대기 시간 (풀 크기 조정용)"""
+    return jsonify(pool_stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """요청/단계별 시간 히스토그램, 쿼리/행 수, 연결 풀 상태 (Prometheus 텍스트 형식)
+    
+    값은 이 워커 프로세스 것만이다. gunicorn 워커가 여럿이면 워커마다 따로 누적된다.
+    """
+    lines = request_stats.render()
+    for key, value in pool_stats().items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            lines.append(f'# TYPE db_pool_{key} gauge')
+            lines.append(f'db_pool_{key} {value}')
+    lines.append('# TYPE sse_clients gauge')
+    lines.append(f'sse_clients {change_hub.client_count()}')
+    for key, value in metadata_enricher.stats().items():
+        lines.append(f'# TYPE metadata_{key} gauge')
+        lines.append(f'metadata_{key} {value}')
+    for key, value in link_archiver.stats().items():
+        lines.append(f'# TYPE archive_{key} gauge')
+        lines.append(f'archive_{key} {value}')
+    if DATABASE_REPLICA_URLS:
+        replicas = replica_router.stats()['replicas']
+        lines.append('# TYPE db_replica_healthy gauge')
+        lines.extend(f'db_replica_healthy{{replica="{replica["index"]}"}} {int(bool(replica.get("healthy")))}'
+                     for replica in replicas)
+        lines.append('# TYPE db_replica_lag gauge')
+        lines.extend(f'db_replica_lag{{replica="{replica["index"]}"}} {replica["lag"]}'
+                     for replica in replicas if replica.get('lag') is not None)
+    return app.response_class('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     init_db()
     port = int(os.environ.get('PORT', 5000))
@@ -0,0 +1,48 @@
+"""오래된 링크 보관함으로 옮기기
+
+좋아요가 아니고 추가한 지 ARCHIVE_AFTER_DAYS(기본 180일)가 지난 링크와
+싫어요 후 ARCHIVE_DISLIKED_AFTER_DAYS(기본 30일)가 지난 링크를 archived_links로 옮긴다.
+목록 조회는 보관하지 않은 링크만 읽고, ?include_archived=1로 함께 볼 수 있으며
+POST /api/links/unarchive로 되돌릴 수 있다.
+보관한 뒤 TOMBSTONE_RETENTION_DAYS(기본 30일)보다 오래된 삭제 기록도 지운다 (--dry-run에서는 건너뜀).
+워커 안에서도 ARCHIVE_INTERVAL_HOURS마다 돌지만, 워커가 자주 재시작되면 cron에서 이 스크립트를 돌린다.
+
+    python archive.py --dry-run
+    python archive.py --board 3
+"""
+import argparse
+
+import app as app_module
+
+def run(board_id=None, dry_run=False):
+    if dry_run:
+        # 옮기는 쿼리를 그대로 돌리고 롤백한다 (보드마다 ARCHIVE_BATCH_SIZE개까지만 센다)
+        with app_module.app.app_context():
+            app_module.init_db()
+            conn, db_type = app_module.get_db_connection()
+            cursor = conn.cursor()
+            if board_id is None:
+                cursor.execute('SELECT id FROM data_version ORDER BY id')
+                board_ids = [row[0] for row in cursor.fetchall()]
+            else:
+                board_ids = [board_id]
+            archived = {}
+            for target_board_id in board_ids:
+                link_ids = app_module.archive_links(cursor, db_type, target_board_id)
+                if link_ids:
+                    archived[target_board_id] = len(link_ids)
+            conn.rollback()
+        return archived
+
+    app_module.init_db()
+    return app_module.run_archive(board_id)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='오래된 링크 보관함으로 옮기기')
+    parser.add_argument('--board', type=int, help='이 보드만 옮긴다 (없으면 모든 보드)')
+    parser.add_argument('--dry-run', action='store_true', help='옮길 링크 수만 보여주고 바꾸지 않는다')
+    args = parser.parse_args()
+    archived = run(args.board, args.dry_run)
+    for board_id, count in sorted(archived.items()):
+        print(f"보드 {board_id}: {count}개 {'(옮길 예정)' if args.dry_run else '보관'}")
+    print(f"합계 {sum(archived.values())}개" if archived else '보관할 링크가 없습니다.')
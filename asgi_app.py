@@ -0,0 +1,565 @@
+"""비동기(ASGI) 서버 모드
+
+app.py의 Flask 앱과 같은 주소와 JSON 모양으로, 자주 불리는 라우트(links, update_link, customer_info, backup_data)를
+비동기 DB 드라이버(PostgreSQL은 asyncpg, SQLite는 aiosqlite)로 처리한다. DB 왕복이나 느린 클라이언트를
+기다리는 동안 스레드를 잡지 않으므로 프로세스 하나가 동시 연결 수백 개를 받을 수 있다.
+변경 알림(/api/events)도 이벤트 루프에서 보내므로 열어 둔 화면이 스레드를 잡지 않는다 (gunicorn 모드는 워커당 몇 개뿐).
+나머지 라우트(복원, 일괄 수정, 변경분, 화면, /metrics 등)는 같은 프로세스 안의 Flask 앱이 처리한다.
+
+    pip install -r requirements-async.txt
+    uvicorn asgi_app:app --host 0.0.0.0 --port $PORT --workers 2
+
+스키마는 지금처럼 app.init_db()로 만든다 (Procfile의 release 단계). 동기 Flask 모드(gunicorn app:app)도 그대로 쓸 수 있다.
+"""
+import asyncio
+import functools
+import json
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import aiosqlite
+import asyncpg
+from starlette.applications import Starlette
+from starlette.middleware.wsgi import WSGIMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Mount, Route
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+import app as flask_app_module
+from app import (BACKUP_BATCH_SIZE, BACKUP_LINK_COLUMNS, BACKUP_SEGMENT_SQL, BACKUP_SNAPSHOT_SQL, CHANGE_CHANNEL,
+                 DB_POOL_MIN, DEFAULT_BOARD_ID, DEFAULT_CUSTOMER_NAME, FIND_DUPLICATE_LINK_SQL, INSERT_LINK_SQL,
+                 LINK_ACTIONS, MAX_EVENT_IDS, REPLICA_WRITE_COOKIE, REPLICA_WRITE_COOKIE_MAX_AGE,
+                 SQLITE_BUSY_TIMEOUT_MS, SQLITE_CACHED_STATEMENTS, SSE_HEARTBEAT, SSE_RETRY_AFTER, BoardNotFound,
+                 LinksQuery, NothingWritten, canonical_url_key, change_hub, change_timestamp, encode_links_payload,
+                 include_archived, index_page_cache, link_action_error, link_action_statement, link_fields, links_cache,
+                 links_cache_key, links_etag, list_page_args, merge_memos, negotiate_encoding, parse_write_versions,
+                 search_tokens, sqlite_pragmas, statement, stream_compressor, write_versions_cookie)
+
+# 비동기 연결은 기다리는 동안 스레드를 잡지 않으므로 동기 풀(DB_POOL_MAX)보다 크게 잡는다
+ASYNC_DB_POOL_MAX = int(os.environ.get('ASYNC_DB_POOL_MAX', 20))
+# SSE 연결은 큐 하나만 차지하므로 app.SSE_MAX_CLIENTS(스레드 수의 1/4)보다 훨씬 많이 받는다
+SSE_ASYNC_MAX_CLIENTS = int(os.environ.get('SSE_ASYNC_MAX_CLIENTS', 1000))
+
+# Flask의 jsonify와 같은 JSON (키 정렬, ASCII) - 두 모드의 응답과 캐시 내용이 같도록
+dumps = flask_app_module.app.json.dumps
+
+class AsyncConnection:
+    """asyncpg/aiosqlite 연결을 같은 모양으로 쓰기 위한 래퍼
+
+    SQL은 app.py와 같은 형식이다. %s 자리표시자는 app.statement()가 방언에 맞게 한 번만 바꿔 두고,
+    asyncpg는 연결마다 같은 SQL의 준비된 문장을 다시 쓴다.
+    """
+
+    def __init__(self, conn, db_type):
+        self.conn = conn
+        self.db_type = db_type
+
+    async def fetch(self, sql, params=()):
+        if self.db_type == 'postgresql':
+            return await self.conn.fetch(statement(sql).numbered, *params)
+        async with self.conn.execute(statement(sql).sqlite, params) as cursor:
+            return await cursor.fetchall()
+
+    async def fetchrow(self, sql, params=()):
+        if self.db_type == 'postgresql':
+            return await self.conn.fetchrow(statement(sql).numbered, *params)
+        async with self.conn.execute(statement(sql).sqlite, params) as cursor:
+            return await cursor.fetchone()
+
+    async def execute(self, sql, params=()):
+        """바뀐 행 수를 돌려준다"""
+        if self.db_type == 'postgresql':
+            status = await self.conn.execute(statement(sql).numbered, *params)
+            return int(status.split()[-1]) if status.split()[-1].isdigit() else 0
+        async with self.conn.execute(statement(sql).sqlite, params) as cursor:
+            return cursor.rowcount
+
+    async def insert(self, sql, params=()):
+        """INSERT 하고 새 행의 id를 돌려준다"""
+        if self.db_type == 'postgresql':
+            return await self.conn.fetchval(statement(sql).numbered + ' RETURNING id', *params)
+        async with self.conn.execute(statement(sql).sqlite, params) as cursor:
+            return cursor.lastrowid
+
+    @asynccontextmanager
+    async def transaction(self):
+        if self.db_type == 'postgresql':
+            async with self.conn.transaction():
+                yield
+        else:
+            # 처음부터 쓰기 잠금을 잡는다 (app.SQLiteWriteQueue와 같음)
+            await self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield
+            except BaseException:
+                await self.conn.rollback()
+                raise
+            await self.conn.commit()
+
+    async def iter_rows(self, sql, params=()):
+        """큰 결과를 BACKUP_BATCH_SIZE개씩 (PostgreSQL은 서버 측 커서) 읽는다"""
+        if self.db_type == 'postgresql':
+            async with self.conn.transaction():
+                cursor = await self.conn.cursor(statement(sql).numbered, *params)
+                while True:
+                    rows = await cursor.fetch(BACKUP_BATCH_SIZE)
+                    if not rows:
+                        break
+                    yield rows
+        else:
+            async with self.conn.execute(statement(sql).sqlite, params) as cursor:
+                while True:
+                    rows = await cursor.fetchmany(BACKUP_BATCH_SIZE)
+                    if not rows:
+                        break
+                    yield rows
+
+async def connect_sqlite():
+    # app.connect_sqlite와 같은 설정 (WAL, busy timeout 등)
+    conn = await aiosqlite.connect(flask_app_module.SQLITE_PATH, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+                                  cached_statements=SQLITE_CACHED_STATEMENTS)
+    for pragma in sqlite_pragmas():
+        await conn.execute(pragma)
+    return conn
+
+class AsyncDatabase:
+    """워커 프로세스마다 연결 풀 하나 (PostgreSQL은 asyncpg 풀, SQLite는 aiosqlite 연결 큐)"""
+
+    def __init__(self):
+        self.pool = None
+        self.db_type = None
+        self._sqlite_idle = None
+        self._sqlite_slots = None
+
+    async def start(self):
+        database_url = os.environ.get('DATABASE_URL')
+        if database_url:
+            self.db_type = 'postgresql'
+            self.pool = await asyncpg.create_pool(database_url, min_size=DB_POOL_MIN, max_size=ASYNC_DB_POOL_MAX)
+        else:
+            self.db_type = 'sqlite'
+            self._sqlite_idle = []
+            self._sqlite_slots = asyncio.Semaphore(ASYNC_DB_POOL_MAX)
+
+    async def stop(self):
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+        while self._sqlite_idle:
+            await self._sqlite_idle.pop().close()
+
+    @asynccontextmanager
+    async def connection(self):
+        if self.db_type == 'postgresql':
+            async with self.pool.acquire() as conn:
+                yield AsyncConnection(conn, 'postgresql')
+            return
+        # SQLite 연결은 요청마다 새로 열지 않고 다 쓰면 돌려놓는다 (연결마다 aiosqlite 스레드 하나)
+        async with self._sqlite_slots:
+            conn = self._sqlite_idle.pop() if self._sqlite_idle else await connect_sqlite()
+            try:
+                yield AsyncConnection(conn, 'sqlite')
+            finally:
+                if conn.in_transaction:
+                    await conn.rollback()
+                self._sqlite_idle.append(conn)
+
+db = AsyncDatabase()
+
+def json_response(data, status_code=200):
+    # jsonify와 같은 모양 (짧은 구분자 + 줄바꿈)
+    return Response(dumps(data, separators=(',', ':')) + '\n', status_code=status_code, media_type='application/json')
+
+def board_id_of(request):
+    return request.path_params.get('board_id', DEFAULT_BOARD_ID)
+
+async def get_data_version(conn, board_id):
+    row = await conn.fetchrow('SELECT version FROM data_version WHERE id = %s', (board_id,))
+    if row is None:
+        raise BoardNotFound(board_id)
+    return row[0]
+
+async def bump_data_version(conn, board_id):
+    updated = await conn.execute('UPDATE data_version SET version = version + 1 WHERE id = %s', (board_id,))
+    if updated == 0:
+        raise BoardNotFound(board_id)
+    return await get_data_version(conn, board_id)
+
+async def notify_change(conn, event):
+    # app.notify_change와 같음 - SQLite는 Flask 쪽 ChangeHub 폴러가 data_version 변화를 보고 알린다
+    if conn.db_type == 'postgresql':
+        if len(event.get('ids', ())) > MAX_EVENT_IDS:
+            event = {key: value for key, value in event.items() if key != 'ids'}
+        await conn.fetchrow('SELECT pg_notify(%s, %s)', (CHANGE_CHANNEL, json.dumps(event)))
+
+async def fetch_links(conn, board_id, args, paginated, after_id, limit):
+    """app.fetch_links와 같은 결과 - 같은 app.LinksQuery의 SQL을 비동기 드라이버로 실행한다"""
+    query = LinksQuery(conn.db_type, board_id, args, paginated, after_id, limit)
+    links_data = await conn.fetch(*query.rows_query())
+    number = None
+    number_query = query.number_query(links_data)
+    if number_query is not None:
+        number = (await conn.fetchrow(*number_query))[0]
+    return query.page(links_data, number)
+
+def parse_int(value):
+    # request.args.get(..., type=int)처럼 숫자가 아니면 None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def accepted_encoding(request):
+    # app.negotiate_encoding과 같은 규칙 (werkzeug의 Accept-Encoding 해석)
+    return negotiate_encoding(parse_accept_header(request.headers.get('accept-encoding'), Accept))
+
+def etag_matches(request, etag):
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(',')]
+    return '*' in candidates or any(value.removeprefix('W/').strip('"') == etag for value in candidates)
+
+async def links(request):
+    board_id = board_id_of(request)
+
+    if request.method == 'POST':
+        data = await request.json()
+        url = data.get('url')
+        platform = data.get('platform')
+        added_by = data.get('added_by')
+        memo = data.get('memo', '')
+
+        if not url or not platform or not added_by:
+            return json_response({'success': False, 'error': '필수 정보가 누락되었습니다.'})
+
+        date_added = datetime.now().strftime('%Y-%m-%d')
+        url_key = canonical_url_key(url)
+        async with db.connection() as conn, conn.transaction():
+            # app.links()와 같음 - 같은 보드에 같은 매물이 있으면 메모만 합친다
+            duplicate = await find_duplicate_link(conn, board_id, url_key)
+            if duplicate is not None:
+                link_id, existing_memo, archived = duplicate
+                if not archived and memo and memo not in existing_memo:
+                    change_seq = await bump_data_version(conn, board_id)
+                    await apply_link_action(conn, board_id, link_id, 'memo', merge_memos([existing_memo, memo]), change_seq)
+                    await notify_change(conn, {'type': 'links', 'board_id': board_id, 'action': 'update', 'version': change_seq,
+                                               'ids': [link_id]})
+                return json_response({'success': True, 'id': link_id, 'duplicate': True, 'archived': archived})
+
+            change_seq = await bump_data_version(conn, board_id)
+            link_id = await conn.insert(INSERT_LINK_SQL, (board_id, url, platform, added_by, date_added, memo, change_seq,
+                                                          change_timestamp(), search_tokens(url), search_tokens(memo), url_key))
+            await notify_change(conn, {'type': 'links', 'board_id': board_id, 'action': 'insert', 'version': change_seq,
+                                       'ids': [link_id]})
+
+        flask_app_module.metadata_enricher.enqueue(url)
+        return json_response({'success': True, 'id': link_id, 'duplicate': False, 'archived': False})
+
+    args = request.query_params
+    try:
+        paginated, after_id, limit = list_page_args(args)
+    except ValueError:
+        return json_response({'success': False, 'error': '잘못된 페이지 파라미터입니다.'})
+    try:
+        link_fields(args)
+    except ValueError as e:
+        return json_response({'success': False, 'error': f'알 수 없는 필드입니다: {e}'})
+
+    async with db.connection() as conn:
+        version = await get_data_version(conn, board_id)
+        cache_key = links_cache_key(args, paginated, after_id, limit)
+        encoding = accepted_encoding(request)
+        etag = links_etag(board_id, version, cache_key, encoding)
+
+        if etag_matches(request, etag):
+            response = Response(status_code=304)
+        else:
+            payload = links_cache.get(board_id, version, cache_key)
+            if payload is None:
+                result = await fetch_links(conn, board_id, args, paginated, after_id, limit)
+                payload = dumps(result).encode('utf-8')
+                links_cache.put(board_id, version, cache_key, payload)
+            body, content_encoding = encode_links_payload(board_id, version, cache_key, payload, encoding)
+            response = Response(body, media_type='application/json')
+            if content_encoding:
+                response.headers['Content-Encoding'] = content_encoding
+
+    response.headers['ETag'] = f'"{etag}"'
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+async def find_duplicate_link(conn, board_id, url_key):
+    if conn.db_type == 'postgresql':
+        await conn.fetchrow('SELECT pg_advisory_xact_lock(%s, hashtext(%s))', (board_id, url_key))
+    row = await conn.fetchrow(FIND_DUPLICATE_LINK_SQL, (board_id, url_key, board_id, url_key))
+    return (row[0], row[1], bool(row[2])) if row is not None else None
+
+async def apply_link_action(conn, board_id, link_id, action, value, change_seq):
+    return await conn.execute(*link_action_statement(board_id, link_id, action, value, change_seq))
+
+async def update_link(request):
+    board_id = board_id_of(request)
+    link_id = request.path_params['link_id']
+
+    if request.method == 'PUT':
+        data = await request.json() or {}
+        action = data.get('action')
+
+        if not isinstance(action, str) or action not in LINK_ACTIONS:
+            return json_response({'success': False, 'error': '알 수 없는 action입니다.'})
+        value_key, default = LINK_ACTIONS[action][:2]
+        value = data.get(value_key, default)
+        error = link_action_error(action, value)
+        if error:
+            return json_response({'success': False, 'error': error})
+        try:
+            async with db.connection() as conn, conn.transaction():
+                # app.update_link()와 같음 - 없는 링크면 버전을 올리지 않고 되돌린다
+                change_seq = await bump_data_version(conn, board_id)
+                if await apply_link_action(conn, board_id, link_id, action, value, change_seq) == 0:
+                    raise NothingWritten()
+                await notify_change(conn, {'type': 'links', 'board_id': board_id, 'action': 'update', 'version': change_seq,
+                                           'ids': [link_id]})
+        except NothingWritten:
+            return json_response({'success': False, 'error': f'링크 {link_id}를 찾을 수 없습니다.'}, 404)
+
+        return json_response({'success': True})
+
+    try:
+        async with db.connection() as conn, conn.transaction():
+            change_seq = await bump_data_version(conn, board_id)
+            if not await conn.execute('DELETE FROM links WHERE board_id = %s AND id = %s', (board_id, link_id)):
+                raise NothingWritten()
+            await conn.execute('''
+                INSERT INTO link_tombstones (link_id, board_id, change_seq, deleted_at) VALUES (%s, %s, %s, %s)
+                ON CONFLICT (link_id) DO UPDATE SET board_id = EXCLUDED.board_id, change_seq = EXCLUDED.change_seq,
+                                                    deleted_at = EXCLUDED.deleted_at
+            ''', (link_id, board_id, change_seq, change_timestamp()))
+            await notify_change(conn, {'type': 'links', 'board_id': board_id, 'action': 'delete', 'version': change_seq,
+                                       'ids': [link_id]})
+    except NothingWritten:
+        pass
+
+    return json_response({'success': True})
+
+async def customer_info(request):
+    board_id = board_id_of(request)
+
+    async with db.connection() as conn:
+        if request.method == 'POST':
+            data = await request.json()
+            customer_name = data.get('customer_name', DEFAULT_CUSTOMER_NAME)
+            move_in_date = data.get('move_in_date', '')
+
+            async with conn.transaction():
+                updated = await conn.execute('UPDATE customer_info SET customer_name = %s, move_in_date = %s WHERE id = %s',
+                                             (customer_name, move_in_date, board_id))
+                if updated == 0:
+                    raise BoardNotFound(board_id)
+                await notify_change(conn, {'type': 'customer_info', 'board_id': board_id})
+            index_page_cache.invalidate(board_id)
+
+            return json_response({'success': True})
+
+        info = await conn.fetchrow('SELECT customer_name, move_in_date FROM customer_info WHERE id = %s', (board_id,))
+
+    if info is None and board_id != DEFAULT_BOARD_ID:
+        raise BoardNotFound(board_id)
+    return json_response({
+        'customer_name': info[0] if info else DEFAULT_CUSTOMER_NAME,
+        'move_in_date': info[1] if info else ''
+    })
+
+async def read_backup_header(conn, board_id, since=None):
+    # app.read_backup_header와 같음 - since부터 이어지는 조각을 만들 수 없으면 None
+    row = await conn.fetchrow('SELECT version, reset_seq, pruned_seq FROM data_version WHERE id = %s', (board_id,))
+    if row is None:
+        raise BoardNotFound(board_id)
+    version, reset_seq, pruned_seq = row
+    customer = await conn.fetchrow('SELECT id, customer_name, move_in_date FROM customer_info WHERE id = %s', (board_id,))
+    header = {
+        'backup_date': datetime.now().isoformat(),
+        'customer_info': dict(zip(('id', 'customer_name', 'move_in_date'), customer)) if customer else None,
+        'version': version
+    }
+    if since is not None:
+        if since < max(reset_seq, pruned_seq) or since > version:
+            return None
+        header['since'] = since
+    return header
+
+async def backup_data(request):
+    """app.backup_data와 같은 JSON/NDJSON 스트림 (?since= 증분 조각 포함) - 연결은 스트림이 끝날 때까지 잡고 있는다"""
+    board_id = board_id_of(request)
+    backup_format = request.query_params.get('format', 'json')
+    archived = include_archived(request.query_params)
+    since = parse_int(request.query_params.get('since'))
+
+    async with db.connection() as conn:
+        header = await read_backup_header(conn, board_id, since)
+        if header is None:
+            version = await get_data_version(conn, board_id)
+            return json_response({'success': False, 'error': '이 버전부터 이어지는 증분 백업을 만들 수 없습니다. 전체 백업을 받으세요.',
+                                  'version': version}, 409)
+
+    if since is None:
+        queries, params = BACKUP_SNAPSHOT_SQL, (board_id,)
+        tables = ['archived_links', 'links'] if archived else ['links']
+    else:
+        queries, params = BACKUP_SEGMENT_SQL, (board_id, since, header['version'])
+        tables = ['archived_links', 'links']
+
+    async def link_batches(conn):
+        # app.iter_backup과 같음 - 보관한 링크는 archived 표시를 붙여서 먼저 보낸다
+        for table in tables:
+            async for rows in conn.iter_rows(queries[table], params):
+                if table == 'archived_links':
+                    yield [dict(zip(BACKUP_LINK_COLUMNS, link), archived=True) for link in rows]
+                else:
+                    yield [dict(zip(BACKUP_LINK_COLUMNS, link)) for link in rows]
+
+    async def deleted_batches(conn):
+        if since is not None:
+            async for rows in conn.iter_rows(queries['deleted'], params):
+                yield [row[0] for row in rows]
+
+    async def generate():
+        async with db.connection() as conn:
+            if backup_format == 'ndjson':
+                yield dumps(header) + '\n'
+                async for links_batch in link_batches(conn):
+                    yield ''.join(dumps(link) + '\n' for link in links_batch)
+                async for deleted in deleted_batches(conn):
+                    yield dumps({'deleted': deleted}) + '\n'
+            else:
+                yield dumps(header)[:-1] + ', "links": ['
+                separator = ''
+                async for links_batch in link_batches(conn):
+                    yield separator + ', '.join(dumps(link) for link in links_batch)
+                    separator = ', '
+                if since is not None:
+                    yield '], "deleted": ['
+                    separator = ''
+                    async for deleted in deleted_batches(conn):
+                        yield separator + ', '.join(str(link_id) for link_id in deleted)
+                        separator = ', '
+                yield ']}'
+
+    async def compressed(chunks, encoding):
+        # app.compress_stream과 같음 - 백업을 조각마다 압축해서 내보낸다
+        compress, finish = stream_compressor(encoding)
+        async for chunk in chunks:
+            data = compress(chunk.encode('utf-8'))
+            if data:
+                yield data
+        yield finish()
+
+    media_type = 'application/x-ndjson' if backup_format == 'ndjson' else 'application/json'
+    encoding = accepted_encoding(request)
+    if encoding is None:
+        return StreamingResponse(generate(), media_type=media_type, headers={'Vary': 'Accept-Encoding'})
+    return StreamingResponse(compressed(generate(), encoding), media_type=media_type,
+                             headers={'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'})
+
+async def board_not_found(request, exc):
+    return json_response({'success': False, 'error': str(exc)}, 404)
+
+@asynccontextmanager
+async def lifespan(app):
+    await db.start()
+    try:
+        yield
+    finally:
+        await db.stop()
+
+class AsyncSubscriber:
+    """app.ChangeHub 구독 큐 대신 쓰는 asyncio 큐 - 허브의 수신 스레드가 넣고 이벤트 루프에서 꺼낸다"""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=100)
+
+    def put_nowait(self, event):
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # app.ChangeHub.publish와 같음 - 밀린 클라이언트는 다음 이벤트 때 변경분을 한꺼번에 가져간다
+            pass
+
+async def events(request):
+    """app.events와 같은 Server-Sent Events - 기다리는 동안 스레드도 DB 연결도 잡지 않는다"""
+    board_id = board_id_of(request)
+    change_hub.ensure_started()
+    subscriber = change_hub.subscribe(board_id, AsyncSubscriber(asyncio.get_running_loop()), SSE_ASYNC_MAX_CLIENTS)
+    if subscriber is None:
+        response = json_response({'success': False, 'error': '실시간 연결이 너무 많습니다.'}, 503)
+        response.headers['Retry-After'] = str(SSE_RETRY_AFTER)
+        return response
+
+    async def generate():
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ': ping\n\n'
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            change_hub.unsubscribe(board_id, subscriber)
+
+    return StreamingResponse(generate(), media_type='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+def remember_write_version(endpoint):
+    """app.remember_write_version과 같음 - 성공한 쓰기 응답에 그 보드의 새 버전 쿠키를 남긴다
+
+    복제본에서 읽는 Flask 쪽 라우트(변경분, 통계 등)가 이 클라이언트의 쓰기보다 뒤처진 복제본을 고르지 않게 한다.
+    """
+    @functools.wraps(endpoint)
+    async def wrapper(request):
+        response = await endpoint(request)
+        if (not flask_app_module.DATABASE_REPLICA_URLS or request.method not in ('POST', 'PUT', 'PATCH', 'DELETE')
+                or response.status_code >= 400):
+            return response
+        board_id = board_id_of(request)
+        try:
+            async with db.connection() as conn:
+                version = await get_data_version(conn, board_id)
+        except BoardNotFound:
+            return response
+        value = write_versions_cookie(parse_write_versions(request.cookies.get(REPLICA_WRITE_COOKIE, '')), board_id, version)
+        response.set_cookie(REPLICA_WRITE_COOKIE, value, max_age=REPLICA_WRITE_COOKIE_MAX_AGE, httponly=True, samesite='lax')
+        return response
+    return wrapper
+
+def board_routes(path, endpoint, methods):
+    # 예전 주소(기본 보드)와 /api/boards/<id>/... 주소를 함께 등록
+    return [
+        Route(f'/api{path}', endpoint, methods=methods),
+        Route(f'/api/boards/{{board_id:int}}{path}', endpoint, methods=methods),
+    ]
+
+app = Starlette(
+    routes=[
+        *board_routes('/links', remember_write_version(links), ['GET', 'POST']),
+        *board_routes('/links/{link_id:int}', remember_write_version(update_link), ['PUT', 'DELETE']),
+        *board_routes('/customer_info', remember_write_version(customer_info), ['GET', 'POST']),
+        *board_routes('/backup', backup_data, ['GET']),
+        *board_routes('/events', events, ['GET']),
+        # 그 밖의 라우트는 Flask 앱으로 (스레드 풀에서 실행)
+        Mount('/', app=WSGIMiddleware(flask_app_module.app)),
+    ],
+    exception_handlers={BoardNotFound: board_not_found},
+    lifespan=lifespan,
+)
@@ -0,0 +1,57 @@
+"""전체/증분 백업 받기
+
+snapshot은 SQLite DB 파일 전체를 온라인 백업 API로 복사한다 (쓰기를 막지 않는다). PostgreSQL은 pg_dump를 쓴다.
+segment는 보드의 --since 버전 뒤에 바뀐 링크와 지운 링크 id만 NDJSON 조각으로 쓴다 (/api/backup?since=와 같다).
+스냅숏이 알려 준 버전(또는 앞 조각의 version)부터 조각을 이어 받고, 복원은 전체 백업부터 조각 순서대로
+/api/restore?mode=merge로 병합한다.
+
+    python backup.py snapshot backups/base.db
+    python backup.py segment --board 1 --since 42 backups/board1-42.ndjson
+"""
+import argparse
+import json
+import sys
+
+import app as app_module
+
+def snapshot(path):
+    with app_module.app.app_context():
+        app_module.init_db()
+        _, db_type = app_module.get_db_connection()
+    if db_type == 'postgresql':
+        sys.exit('PostgreSQL은 pg_dump로 스냅숏을 받으세요.')
+    return app_module.snapshot_sqlite(path)
+
+def segment(path, board_id, since, archived=False):
+    """조각을 path에 쓰고 헤더를 돌려준다 (since부터 이어 붙일 수 없으면 None)"""
+    with app_module.app.app_context():
+        conn, db_type = app_module.get_db_connection()
+        header = app_module.read_backup_header(conn, db_type, board_id, since)
+        if header is None:
+            return None
+        with open(path, 'w', encoding='utf-8') as output:
+            for chunk in app_module.iter_backup(conn, db_type, board_id, header, 'ndjson', archived):
+                output.write(chunk)
+        conn.rollback()
+    return header
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='전체/증분 백업 받기')
+    commands = parser.add_subparsers(dest='command', required=True)
+    snapshot_parser = commands.add_parser('snapshot', help='SQLite DB 파일 전체 복사')
+    snapshot_parser.add_argument('path')
+    segment_parser = commands.add_parser('segment', help='보드의 증분 조각 (NDJSON)')
+    segment_parser.add_argument('path')
+    segment_parser.add_argument('--board', type=int, default=app_module.DEFAULT_BOARD_ID)
+    segment_parser.add_argument('--since', type=int, default=None, help='이 버전 뒤의 변경만 (없으면 전체)')
+    segment_parser.add_argument('--include-archived', action='store_true', help='전체 백업에 보관한 링크도 넣는다')
+    args = parser.parse_args()
+
+    if args.command == 'snapshot':
+        versions = snapshot(args.path)
+        print(json.dumps({'path': args.path, 'versions': versions}, ensure_ascii=False))
+    else:
+        header = segment(args.path, args.board, args.since, args.include_archived)
+        if header is None:
+            sys.exit(f'보드 {args.board}: 버전 {args.since}부터 이어지는 조각을 만들 수 없습니다. 전체 백업부터 다시 받으세요.')
+        print(json.dumps({'path': args.path, 'since': header.get('since'), 'version': header['version']}))
@@ -0,0 +1,218 @@
+"""링크 목록 조회 벤치마크
+
+임시 SQLite 파일에 init_db()와 같은 스키마로 가짜 링크를 채운 뒤,
+필터 조합마다 보드 1의 GET /api/links 페이지 조회 시간을 목록 인덱스(마이그레이션 1, 5) 전후로 잰다.
+응답 캐시는 매 요청 전에 비워서 실제 조회 비용을 잰다.
+그다음 가장 큰 페이지(MAX_PAGE_SIZE개) 하나를 형식(행/columnar), JSON 인코더(표준 json/orjson),
+압축(identity/gzip/br)마다 인코딩한 크기와 시간을 잰다.
+
+    python benchmark.py --sizes 10000,100000,1000000 --repeat 20 --json result.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+import app as app_module
+
+PLATFORMS = ['zigbang', 'naver', 'other']
+USERS = ['중개사', '손님']
+MEMO_WORDS = ['역세권', '남향', '원룸', '투룸', '풀옵션', '주차가능', '신축', '반려동물', '엘리베이터', '강남역', '관리비', '채광']
+
+# links()가 만드는 필터 조합
+FILTER_CASES = [
+    ('전체', {}),
+    ('platform', {'platform': 'naver'}),
+    ('user', {'user': '손님'}),
+    ('platform+user', {'platform': 'zigbang', 'user': '중개사'}),
+    ('liked', {'like': 'liked'}),
+    ('disliked', {'like': 'disliked'}),
+    ('date', {'date': '2025-03-01'}),
+    ('platform+liked', {'platform': 'naver', 'like': 'liked'}),
+    ('search', {'q': '남향 풀옵션'}),
+    ('columnar', {'format': 'columnar'}),
+    ('columnar, 메모 제외', {'format': 'columnar', 'fields': 'number,url,platform,added_by,date_added,rating,liked,disliked'}),
+]
+
+def insert_batch(cursor, batch):
+    cursor.executemany('''
+        INSERT INTO links (board_id, url, platform, added_by, date_added, rating, liked, disliked, memo, url_tokens, memo_tokens)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', batch)
+
+def seed_boards(conn, boards):
+    cursor = conn.cursor()
+    for board_id in range(2, boards + 1):
+        cursor.execute('INSERT OR IGNORE INTO customer_info (id, customer_name) VALUES (?, ?)', (board_id, f'고객{board_id}'))
+        cursor.execute('INSERT OR IGNORE INTO data_version (id, version) VALUES (?, 1)', (board_id,))
+    conn.commit()
+
+def seed_links(conn, count, boards=1, seed=42):
+    # 링크를 보드마다 돌아가며 넣는다 (보드 1 = 측정 대상, count // boards개)
+    rnd = random.Random(seed)
+    start = date(2024, 1, 1)
+    cursor = conn.cursor()
+    batch = []
+    for i in range(count):
+        liked = rnd.random() < 0.1
+        disliked = not liked and rnd.random() < 0.2
+        url = f'https://new.land.naver.com/rooms?articleNo={i}'
+        memo = ' '.join(rnd.sample(MEMO_WORDS, 3)) if rnd.random() < 0.3 else ''
+        batch.append((
+            i % boards + 1,
+            url,
+            rnd.choice(PLATFORMS),
+            rnd.choice(USERS),
+            (start + timedelta(days=rnd.randrange(730))).isoformat(),
+            rnd.randint(1, 10),
+            liked,
+            disliked,
+            memo,
+            app_module.search_tokens(url),
+            app_module.search_tokens(memo)
+        ))
+        if len(batch) >= 10000:
+            insert_batch(cursor, batch)
+            batch = []
+    if batch:
+        insert_batch(cursor, batch)
+    conn.commit()
+
+def list_index_statements():
+    # 목록 인덱스는 보드 마이그레이션(5)에서 board_id로 시작하는 모양으로 다시 만든다
+    return [statement for version, _, statements in app_module.MIGRATIONS if version == 5
+            for statement in statements['sqlite']
+            if isinstance(statement, str) and (statement.startswith('CREATE INDEX IF NOT EXISTS idx_links_') or statement == 'ANALYZE')]
+
+def drop_list_indexes(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_links_%'")
+    for (name,) in cursor.fetchall():
+        cursor.execute(f'DROP INDEX {name}')
+    conn.commit()
+
+def time_request(client, params, repeat):
+    samples = []
+    for _ in range(repeat):
+        app_module.links_cache.clear()
+        start = time.perf_counter()
+        response = client.get('/api/links', query_string=params)
+        response.get_data()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'p50_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+    }
+
+def run_phase(client, size, repeat):
+    results = {}
+    for name, filters in FILTER_CASES:
+        first_page = dict(filters, limit=50)
+        deep_page = dict(filters, limit=50, after_id=size // 2)
+        results[name] = {
+            'first_page': time_request(client, first_page, repeat),
+            'deep_page': time_request(client, deep_page, repeat),
+        }
+    return results
+
+def stdlib_dumps(result):
+    # orjson이 없을 때 app.json이 쓰는 표준 json과 같은 설정
+    return json.dumps(result, default=app_module.app.json.default, ensure_ascii=True, sort_keys=True)
+
+def time_call(func, arg, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        value = func(arg)
+    return value, round((time.perf_counter() - start) * 1000 / repeat, 3)
+
+def run_encoding(repeat):
+    with app_module.app.test_request_context():
+        conn, db_type = app_module.get_db_connection()
+        cursor = conn.cursor()
+        pages = {shape: app_module.fetch_links(cursor, db_type, 1, {'format': shape}, True, None, app_module.MAX_PAGE_SIZE)
+                 for shape in ('rows', 'columnar')}
+    encoders = [('json', stdlib_dumps)]
+    if app_module.orjson is not None:
+        encoders.append(('orjson', app_module.app.json.encode))
+    results = {}
+    for shape, result in pages.items():
+        entry = {}
+        for name, encode in encoders:
+            payload, entry[f'{name}_ms'] = time_call(encode, result, repeat)
+            entry[f'{name}_bytes'] = len(payload.encode('utf-8'))
+        payload = payload.encode('utf-8')
+        for encoding in app_module.CONTENT_ENCODINGS:
+            compressed, entry[f'{encoding}_ms'] = time_call(lambda data: app_module.compress_body(data, encoding), payload, repeat)
+            entry[f'{encoding}_bytes'] = len(compressed)
+        results[shape] = entry
+    return results
+
+def run(sizes, repeat, boards=1):
+    report = []
+    workdir = tempfile.mkdtemp(prefix='links-bench-')
+    for size in sizes:
+        app_module.SQLITE_PATH = os.path.join(workdir, f'links_{size}.db')
+        app_module._sqlite_local.conn = None
+        os.environ.pop('DATABASE_URL', None)
+
+        with app_module.app.app_context():
+            app_module.init_db()
+            conn, _ = app_module.get_db_connection()
+            drop_list_indexes(conn)
+            seed_boards(conn, boards)
+            seed_links(conn, size, boards)
+
+        client = app_module.app.test_client()
+        before = run_phase(client, size, repeat)
+
+        with app_module.app.app_context():
+            conn, _ = app_module.get_db_connection()
+            start = time.perf_counter()
+            for statement in list_index_statements():
+                conn.execute(statement)
+            conn.commit()
+            migrate_seconds = time.perf_counter() - start
+
+        after = run_phase(client, size, repeat)
+        report.append({
+            'rows': size,
+            'boards': boards,
+            'migrate_seconds': round(migrate_seconds, 3),
+            'before': before,
+            'after': after,
+            'encoding': run_encoding(repeat),
+        })
+        print_size_report(report[-1])
+    return report
+
+def print_size_report(entry):
+    print(f"\n== {entry['rows']:,} rows / 보드 {entry['boards']}개 (마이그레이션 {entry['migrate_seconds']}s) ==")
+    print(f"{'필터':<16}{'첫 페이지 전':>12}{'후':>10}{'중간 페이지 전':>14}{'후':>10}  (p50 ms)")
+    for name, _ in FILTER_CASES:
+        before = entry['before'][name]
+        after = entry['after'][name]
+        print(f"{name:<16}{before['first_page']['p50_ms']:>12}{after['first_page']['p50_ms']:>10}"
+              f"{before['deep_page']['p50_ms']:>14}{after['deep_page']['p50_ms']:>10}")
+    print(f"\n응답 인코딩 ({app_module.MAX_PAGE_SIZE}개 페이지, 바이트 / ms)")
+    for shape, result in entry['encoding'].items():
+        sizes = '  '.join(f"{name} {result[f'{name}_bytes']:,}B {result[f'{name}_ms']}ms"
+                          for name in ['json', 'orjson', *app_module.CONTENT_ENCODINGS] if f'{name}_bytes' in result)
+        print(f"{shape:<10}{sizes}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='링크 목록 조회 벤치마크')
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--boards', type=int, default=1, help='링크를 나눠 넣을 보드 수 (보드 1만 조회)')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    args = parser.parse_args()
+
+    report = run([int(s) for s in args.sizes.split(',')], args.repeat, args.boards)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
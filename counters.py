@@ -0,0 +1,34 @@
+"""보드 요약 카운터(link_counters) 점검/재계산
+
+카운터는 트리거가 쓰기와 같은 트랜잭션에서 맞춰 두지만, 트리거 없이 DB를 직접 고쳤거나
+마이그레이션 전 데이터를 옮겨 왔다면 어긋날 수 있다. 링크 테이블에서 다시 세서 어긋난 (차원, 값) 수를 보여주고 바로잡는다.
+DATABASE_URL이 있으면 PostgreSQL, 없으면 property_links.db를 점검한다.
+
+    python counters.py --check
+    python counters.py --board 3
+"""
+import argparse
+
+import app as app_module
+
+def run(board_id=None, check=False):
+    with app_module.app.app_context():
+        app_module.init_db()
+        conn, db_type = app_module.get_db_connection()
+        cursor = conn.cursor()
+        drift = app_module.rebuild_link_counters(cursor, db_type, board_id, dry_run=check)
+        if check:
+            conn.rollback()
+        else:
+            conn.commit()
+    return drift
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='보드 요약 카운터 점검/재계산')
+    parser.add_argument('--board', type=int, help='이 보드만 (없으면 모든 보드)')
+    parser.add_argument('--check', action='store_true', help='어긋난 카운터 수만 보여주고 바꾸지 않는다')
+    args = parser.parse_args()
+    drift = run(args.board, args.check)
+    for board_id, count in sorted(drift.items()):
+        print(f"보드 {board_id}: 카운터 {count}개 어긋남 {'' if args.check else '(다시 계산함)'}".rstrip())
+    print(f"합계 {sum(drift.values())}개" if drift else '카운터가 모두 맞습니다.')
@@ -0,0 +1,34 @@
+"""중복 링크 일괄 정리
+
+url 정규화(url_key) 전에 쌓인 중복 매물을 보드마다 가장 먼저 추가된 링크 하나로 합친다.
+평점은 가장 높은 값, 좋아요는 하나라도 있으면 좋아요, 메모는 모두 이어 붙이고 나머지 링크는 지운다.
+DATABASE_URL이 있으면 PostgreSQL, 없으면 property_links.db를 정리한다.
+
+    python dedupe.py --dry-run
+    python dedupe.py --board 3
+"""
+import argparse
+
+import app as app_module
+
+def run(board_id=None, dry_run=False):
+    with app_module.app.app_context():
+        app_module.init_db()
+        conn, db_type = app_module.get_db_connection()
+        cursor = conn.cursor()
+        removed = app_module.dedupe_links(cursor, db_type, board_id, dry_run)
+        if dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+    return removed
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='중복 링크 일괄 정리')
+    parser.add_argument('--board', type=int, help='이 보드만 정리 (없으면 모든 보드)')
+    parser.add_argument('--dry-run', action='store_true', help='지울 링크 수만 보여주고 바꾸지 않는다')
+    args = parser.parse_args()
+    removed = run(args.board, args.dry_run)
+    for board_id, count in sorted(removed.items()):
+        print(f"보드 {board_id}: 중복 {count}개 {'(지울 예정)' if args.dry_run else '정리'}")
+    print(f"합계 {sum(removed.values())}개" if removed else '중복 링크가 없습니다.')
@@ -0,0 +1,428 @@
+"""라우트별 부하 테스트
+
+임시 SQLite 파일(또는 --database-url의 PostgreSQL)에 init_db()와 같은 스키마로 가짜 보드를 만든 뒤,
+라우트마다 요청을 보내서 지연 시간(p50/p95/p99), 처리량, 최대 RSS를 잰다.
+결과 JSON을 --compare로 넘기면 이전 실행과 비교한다.
+
+    python loadtest.py --boards 20 --links 5000 --requests 200 --json result.json
+    python loadtest.py --mode gunicorn --workers 2 --threads 16 --concurrency 16 --compare result.json
+    python loadtest.py --mode uvicorn --workers 2 --concurrency 64 --compare result.json
+
+--mode client는 Flask 테스트 클라이언트로 이 프로세스 안에서, gunicorn은 실제 gunicorn 워커를 띄워 HTTP로 보낸다.
+uvicorn은 비동기 모드(asgi_app.py)를 uvicorn 워커로 띄운다.
+/api/events(SSE)는 연결을 계속 잡고 있는 스트림이라 재지 않는다.
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from urllib.parse import urlencode
+
+from benchmark import FILTER_CASES, MEMO_WORDS, PLATFORMS, USERS
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 백업/복원처럼 보드 전체를 읽고 쓰는 라우트는 요청 수를 따로 정한다
+HEAVY_SCENARIOS = ('backup', 'backup_ndjson', 'restore_ndjson')
+
+def synthetic_links(count, rnd):
+    start = date(2024, 1, 1)
+    for _ in range(count):
+        liked = rnd.random() < 0.1
+        yield {
+            'url': f'https://new.land.naver.com/rooms?articleNo={rnd.randrange(10 ** 9)}',
+            'platform': rnd.choice(PLATFORMS),
+            'added_by': rnd.choice(USERS),
+            'date_added': (start + timedelta(days=rnd.randrange(730))).isoformat(),
+            'rating': rnd.randint(1, 10),
+            'liked': liked,
+            'disliked': not liked and rnd.random() < 0.2,
+            'memo': ' '.join(rnd.sample(MEMO_WORDS, 3)) if rnd.random() < 0.3 else '',
+        }
+
+def ndjson_backup(customer_name, links):
+    lines = [json.dumps({'backup_date': datetime.now().isoformat(), 'customer_info': {'customer_name': customer_name}})]
+    lines.extend(json.dumps(link) for link in links)
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+def percentile(samples, p):
+    # samples는 정렬되어 있어야 한다 (nearest-rank)
+    return samples[min(len(samples) - 1, max(0, math.ceil(len(samples) * p / 100) - 1))]
+
+def read_rss_kb(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+def child_pids(pid):
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+class RssSampler:
+    """측정하는 동안 프로세스(와 서버 워커들)의 RSS 합을 주기적으로 읽어 최댓값을 남긴다"""
+
+    def __init__(self, root_pid, include_children, interval=0.05):
+        self.root_pid = root_pid
+        self.include_children = include_children
+        self.interval = interval
+        self.peak_kb = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        pids = [self.root_pid] + (child_pids(self.root_pid) if self.include_children else [])
+        self.peak_kb = max(self.peak_kb, sum(read_rss_kb(pid) for pid in pids))
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak_kb = 0
+        self._stop.clear()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+class ClientTarget:
+    """Flask 테스트 클라이언트로 요청 (스레드마다 클라이언트 하나)"""
+
+    def __init__(self, app_module):
+        self.app = app_module.app
+        self.pid = os.getpid()
+        self.include_children = False
+        self._local = threading.local()
+
+    def request(self, method, path, body=None, content_type=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, data=body, content_type=content_type)
+        data = response.get_data()
+        return response.status_code, data
+
+    def close(self):
+        pass
+
+class ServerTarget:
+    """실제 서버(gunicorn 또는 uvicorn) 워커를 띄우고 HTTP keep-alive 연결로 요청 (스레드마다 연결 하나)"""
+
+    def __init__(self, server, workdir, workers, threads, env):
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            self.port = s.getsockname()[1]
+        if server == 'uvicorn':
+            command = [
+                sys.executable, '-m', 'uvicorn', 'asgi_app:app',
+                '--host', '127.0.0.1',
+                '--port', str(self.port),
+                '--workers', str(workers),
+                '--app-dir', REPO_DIR,
+                '--log-level', 'warning',
+            ]
+        else:
+            command = [
+                sys.executable, '-m', 'gunicorn', 'app:app',
+                '--bind', f'127.0.0.1:{self.port}',
+                '--worker-class', 'gthread',
+                '--workers', str(workers),
+                '--threads', str(threads),
+                '--pythonpath', REPO_DIR,
+                '--log-level', 'warning',
+            ]
+        self.server = server
+        self.process = subprocess.Popen(command, cwd=workdir, env=env)
+        self.pid = self.process.pid
+        self.include_children = True
+        self._local = threading.local()
+        self._wait_ready()
+
+    def _wait_ready(self, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'{self.server}이 시작되지 않았습니다.')
+            try:
+                if self.request('GET', '/api/db/pool')[0] == 200:
+                    return
+            except OSError:
+                self._local.conn = None
+            time.sleep(0.2)
+        raise RuntimeError(f'{self.server} 응답을 기다리다 시간이 초과되었습니다.')
+
+    def request(self, method, path, body=None, content_type=None):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+        headers = {'Content-Type': content_type} if content_type else {}
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            self._local.conn = None
+            raise
+
+    def close(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+def seed_boards(target, boards, links_per_board, seed):
+    """보드를 만들고 링크를 NDJSON 복원 API로 채운다 (보드 id, 보드별 링크 id 일부)"""
+    rnd = random.Random(seed)
+    board_ids = []
+    link_ids = {}
+    for index in range(boards):
+        status, data = target.request('POST', '/api/boards', json.dumps({'customer_name': f'고객{index + 1}'}),
+                                      'application/json')
+        board_id = json.loads(data)['id']
+        body = ndjson_backup(f'고객{index + 1}', synthetic_links(links_per_board, rnd))
+        status, data = target.request('POST', f'/api/boards/{board_id}/restore', body, 'application/x-ndjson')
+        if status != 200 or not json.loads(data).get('success'):
+            raise RuntimeError(f'보드 {board_id} 채우기 실패: {data[:200]!r}')
+
+        status, data = target.request('GET', f'/api/boards/{board_id}/links?limit=200')
+        link_ids[board_id] = [link['id'] for link in json.loads(data)['links']]
+        board_ids.append(board_id)
+    return board_ids, link_ids
+
+def build_scenarios(board_ids, link_ids, scratch_boards, restore_body):
+    """(이름, 요청 만드는 함수) 목록 - 함수는 (rnd, 스레드 번호)를 받아 (method, path, body, content_type)을 돌려준다"""
+    def board(rnd):
+        return rnd.choice(board_ids)
+
+    def link(rnd):
+        board_id = board(rnd)
+        return board_id, rnd.choice(link_ids[board_id] or [0])
+
+    def put(action, value_key, value):
+        def make(rnd, worker):
+            board_id, link_id = link(rnd)
+            body = json.dumps({'action': action, value_key: value(rnd)})
+            return 'PUT', f'/api/boards/{board_id}/links/{link_id}', body, 'application/json'
+        return make
+
+    def batch(rnd, worker):
+        board_id = board(rnd)
+        operations = [{'id': rnd.choice(link_ids[board_id] or [0]), 'action': 'rating', 'value': rnd.randint(1, 10)}
+                      for _ in range(10)]
+        return 'PATCH', f'/api/boards/{board_id}/links/batch', json.dumps(operations), 'application/json'
+
+    scenarios = [('index', lambda rnd, worker: ('GET', f'/boards/{board(rnd)}', None, None))]
+    for name, filters in FILTER_CASES:
+        query = urlencode(dict(filters, limit=50))
+        scenarios.append((f'links:{name}', lambda rnd, worker, query=query:
+                          ('GET', f'/api/boards/{board(rnd)}/links?{query}', None, None)))
+    scenarios += [
+        ('update:rating', put('rating', 'rating', lambda rnd: rnd.randint(1, 10))),
+        ('update:like', put('like', 'liked', lambda rnd: rnd.random() < 0.5)),
+        ('update:dislike', put('dislike', 'disliked', lambda rnd: rnd.random() < 0.5)),
+        ('update:memo', put('memo', 'memo', lambda rnd: ' '.join(rnd.sample(MEMO_WORDS, 2)))),
+        ('update:batch', batch),
+        ('backup', lambda rnd, worker: ('GET', f'/api/boards/{board(rnd)}/backup', None, None)),
+        ('backup_ndjson', lambda rnd, worker: ('GET', f'/api/boards/{board(rnd)}/backup?format=ndjson', None, None)),
+        # 복원은 스레드마다 따로 만든 보드에 해서 다른 시나리오의 데이터를 건드리지 않는다
+        ('restore_ndjson', lambda rnd, worker:
+            ('POST', f'/api/boards/{scratch_boards[worker]}/restore', restore_body, 'application/x-ndjson')),
+    ]
+    return scenarios
+
+def is_success(status, data):
+    # 이 앱은 실패도 200 + {"success": false}로 돌려주는 라우트가 많다
+    if status >= 300:
+        return False
+    if data[:1] == b'{' and len(data) < 4096:
+        try:
+            return json.loads(data).get('success', True) is not False
+        except ValueError:
+            return True
+    return True
+
+def run_scenario(target, make_request, requests, concurrency, seed):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    per_worker = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+
+    def worker(index):
+        rnd = random.Random(seed * 1000 + index)
+        samples = []
+        failed = 0
+        for _ in range(per_worker[index]):
+            method, path, body, content_type = make_request(rnd, index)
+            start = time.perf_counter()
+            try:
+                status, data = target.request(method, path, body, content_type)
+                if not is_success(status, data):
+                    failed += 1
+            except Exception:
+                failed += 1
+            samples.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(samples)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency) if per_worker[i]]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'max_ms': round(latencies[-1], 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix='links-load-')
+    env = dict(os.environ)
+    if args.database_url:
+        env['DATABASE_URL'] = args.database_url
+    else:
+        env.pop('DATABASE_URL', None)
+    if args.no_cache:
+        env['LINKS_CACHE_SIZE'] = '0'
+    os.environ.clear()
+    os.environ.update(env)
+
+    # SQLite 파일은 작업 디렉터리에 만든다 (서버도 같은 디렉터리에서 띄움)
+    os.chdir(workdir)
+    import app as app_module
+    if args.no_cache:
+        app_module.links_cache.max_entries = 0
+    app_module.init_db()
+
+    client = ClientTarget(app_module)
+    start = time.perf_counter()
+    board_ids, link_ids = seed_boards(client, args.boards, args.links, args.seed)
+    scratch_boards = [json.loads(client.request('POST', '/api/boards', json.dumps({'customer_name': '복원용'}),
+                                                'application/json')[1])['id'] for _ in range(args.concurrency)]
+    seed_seconds = time.perf_counter() - start
+    restore_body = ndjson_backup('복원용', synthetic_links(args.links, random.Random(args.seed)))
+
+    target = client
+    if args.mode in ('gunicorn', 'uvicorn'):
+        target = ServerTarget(args.mode, workdir, args.workers, args.threads, env)
+
+    report = {
+        'mode': args.mode,
+        'backend': 'postgresql' if args.database_url else 'sqlite',
+        'boards': args.boards,
+        'links_per_board': args.links,
+        'requests': args.requests,
+        'heavy_requests': args.heavy_requests,
+        'concurrency': args.concurrency,
+        'workers': args.workers if args.mode != 'client' else None,
+        'threads': args.threads if args.mode == 'gunicorn' else None,
+        'response_cache': not args.no_cache,
+        'seed_seconds': round(seed_seconds, 3),
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'scenarios': {},
+    }
+
+    try:
+        scenarios = build_scenarios(board_ids, link_ids, scratch_boards, restore_body)
+        for index, (name, make_request) in enumerate(scenarios):
+            if args.only and not any(name.startswith(prefix) for prefix in args.only.split(',')):
+                continue
+            requests = args.heavy_requests if name in HEAVY_SCENARIOS else args.requests
+            with RssSampler(target.pid, target.include_children) as rss:
+                result = run_scenario(target, make_request, requests, args.concurrency, args.seed + index)
+            result['peak_rss_mb'] = round(rss.peak_kb / 1024, 1)
+            report['scenarios'][name] = result
+            print_result(name, result)
+    finally:
+        target.close()
+
+    report['peak_rss_mb'] = max((result['peak_rss_mb'] for result in report['scenarios'].values()), default=0)
+    return report
+
+def print_result(name, result):
+    print(f"{name:<22}{result['requests']:>6}{result['errors']:>5}{result['p50_ms']:>10}{result['p95_ms']:>10}"
+          f"{result['p99_ms']:>10}{result['throughput_rps']:>10}{result['peak_rss_mb']:>9}")
+
+def print_header():
+    print(f"{'시나리오':<18}{'요청':>8}{'에러':>4}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'RSS MB':>9}")
+
+def print_comparison(report, baseline):
+    """이전 결과 대비 p95 지연 시간과 처리량의 증감률"""
+    print(f"\n{'시나리오':<18}{'p95 전':>10}{'후':>10}{'변화':>9}{'req/s 전':>11}{'후':>10}{'변화':>9}")
+    for name, result in report['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if not before:
+            continue
+        p95_change = (result['p95_ms'] / before['p95_ms'] - 1) * 100 if before['p95_ms'] else 0
+        rps_change = (result['throughput_rps'] / before['throughput_rps'] - 1) * 100 if before['throughput_rps'] else 0
+        print(f"{name:<22}{before['p95_ms']:>10}{result['p95_ms']:>10}{p95_change:>+8.1f}%"
+              f"{before['throughput_rps']:>11}{result['throughput_rps']:>10}{rps_change:>+8.1f}%")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='라우트별 부하 테스트')
+    parser.add_argument('--mode', choices=['client', 'gunicorn', 'uvicorn'], default='client')
+    parser.add_argument('--database-url', help='PostgreSQL로 잴 때 (비어 있는 테스트용 DB를 쓸 것)')
+    parser.add_argument('--boards', type=int, default=10)
+    parser.add_argument('--links', type=int, default=2000, help='보드 하나의 링크 수')
+    parser.add_argument('--requests', type=int, default=200, help='시나리오 하나의 요청 수')
+    parser.add_argument('--heavy-requests', type=int, default=10, help='백업/복원 시나리오의 요청 수')
+    parser.add_argument('--concurrency', type=int, default=4, help='동시에 요청을 보내는 스레드 수')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn/uvicorn 워커 수')
+    parser.add_argument('--threads', type=int, default=16, help='gunicorn 워커당 스레드 수')
+    parser.add_argument('--no-cache', action='store_true', help='목록 응답 캐시를 끄고 잰다')
+    parser.add_argument('--only', help='이 이름으로 시작하는 시나리오만 (쉼표로 구분, 예: links,update)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 파일 경로')
+    args = parser.parse_args()
+
+    for option in ('json', 'compare'):
+        if getattr(args, option):
+            setattr(args, option, os.path.abspath(getattr(args, option)))
+
+    print_header()
+    report = run(args)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(report, json.load(f))
@@ -0,0 +1,587 @@
+let currentPlatform = 'zigbang';
+let currentUser = '중개사';
+let currentFilters = {
+    platform: 'all',
+    user: 'all',
+    like: 'all'
+};
+const PAGE_SIZE = 50;
+const MAX_PAGE_SIZE = 200;
+let nextCursor = null;
+let nextNumber = null;
+let loadedCount = 0;
+let knownVersion = 0;
+// 목록은 메모 없이 받는다 - 메모는 열 때 /links/<id>/memo로 가져온다
+const LIST_FIELDS = ['id', 'number', 'url', 'platform', 'added_by', 'date_added', 'rating', 'liked', 'disliked'];
+
+// 페이지 로드 시 초기화
+document.addEventListener('DOMContentLoaded', function() {
+    loadCustomerInfo();
+    loadLinks();
+    initializeEventListeners();
+    subscribeChanges();
+});
+
+// 다른 사람(중개사/손님)이 바꾼 내용을 실시간으로 반영
+function subscribeChanges() {
+    if (!window.EventSource) return;
+    
+    const source = new EventSource(`${API_BASE}/events`);
+    let reloadTimer = null;
+    const scheduleReload = (event) => {
+        // 알림의 버전까지 따라오지 못한 복제본에서 읽지 않도록 함께 보낸다
+        const version = JSON.parse(event.data).version;
+        if (version > knownVersion) knownVersion = version;
+        clearTimeout(reloadTimer);
+        reloadTimer = setTimeout(loadLinks, 300);
+    };
+    source.addEventListener('links', scheduleReload);
+    source.addEventListener('reset', scheduleReload);
+    source.addEventListener('customer_info', loadCustomerInfo);
+    // 서버의 실시간 연결이 가득 차서(503) 닫히면 보드 버전만 주기적으로 확인한다
+    source.addEventListener('error', () => {
+        if (source.readyState === EventSource.CLOSED) setInterval(pollChanges, 30000);
+    });
+}
+
+function pollChanges() {
+    fetch(`${API_BASE}/links/stats`)
+        .then(response => response.json())
+        .then(stats => {
+            if (knownVersion && stats.version > knownVersion) loadLinks();
+            knownVersion = Math.max(knownVersion, stats.version);
+        });
+}
+
+function initializeEventListeners() {
+    // 플랫폼 버튼 이벤트
+    document.querySelectorAll('[data-platform]').forEach(btn => {
+        btn.addEventListener('click', function() {
+            document.querySelectorAll('[data-platform]').forEach(b => b.classList.remove('active'));
+            this.classList.add('active');
+            currentPlatform = this.dataset.platform;
+        });
+    });
+
+    // 사용자 버튼 이벤트
+    document.querySelectorAll('[data-user]').forEach(btn => {
+        btn.addEventListener('click', function() {
+            document.querySelectorAll('[data-user]').forEach(b => b.classList.remove('active'));
+            this.classList.add('active');
+            currentUser = this.dataset.user;
+        });
+    });
+
+    // 필터 버튼 이벤트
+    document.querySelectorAll('.filter-btn').forEach(btn => {
+        btn.addEventListener('click', function() {
+            const type = this.dataset.type;
+            const value = this.dataset.value;
+            
+            document.querySelectorAll(`[data-type="${type}"]`).forEach(b => b.classList.remove('active'));
+            this.classList.add('active');
+            
+            currentFilters[type] = value;
+        });
+    });
+
+    // 검색어 입력 후 엔터
+    document.getElementById('searchQuery').addEventListener('keydown', function(e) {
+        if (e.key === 'Enter') {
+            searchLinks();
+        }
+    });
+
+    // 고객명 변경
+    document.getElementById('customerName').addEventListener('click', function() {
+        const newName = prompt('고객명을 입력하세요:', this.textContent);
+        if (newName && newName.trim()) {
+            updateCustomerInfo(newName.trim(), null);
+        }
+    });
+
+    // 입주일 변경
+    document.getElementById('moveInDate').addEventListener('click', function() {
+        const input = document.createElement('input');
+        input.type = 'date';
+        input.style.position = 'fixed';
+        input.style.top = '50%';
+        input.style.left = '50%';
+        input.style.transform = 'translate(-50%, -50%)';
+        input.style.zIndex = '9999';
+        input.style.fontSize = '16px';
+        input.style.padding = '10px';
+        input.style.border = '2px solid #0066ff';
+        input.style.borderRadius = '8px';
+        input.style.backgroundColor = 'white';
+        
+        // 현재 날짜가 있으면 설정
+        const currentDate = this.textContent;
+        if (currentDate && currentDate !== '날짜 선택') {
+            input.value = currentDate;
+        }
+        
+        document.body.appendChild(input);
+        
+        // 포커스를 주어 날짜 선택기 열기
+        setTimeout(() => {
+            input.focus();
+            input.showPicker && input.showPicker();
+        }, 100);
+        
+        input.addEventListener('change', function() {
+            if (this.value) {
+                updateCustomerInfo(null, this.value);
+            }
+            document.body.removeChild(this);
+        });
+        
+        input.addEventListener('blur', function() {
+            setTimeout(() => {
+                if (document.body.contains(this)) {
+                    document.body.removeChild(this);
+                }
+            }, 100);
+        });
+        
+        // ESC 키로 닫기
+        input.addEventListener('keydown', function(e) {
+            if (e.key === 'Escape') {
+                document.body.removeChild(this);
+            }
+        });
+    });
+}
+
+// 대출 상세정보 토글
+function toggleLoanDetails(element) {
+    element.classList.toggle('active');
+}
+
+// 고객 정보 로드
+function loadCustomerInfo() {
+    fetch(`${API_BASE}/customer_info`)
+        .then(response => response.json())
+        .then(data => {
+            document.getElementById('customerName').textContent = data.customer_name;
+            document.getElementById('moveInDate').textContent = data.move_in_date || '날짜 선택';
+        });
+}
+
+// 고객 정보 업데이트
+function updateCustomerInfo(name, date) {
+    const data = {};
+    if (name !== null) data.customer_name = name;
+    if (date !== null) data.move_in_date = date;
+
+    fetch(`${API_BASE}/customer_info`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(data)
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            loadCustomerInfo();
+        }
+    });
+}
+
+// 링크 추가
+function addLink() {
+    const url = document.getElementById('linkUrl').value;
+    const memo = document.getElementById('linkMemo').value;
+    
+    if (!url) {
+        alert('링크 URL을 입력해주세요.');
+        return;
+    }
+    
+    const data = {
+        url: url,
+        platform: currentPlatform,
+        added_by: currentUser,
+        memo: memo
+    };
+    
+    fetch(`${API_BASE}/links`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(data)
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            if (result.archived) {
+                if (confirm('보관함에 같은 매물이 있습니다. 보관을 해제할까요?')) {
+                    unarchiveLink(result.id);
+                }
+            } else if (result.duplicate) {
+                alert('이미 추가된 매물입니다. 메모가 있으면 기존 링크에 합쳤습니다.');
+            }
+            document.getElementById('linkUrl').value = '';
+            document.getElementById('linkMemo').value = '';
+            loadLinks();
+        } else {
+            alert(result.error || '링크 추가에 실패했습니다.');
+        }
+    });
+}
+
+// 필터 조건을 쿼리 파라미터로
+function buildFilterParams() {
+    const params = new URLSearchParams();
+    if (currentFilters.platform !== 'all') params.append('platform', currentFilters.platform);
+    if (currentFilters.user !== 'all') params.append('user', currentFilters.user);
+    if (currentFilters.like !== 'all') params.append('like', currentFilters.like);
+    
+    const dateFilter = document.getElementById('dateFilter').value;
+    if (dateFilter) params.append('date', dateFilter);
+    
+    const searchQuery = document.getElementById('searchQuery').value.trim();
+    if (searchQuery) params.append('q', searchQuery);
+    // 오래된 링크는 보관함으로 옮겨지므로 체크했을 때만 함께 본다
+    const includeArchived = document.getElementById('includeArchived').checked;
+    if (includeArchived) params.append('include_archived', '1');
+    // 필드별 배열 형식으로, 화면에 바로 쓰는 필드만 받는다 (링크마다 키 이름을 반복하지 않고 메모도 빠져서 응답이 작다)
+    params.append('fields', (includeArchived ? LIST_FIELDS.concat('archived') : LIST_FIELDS).join(','));
+    params.append('format', 'columnar');
+    if (knownVersion) params.append('min_version', knownVersion);
+    return params;
+}
+
+// 필드별 배열 응답을 링크 객체 배열로 되돌린다
+function columnarLinks(page) {
+    const fields = Object.keys(page.columns);
+    return Array.from({ length: page.count }, (_, i) => {
+        const link = {};
+        fields.forEach(field => { link[field] = page.columns[field][i]; });
+        return link;
+    });
+}
+
+// 링크 목록 로드 (이미 불러온 만큼은 다시 불러온다)
+function loadLinks() {
+    const params = buildFilterParams();
+    params.append('limit', Math.min(Math.max(loadedCount, PAGE_SIZE), MAX_PAGE_SIZE));
+
+    // 아직 보내지 않은 수정 내용이 있으면 먼저 반영
+    flushLinkUpdates()
+        .then(() => fetch(`${API_BASE}/links?${params.toString()}`))
+        .then(response => response.json())
+        .then(page => {
+            const links = columnarLinks(page);
+            loadedCount = links.length;
+            nextCursor = page.next_cursor;
+            nextNumber = page.next_number;
+            // 검색 결과는 관련도순이라 다음 페이지가 없다 - limit개보다 많으면 잘렸다고 알려 준다
+            document.getElementById('searchTruncated').style.display = page.truncated ? 'block' : 'none';
+            displayLinks(links, false);
+        });
+}
+
+// 다음 페이지 로드
+function loadMoreLinks() {
+    if (nextCursor === null) return;
+    const params = buildFilterParams();
+    params.append('limit', PAGE_SIZE);
+    params.append('after_id', nextCursor);
+    params.append('after_number', nextNumber);
+
+    fetch(`${API_BASE}/links?${params.toString()}`)
+        .then(response => response.json())
+        .then(page => {
+            const links = columnarLinks(page);
+            loadedCount += links.length;
+            nextCursor = page.next_cursor;
+            nextNumber = page.next_number;
+            displayLinks(links, true);
+        });
+}
+
+// 링크 목록 표시
+function displayLinks(links, append) {
+    const container = document.getElementById('linksList');
+    document.getElementById('loadMoreBtn').style.display = nextCursor === null ? 'none' : 'block';
+    
+    if (links.length === 0 && !append) {
+        container.innerHTML = `
+            <div class="no-links">
+                아직 추가된 링크가 없습니다.<br>
+                위 양식을 통해 매물 링크를 추가해보세요! 📝
+            </div>
+        `;
+        return;
+    }
+    
+    let html = '';
+    links.forEach(link => {
+        const platformName = {
+            'zigbang': '직방',
+            'naver': '네이버',
+            'other': '기타'
+        }[link.platform];
+        
+        const platformClass = `badge-${link.platform}`;
+        const userClass = link.added_by === '중개사' ? 'badge-broker' : 'badge-customer';
+        const itemClass = link.archived ? 'archived' : (link.liked ? 'liked' : (link.disliked ? 'disliked' : ''));
+        
+        html += `
+            <div class="link-item ${itemClass}">
+                <div class="link-number">${link.number}</div>
+                <div class="link-header">
+                    <div class="link-badges">
+                        <span class="badge ${platformClass}">${platformName}</span>
+                        <span class="badge ${userClass}">${link.added_by}</span>
+                        ${link.archived ? '<span class="badge badge-archived">보관됨</span>' : ''}
+                    </div>
+                    <div class="link-date">${link.date_added}</div>
+                </div>
+                <div class="link-content">
+                    <div class="link-main">
+                        <a href="${link.url}" target="_blank" class="link-url">${link.url}</a>
+                        <div class="link-preview" id="preview-${link.id}"></div>
+                        <div class="link-actions">
+                            <div class="rating-section">
+                                <input type="number" min="1" max="10" value="${link.rating}" 
+                                       class="rating-input" onchange="updateRating(${link.id}, this.value)">
+                                <span style="font-size: 10px; color: #856404;">/10</span>
+                            </div>
+                            <div class="action-buttons">
+                                <button class="btn-small btn-like ${link.liked ? 'active' : ''}" 
+                                        onclick="toggleLike(${link.id})">
+                                    👍
+                                </button>
+                                <button class="btn-small btn-dislike ${link.disliked ? 'active' : ''}" 
+                                        onclick="toggleDislike(${link.id})">
+                                    👎
+                                </button>
+                                ${link.archived ? `
+                                <button class="btn-small btn-unarchive" onclick="unarchiveLink(${link.id})">보관 해제</button>
+                                ` : `
+                                <button class="btn-small btn-delete" 
+                                        onclick="deleteLink(${link.id})" 
+                                        title="링크 삭제">
+                                    🗑️
+                                </button>
+                                `}
+                            </div>
+                        </div>
+                    </div>
+                    <div>
+                        <button class="memo-toggle" onclick="toggleMemo(${link.id})">메모</button>
+                    </div>
+                </div>
+                <div class="memo-section" id="memo-${link.id}" style="display: none;">
+                    <textarea class="memo-input" onchange="updateMemo(${link.id}, this.value)" placeholder="메모를 입력하세요..."></textarea>
+                </div>
+            </div>
+        `;
+    });
+    
+    if (append) {
+        container.insertAdjacentHTML('beforeend', html);
+    } else {
+        container.innerHTML = html;
+    }
+    loadMetadata(links.map(link => link.id), 0);
+}
+
+// 매물 정보(가격/면적/썸네일) - 서버가 아직 가져오는 중인 링크는 잠시 뒤에 다시 묻는다
+const METADATA_RETRIES = 3;
+
+function loadMetadata(linkIds, attempt) {
+    if (linkIds.length === 0) return;
+    fetch(`${API_BASE}/links/metadata?ids=${linkIds.join(',')}`)
+        .then(response => response.json())
+        .then(result => {
+            const pending = [];
+            Object.entries(result.metadata || {}).forEach(([linkId, info]) => {
+                if (info.status === 'pending') {
+                    pending.push(linkId);
+                } else if (info.status === 'ok') {
+                    showPreview(linkId, info);
+                }
+            });
+            if (pending.length && attempt < METADATA_RETRIES) {
+                setTimeout(() => loadMetadata(pending, attempt + 1), 3000);
+            }
+        });
+}
+
+function showPreview(linkId, info) {
+    const preview = document.getElementById(`preview-${linkId}`);
+    if (!preview) return;
+    preview.textContent = '';
+    if (info.thumbnail) {
+        const image = document.createElement('img');
+        image.src = info.thumbnail;
+        image.alt = '';
+        image.loading = 'lazy';
+        preview.appendChild(image);
+    }
+    // 다른 사이트에서 가져온 글이므로 textContent로만 넣는다
+    const text = document.createElement('div');
+    [['preview-price', info.price], ['preview-area', info.area], ['preview-title', info.title]].forEach(([className, value]) => {
+        if (!value) return;
+        const span = document.createElement('span');
+        span.className = className;
+        span.textContent = value;
+        text.appendChild(span);
+    });
+    preview.appendChild(text);
+}
+
+// 평점/메모/좋아요 수정은 모아서 PATCH /api/links/batch 한 번으로 보낸다
+const pendingUpdates = new Map();
+let flushTimer = null;
+
+function queueLinkUpdate(linkId, action, value) {
+    pendingUpdates.set(`${linkId}:${action}`, { id: linkId, action: action, value: value });
+    clearTimeout(flushTimer);
+    flushTimer = setTimeout(flushLinkUpdates, 500);
+}
+
+function flushLinkUpdates(keepalive) {
+    clearTimeout(flushTimer);
+    if (pendingUpdates.size === 0) return Promise.resolve();
+    
+    const operations = Array.from(pendingUpdates.values());
+    pendingUpdates.clear();
+    return fetch(`${API_BASE}/links/batch`, {
+        method: 'PATCH',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ operations: operations }),
+        keepalive: keepalive === true
+    });
+}
+
+// 페이지를 떠날 때 남은 수정 내용 전송
+window.addEventListener('pagehide', () => flushLinkUpdates(true));
+
+// 평점 업데이트
+function updateRating(linkId, rating) {
+    queueLinkUpdate(linkId, 'rating', parseInt(rating));
+}
+
+// 좋아요 토글
+function toggleLike(linkId) {
+    const btn = document.querySelector(`button[onclick="toggleLike(${linkId})"]`);
+    const isActive = btn.classList.contains('active');
+    
+    queueLinkUpdate(linkId, 'like', !isActive);
+    flushLinkUpdates().then(() => loadLinks());
+}
+
+// 싫어요 토글
+function toggleDislike(linkId) {
+    const btn = document.querySelector(`button[onclick="toggleDislike(${linkId})"]`);
+    const isActive = btn.classList.contains('active');
+    
+    queueLinkUpdate(linkId, 'dislike', !isActive);
+    flushLinkUpdates().then(() => loadLinks());
+}
+
+// 메모 토글 - 처음 열 때 메모를 가져온다 (가져오는 동안은 고칠 수 없게)
+function toggleMemo(linkId) {
+    const memoSection = document.getElementById(`memo-${linkId}`);
+    if (memoSection.style.display !== 'none') {
+        memoSection.style.display = 'none';
+        return;
+    }
+    memoSection.style.display = 'block';
+    if (memoSection.dataset.loaded) return;
+    
+    const textarea = memoSection.querySelector('textarea');
+    textarea.disabled = true;
+    flushLinkUpdates()
+        .then(() => fetch(`${API_BASE}/links/${linkId}/memo`))
+        .then(response => response.json())
+        .then(result => {
+            textarea.value = result.memo || '';
+            memoSection.dataset.loaded = '1';
+        })
+        .finally(() => { textarea.disabled = false; });
+}
+
+// 메모 업데이트
+function updateMemo(linkId, memo) {
+    queueLinkUpdate(linkId, 'memo', memo);
+}
+
+// 링크 삭제
+function deleteLink(linkId) {
+    if (confirm('정말로 이 링크를 삭제하시겠습니까?')) {
+        fetch(`${API_BASE}/links/${linkId}`, {
+            method: 'DELETE',
+            headers: {
+                'Content-Type': 'application/json',
+            }
+        })
+        .then(response => response.json())
+        .then(result => {
+            if (result.success) {
+                loadLinks(); // 목록 새로고침
+            } else {
+                alert('링크 삭제에 실패했습니다.');
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('링크 삭제 중 오류가 발생했습니다.');
+        });
+    }
+}
+
+// 보관한 링크를 목록으로 되돌리기
+function unarchiveLink(linkId) {
+    fetch(`${API_BASE}/links/unarchive`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ ids: [linkId] })
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            loadLinks();
+        } else {
+            alert(result.error || '보관 해제에 실패했습니다.');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('보관 해제 중 오류가 발생했습니다.');
+    });
+}
+
+// 검색
+function searchLinks() {
+    loadedCount = 0;
+    loadLinks();
+}
+
+// 필터 초기화
+function clearFilters() {
+    document.querySelectorAll('.filter-btn').forEach(btn => btn.classList.remove('active'));
+    document.querySelectorAll('[data-value="all"]').forEach(btn => btn.classList.add('active'));
+    document.getElementById('dateFilter').value = '';
+    document.getElementById('searchQuery').value = '';
+    document.getElementById('includeArchived').checked = false;
+    
+    currentFilters = {
+        platform: 'all',
+        user: 'all',
+        like: 'all'
+    };
+    
+    loadedCount = 0;
+    loadLinks();
+}
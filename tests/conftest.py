@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 테스트 중에는 매물 정보를 가져오러 네트워크에 나가지 않는다
+os.environ.setdefault('METADATA_FETCHER', 'off')
+
+import app as app_module
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """빈 SQLite DB 파일로 최신 스키마까지 마이그레이션한 app 모듈"""
+    monkeypatch.delenv('DATABASE_URL', raising=False)
+    monkeypatch.setattr(app_module, 'SQLITE_PATH', str(tmp_path / 'links.db'))
+    app_module._sqlite_local.conn = None
+    app_module.links_cache.clear()
+    app_module.index_page_cache.clear()
+    app_module.init_db()
+    yield app_module
+    app_module._sqlite_local.conn = None
+
+@pytest.fixture
+def client(app):
+    return app.app.test_client()
+
+def add_links(client, count, board_id=None, **fields):
+    prefix = f'/api/boards/{board_id}' if board_id else '/api'
+    ids = []
+    for i in range(count):
+        data = {'url': f'https://new.land.naver.com/rooms?articleNo={i}', 'platform': 'naver', 'added_by': '손님', 'memo': ''}
+        data.update(fields)
+        ids.append(client.post(f'{prefix}/links', json=data).get_json()['id'])
+    return ids
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+from conftest import add_links
+
+def set_link(app, link_id, **values):
+    conn = app.connect_sqlite(app.SQLITE_PATH)
+    assignments = ', '.join(f'{column} = ?' for column in values)
+    conn.execute(f'UPDATE links SET {assignments} WHERE id = ?', list(values.values()) + [link_id])
+    conn.commit()
+    conn.close()
+
+def link_ids(client):
+    return {link['id'] for link in client.get('/api/links').get_json()['links']}
+
+def test_disliked_link_waits_for_grace_period(app, client):
+    (link_id,) = add_links(client, 1)
+    client.put(f'/api/links/{link_id}', json={'action': 'dislike', 'disliked': True})
+    assert app.run_archive() == {}
+    later = datetime.now() + timedelta(days=app.ARCHIVE_DISLIKED_AFTER_DAYS + 1)
+    assert app.run_archive(now=later) == {1: 1}
+    assert link_ids(client) == set()
+
+def test_legacy_disliked_row_uses_date_added(app, client):
+    # 변경 순번 마이그레이션 전에 만든 행은 updated_at이 ''
+    today = datetime.now().strftime('%Y-%m-%d')
+    recent, old = add_links(client, 2)
+    set_link(app, recent, disliked=1, updated_at='', date_added=today)
+    old_date = (datetime.now() - timedelta(days=app.ARCHIVE_DISLIKED_AFTER_DAYS + 1)).strftime('%Y-%m-%d')
+    set_link(app, old, disliked=1, updated_at='', date_added=old_date)
+
+    assert app.run_archive() == {1: 1}
+    assert link_ids(client) == {recent}
+
+def test_adding_archived_link_reports_it(app, client):
+    (link_id,) = add_links(client, 1)
+    client.put(f'/api/links/{link_id}', json={'action': 'dislike', 'disliked': True})
+    app.run_archive(now=datetime.now() + timedelta(days=app.ARCHIVE_DISLIKED_AFTER_DAYS + 1))
+
+    data = {'url': 'https://new.land.naver.com/rooms?articleNo=0&utm_source=kakao', 'platform': 'naver',
+            'added_by': '손님', 'memo': '다시 보기'}
+    result = client.post('/api/links', json=data).get_json()
+    assert result == {'success': True, 'id': link_id, 'duplicate': True, 'archived': True}
+    assert link_ids(client) == set()
+
+    assert client.post('/api/links/unarchive', json={'ids': [link_id]}).get_json()['restored'] == 1
+    result = client.post('/api/links', json=data).get_json()
+    assert result == {'success': True, 'id': link_id, 'duplicate': True, 'archived': False}
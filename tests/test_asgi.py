@@ -0,0 +1,171 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from conftest import add_links
+
+httpx = pytest.importorskip('httpx')
+asgi_app = pytest.importorskip('asgi_app')
+
+def run_asgi(app, requests):
+    """ASGI 앱에 requests(client를 받는 코루틴 함수)를 보낸다 (lifespan 대신 연결 풀을 직접 연다)"""
+    async def run():
+        await asgi_app.db.start()
+        try:
+            transport = httpx.ASGITransport(app=asgi_app.app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://testserver') as client:
+                return await requests(client)
+        finally:
+            await asgi_app.db.stop()
+    return asyncio.run(run())
+
+def test_asgi_writes_set_write_version_cookie(app, monkeypatch):
+    monkeypatch.setattr(app, 'DATABASE_REPLICA_URLS', ['replica.db'])
+
+    async def requests(client):
+        cookies = []
+        response = await client.post('/api/links', json={'url': 'https://new.land.naver.com/rooms?articleNo=1',
+                                                         'platform': 'naver', 'added_by': '손님'})
+        link_id = response.json()['id']
+        cookies.append(response.cookies.get(app.REPLICA_WRITE_COOKIE))
+        response = await client.put(f'/api/links/{link_id}', json={'action': 'rating', 'rating': 9})
+        cookies.append(response.cookies.get(app.REPLICA_WRITE_COOKIE))
+        response = await client.post('/api/customer_info', json={'customer_name': '김손님'})
+        cookies.append(response.cookies.get(app.REPLICA_WRITE_COOKIE))
+        response = await client.delete(f'/api/links/{link_id}')
+        cookies.append(response.cookies.get(app.REPLICA_WRITE_COOKIE))
+        response = await client.get('/api/links')
+        cookies.append(response.headers.get('set-cookie'))
+        return cookies
+
+    versions = [app.parse_write_versions(cookie) if cookie else None for cookie in run_asgi(app, requests)]
+    assert versions[:4] == [{1: 2}, {1: 3}, {1: 3}, {1: 4}]
+    assert versions[4] is None
+
+def test_asgi_write_cookie_off_without_replicas(app):
+    async def requests(client):
+        response = await client.post('/api/customer_info', json={'customer_name': '김손님'})
+        return response.headers.get('set-cookie')
+
+    assert run_asgi(app, requests) is None
+
+def test_asgi_links_match_flask(app, client):
+    add_links(client, 5)
+    add_links(client, 2, memo='남향 역세권', url='https://zigbang.com/items/7')
+    queries = ['/api/links', '/api/links?all=1', '/api/links?limit=3', '/api/links?limit=3&format=columnar&fields=id,url',
+               '/api/links?q=역세권', '/api/links?q=역세권&limit=1', '/api/links?platform=naver&limit=2']
+    first = client.get('/api/links?limit=3').get_json()
+    queries.append(f"/api/links?limit=3&after_id={first['next_cursor']}")
+    queries.append(f"/api/links?limit=3&after_id={first['next_cursor']}&after_number={first['next_number']}")
+
+    async def requests(client):
+        return [(await client.get(query)).json() for query in queries]
+
+    expected = [client.get(query).get_json() for query in queries]
+    assert len(expected[4]['links']) == 1
+    app.links_cache.clear()
+    assert run_asgi(app, requests) == expected
+
+def test_asgi_update_rejects_unknown_action_and_missing_link(app, client):
+    (link_id,) = add_links(client, 1)
+    version = client.get('/api/links/stats').get_json()['version']
+
+    async def requests(client):
+        unknown = await client.put(f'/api/links/{link_id}', json={'action': 'star'})
+        missing = await client.put(f'/api/links/{link_id + 1}', json={'action': 'rating', 'rating': 7})
+        deleted = await client.delete(f'/api/links/{link_id + 1}')
+        return unknown.json(), missing.status_code, deleted.json()
+
+    unknown, missing_status, deleted = run_asgi(app, requests)
+    assert not unknown['success'] and unknown['error']
+    assert missing_status == 404
+    assert deleted['success']
+    assert client.get('/api/links/stats').get_json()['version'] == version
+
+def test_asgi_serves_events_on_the_event_loop(app, monkeypatch):
+    # Flask 쪽 한도(스레드 수의 1/4)와 상관없이 ASGI 라우트가 받는다
+    monkeypatch.setattr(app, 'SSE_MAX_CLIENTS', 0)
+
+    async def run():
+        messages = asyncio.Queue()
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+                 'path': '/api/events', 'raw_path': b'/api/events', 'query_string': b'', 'root_path': '', 'headers': [],
+                 'server': ('testserver', 80), 'client': ('127.0.0.1', 50000)}
+        task = asyncio.create_task(asgi_app.app(scope, receive, messages.put))
+        start = await asyncio.wait_for(messages.get(), 5)
+        first = await asyncio.wait_for(messages.get(), 5)
+        clients = app.change_hub.client_count()
+        # 허브의 수신 스레드처럼 다른 스레드에서 발행한다
+        threading.Thread(target=app.change_hub.publish, args=({'type': 'links', 'board_id': 1, 'version': 7},)).start()
+        event = await asyncio.wait_for(messages.get(), 5)
+        disconnected.set()
+        await asyncio.wait_for(task, 5)
+        return start['status'], first['body'], event['body'], clients
+
+    status, first, event, clients = asyncio.run(run())
+    assert status == 200 and first == b'retry: 3000\n\n'
+    assert event.startswith(b'event: links\ndata: ') and b'"version": 7' in event
+    assert clients == 1 and app.change_hub.client_count() == 0
+
+def test_asgi_events_refused_beyond_limit(app, monkeypatch):
+    monkeypatch.setattr(asgi_app, 'SSE_ASYNC_MAX_CLIENTS', 0)
+
+    async def requests(client):
+        return await client.get('/api/events')
+
+    response = run_asgi(app, requests)
+    assert response.status_code == 503
+    assert response.headers['retry-after'] == str(app.SSE_RETRY_AFTER)
+
+def test_asgi_list_compression_and_conditional_get(app, client):
+    add_links(client, 30, memo='남향 역세권 주차 가능')
+
+    async def requests(client):
+        plain = await client.get('/api/links', headers={'Accept-Encoding': 'identity'})
+        packed = await client.get('/api/links', headers={'Accept-Encoding': 'gzip'})
+        cached = await client.get('/api/links', headers={'Accept-Encoding': 'gzip', 'If-None-Match': packed.headers['etag']})
+        return plain, packed, cached
+
+    plain, packed, cached = run_asgi(app, requests)
+    assert 'content-encoding' not in plain.headers
+    assert packed.headers['content-encoding'] == 'gzip'
+    assert packed.headers['etag'] != plain.headers['etag']
+    assert packed.json() == plain.json() == client.get('/api/links').get_json()
+    assert cached.status_code == 304
+
+@pytest.mark.parametrize('query', ['', '?format=ndjson'])
+def test_asgi_backup_matches_flask(app, client, query):
+    ids = add_links(client, 4)
+    version = client.get('/api/links/changes?since=0').get_json()['version']
+    client.put(f'/api/links/{ids[0]}', json={'action': 'rating', 'rating': 3})
+    client.delete(f'/api/links/{ids[1]}')
+    separator = '&' if query else '?'
+    paths = [f'/api/backup{query}', f'/api/backup{query}{separator}since={version}']
+
+    def without_dates(text):
+        if query:
+            lines = [json.loads(line) for line in text.splitlines()]
+            lines[0].pop('backup_date')
+            return lines
+        backup = json.loads(text)
+        backup.pop('backup_date')
+        return backup
+
+    async def requests(client):
+        return [without_dates((await client.get(path, headers={'Accept-Encoding': 'gzip'})).text) for path in paths]
+
+    assert run_asgi(app, requests) == [without_dates(client.get(path).get_data(as_text=True)) for path in paths]
+
+def test_asgi_unknown_board_is_404(app):
+    async def requests(client):
+        return [(await client.get(path)).status_code for path in ('/api/boards/99/links', '/api/boards/99/backup')]
+
+    assert run_asgi(app, requests) == [404, 404]
@@ -0,0 +1,35 @@
+import io
+import json
+
+from conftest import add_links
+
+def test_backup_streams_links_in_batches(app, client, monkeypatch):
+    monkeypatch.setattr(app, 'BACKUP_BATCH_SIZE', 2)
+    ids = add_links(client, 5)
+    response = client.get('/api/backup', buffered=False)
+    assert response.is_streamed
+    chunks = list(response.response)
+    response.close()
+    # 헤더, 링크 묶음 3개, 끝
+    assert len(chunks) == 5
+
+    backup = json.loads(b''.join(chunks))
+    assert set(backup) == {'backup_date', 'customer_info', 'version', 'links'}
+    assert sorted(link['id'] for link in backup['links']) == sorted(ids)
+    assert backup['customer_info']['id'] == 1
+
+def test_backup_of_empty_board(client):
+    backup = client.get('/api/backup').get_json()
+    assert backup['links'] == []
+
+def test_ndjson_backup_one_link_per_line(app, client):
+    ids = add_links(client, 3)
+    response = client.get('/api/backup?format=ndjson')
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert len(lines) == 4
+    assert 'version' in json.loads(lines[0])
+
+    header, links = app.read_ndjson_backup(io.StringIO(response.get_data(as_text=True)))
+    assert header == json.loads(lines[0])
+    assert sorted(link['id'] for link in links) == sorted(ids)
@@ -0,0 +1,59 @@
+import pytest
+
+from conftest import add_links
+
+def links_by_id(client):
+    return {link['id']: link for link in client.get('/api/links').get_json()['links']}
+
+@pytest.mark.parametrize('bad', [
+    {'action': 'rating', 'value': 'abc'},
+    {'action': 'rating', 'value': 11},
+    {'action': 'rating', 'value': True},
+    {'action': 'like', 'value': 'yes'},
+    {'action': 'memo', 'value': {'text': 'x'}},
+])
+def test_invalid_item_in_mixed_batch(client, bad):
+    first, second = add_links(client, 2)
+    response = client.patch('/api/links/batch', json=[
+        {'id': first, 'action': 'rating', 'value': 8},
+        dict(bad, id=second),
+        {'id': second, 'action': 'memo', 'value': '남향'},
+    ])
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['applied'] == 2
+    assert [result['success'] for result in data['results']] == [True, False, True]
+    assert data['results'][1]['error']
+
+    links = links_by_id(client)
+    assert links[first]['rating'] == 8
+    assert links[second]['memo'] == '남향'
+
+def test_invalid_value_on_single_update(client):
+    (link_id,) = add_links(client, 1)
+    data = client.put(f'/api/links/{link_id}', json={'action': 'rating', 'rating': 'abc'}).get_json()
+    assert not data['success'] and data['error']
+    assert links_by_id(client)[link_id]['rating'] == 5
+
+def board_version(client):
+    return client.get('/api/links/stats').get_json()['version']
+
+def test_unknown_action_on_single_update(client):
+    (link_id,) = add_links(client, 1)
+    version = board_version(client)
+    for body in ({'action': 'star'}, {}, {'action': ['rating']}):
+        data = client.put(f'/api/links/{link_id}', json=body).get_json()
+        assert not data['success'] and data['error']
+    assert board_version(client) == version
+
+@pytest.mark.parametrize('write_queue', [True, False])
+def test_missing_link_on_single_update(app, client, monkeypatch, write_queue):
+    monkeypatch.setattr(app, 'SQLITE_WRITE_QUEUE', write_queue)
+    (link_id,) = add_links(client, 1)
+    version = board_version(client)
+    response = client.put(f'/api/links/{link_id + 1}', json={'action': 'rating', 'rating': 7})
+    assert response.status_code == 404 and not response.get_json()['success']
+    assert client.delete(f'/api/links/{link_id + 1}').get_json()['success']
+    assert board_version(client) == version
+    assert client.put(f'/api/links/{link_id}', json={'action': 'rating', 'rating': 7}).get_json()['success']
+    assert board_version(client) == version + 1
@@ -0,0 +1,41 @@
+from conftest import add_links
+
+def link_ids(client, board_id):
+    return sorted(link['id'] for link in client.get(f'/api/boards/{board_id}/links?all=1').get_json())
+
+def test_boards_are_listed(client):
+    board_id = client.post('/api/boards', json={'customer_name': '박손님', 'move_in_date': '2027-01-15'}).get_json()['id']
+    boards = client.get('/api/boards').get_json()
+    assert [board['id'] for board in boards] == [1, board_id]
+    assert boards[1] == {'id': board_id, 'customer_name': '박손님', 'move_in_date': '2027-01-15'}
+    assert client.get(f'/api/boards/{board_id}/customer_info').get_json()['customer_name'] == '박손님'
+
+def test_links_stay_in_their_board(client):
+    other = client.post('/api/boards', json={'customer_name': '박손님'}).get_json()['id']
+    first = add_links(client, 2)
+    second = add_links(client, 2, board_id=other)
+    # 같은 매물이라도 다른 보드에서는 중복이 아니다
+    assert not set(first) & set(second)
+    assert link_ids(client, 1) == sorted(first)
+    assert link_ids(client, other) == sorted(second)
+    assert sorted(link['id'] for link in client.get('/api/links?all=1').get_json()) == sorted(first)
+
+    response = client.put(f'/api/boards/{other}/links/{first[0]}', json={'action': 'rating', 'rating': 1})
+    assert response.status_code == 404
+    client.delete(f'/api/boards/{other}/links/{first[1]}')
+    assert link_ids(client, 1) == sorted(first)
+
+def test_restore_replaces_only_its_board(client):
+    other = client.post('/api/boards', json={'customer_name': '박손님'}).get_json()['id']
+    first = add_links(client, 2)
+    add_links(client, 3, board_id=other)
+    backup = client.get(f'/api/boards/{other}/backup').get_json()
+
+    client.post(f'/api/boards/{other}/restore', json={'customer_info': backup['customer_info'], 'links': []})
+    assert link_ids(client, other) == []
+    assert link_ids(client, 1) == sorted(first)
+
+def test_unknown_board_is_404(client):
+    assert client.get('/api/boards/99/links').status_code == 404
+    assert client.post('/api/boards/99/links', json={'url': 'https://x', 'platform': 'naver',
+                                                     'added_by': '손님'}).status_code == 404
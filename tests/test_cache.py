@@ -0,0 +1,48 @@
+from conftest import add_links
+
+def test_conditional_get_until_links_change(client):
+    (link_id,) = add_links(client, 1)
+    response = client.get('/api/links')
+    etag = response.headers['ETag']
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    response = client.get('/api/links', headers={'If-None-Match': etag})
+    assert response.status_code == 304 and response.get_data() == b''
+    assert client.get('/api/links?platform=naver').headers['ETag'] != etag
+
+    client.put(f'/api/links/{link_id}', json={'action': 'rating', 'rating': 9})
+    response = client.get('/api/links', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.get_json()['links'][0]['rating'] == 9
+
+def test_list_served_from_cache_until_version_changes(app, client, monkeypatch):
+    (link_id,) = add_links(client, 1)
+    calls = []
+    fetch_links = app.fetch_links
+    monkeypatch.setattr(app, 'fetch_links', lambda *args: calls.append(args) or fetch_links(*args))
+
+    first = client.get('/api/links').get_data()
+    # 기본값과 같은 필터는 같은 캐시 항목
+    assert client.get('/api/links?platform=all&like=all').get_data() == first
+    assert len(calls) == 1
+
+    client.put(f'/api/links/{link_id}', json={'action': 'like', 'liked': True})
+    client.get('/api/links')
+    assert len(calls) == 2
+
+def test_response_cache_drops_only_stale_board(app):
+    cache = app.LinksResponseCache(3)
+    cache.put(1, 5, 'a', b'1a')
+    cache.put(2, 7, 'a', b'2a')
+    cache.put(1, 4, 'b', b'old')
+    assert cache.get(1, 4, 'b') is None
+
+    cache.put(1, 6, 'b', b'1b')
+    assert cache.get(1, 5, 'a') is None and cache.get(1, 6, 'a') is None
+    assert cache.get(1, 6, 'b') == b'1b'
+    assert cache.get(2, 7, 'a') == b'2a'
+
+    cache.put(2, 7, 'b', b'2b')
+    cache.put(2, 7, 'c', b'2c')
+    assert cache.get(1, 6, 'b') is None
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+from conftest import add_links
+
+def test_pruned_tombstones_require_resync(app, client):
+    first, second = add_links(client, 2)
+    client.delete(f'/api/links/{first}')
+    changes = client.get('/api/links/changes?since=0').get_json()
+    assert not changes['reset'] and changes['deleted'] == [first]
+    version = changes['version']
+
+    app.run_archive(now=datetime.now() + timedelta(days=app.TOMBSTONE_RETENTION_DAYS + 1))
+
+    assert client.get('/api/links/changes?since=0').get_json()['reset']
+    assert client.get(f'/api/links/changes?since={version - 1}').get_json()['reset']
+    assert client.get('/api/backup?since=0').status_code == 409
+    changes = client.get(f'/api/links/changes?since={version}').get_json()
+    assert not changes['reset'] and changes['deleted'] == []
+
+def test_recent_tombstones_are_kept(app, client):
+    (link_id,) = add_links(client, 1)
+    client.delete(f'/api/links/{link_id}')
+    app.run_archive()
+    assert client.get('/api/links/changes?since=0').get_json()['deleted'] == [link_id]
+
+def list_state(client):
+    links = client.get('/api/links?all=1').get_json()
+    return {link['id']: (link['rating'], bool(link['liked']), link['memo']) for link in links}
+
+def test_changes_replay_matches_full_list(client):
+    ids = add_links(client, 3)
+    state = list_state(client)
+    version = client.get('/api/links/changes?since=0').get_json()['version']
+
+    client.put(f'/api/links/{ids[0]}', json={'action': 'rating', 'rating': 2})
+    client.patch('/api/links/batch', json=[{'id': ids[1], 'action': 'like', 'value': True},
+                                           {'id': ids[1], 'action': 'memo', 'value': '역세권'}])
+    client.delete(f'/api/links/{ids[2]}')
+    new_id = client.post('/api/links', json={'url': 'https://m.land.naver.com/article/9', 'platform': 'naver',
+                                             'added_by': '중개사', 'memo': '새 매물'}).get_json()['id']
+
+    changes = client.get(f'/api/links/changes?since={version}').get_json()
+    assert not changes['reset']
+    assert sorted(link['id'] for link in changes['links']) == sorted([ids[0], ids[1], new_id])
+    assert changes['deleted'] == [ids[2]]
+    for link in changes['links']:
+        state[link['id']] = (link['rating'], bool(link['liked']), link['memo'])
+    for link_id in changes['deleted']:
+        del state[link_id]
+    assert state == list_state(client)
+
+    unchanged = client.get(f"/api/links/changes?since={changes['version']}").get_json()
+    assert unchanged == {'version': changes['version'], 'reset': False, 'links': [], 'deleted': []}
+
+def test_restore_and_future_versions_reset(client):
+    add_links(client, 2)
+    version = client.get('/api/links/changes?since=0').get_json()['version']
+    assert client.get(f'/api/links/changes?since={version + 1}').get_json()['reset']
+
+    backup = client.get('/api/backup').get_json()
+    client.post('/api/restore', json=backup)
+    assert client.get(f'/api/links/changes?since={version}').get_json()['reset']
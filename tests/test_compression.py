@@ -0,0 +1,54 @@
+import gzip
+import json
+
+import pytest
+from werkzeug.http import parse_accept_header
+
+from conftest import add_links
+
+def decode(app, response):
+    data = response.get_data()
+    encoding = response.headers.get('Content-Encoding')
+    if encoding == 'gzip':
+        return gzip.decompress(data)
+    if encoding == 'br':
+        return app.brotli.decompress(data)
+    return data
+
+def without_dates(data):
+    # 백업은 backup_date만 다르다
+    documents = [json.loads(line) for line in data.splitlines()]
+    documents[0].pop('backup_date', None)
+    return documents
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip', 'gzip'),
+    ('gzip, deflate', 'gzip'),
+    ('identity', None),
+    ('gzip;q=0', None),
+    ('', None),
+])
+def test_negotiate_encoding(app, header, expected):
+    assert app.negotiate_encoding(parse_accept_header(header)) == expected
+
+def test_brotli_preferred_when_available(app):
+    accepted = app.negotiate_encoding(parse_accept_header('gzip, br'))
+    assert accepted == ('br' if app.brotli is not None else 'gzip')
+
+@pytest.mark.parametrize('encoding', ['gzip', 'br'])
+def test_list_and_backup_compressed(app, client, encoding):
+    if encoding == 'br' and app.brotli is None:
+        pytest.skip('brotli가 없다')
+    add_links(client, 30, memo='남향 역세권 주차 가능 관리비 포함')
+    for path in ('/api/links', '/api/backup', '/api/backup?format=ndjson'):
+        plain = client.get(path)
+        packed = client.get(path, headers={'Accept-Encoding': encoding})
+        assert packed.headers['Content-Encoding'] == encoding
+        assert 'Accept-Encoding' in packed.headers['Vary']
+        assert len(packed.get_data()) < len(plain.get_data())
+        assert without_dates(decode(app, packed)) == without_dates(plain.get_data())
+
+def test_small_responses_stay_uncompressed(client):
+    response = client.get('/api/customer_info', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_json()['customer_name']
@@ -0,0 +1,48 @@
+import pytest
+
+import dedupe
+from conftest import add_links
+
+@pytest.mark.parametrize('first, second', [
+    ('https://new.land.naver.com/rooms?articleNo=2412345', 'http://m.land.naver.com/article/info/2412345?utm_source=kakao'),
+    ('https://www.zigbang.com/home/oneroom/items/42', 'zigbang.com/share/oneroom/42'),
+    ('https://www.example.com/listing/7/?b=2&a=1&fbclid=x', 'http://example.com/listing/7?a=1&b=2#photos'),
+    ('https://example.com:443/listing/7', 'https://example.com/listing/7?utm_campaign=spring&n_media=1'),
+])
+def test_same_listing_same_key(app, first, second):
+    assert app.canonical_url_key(first) == app.canonical_url_key(second)
+
+@pytest.mark.parametrize('first, second', [
+    ('https://new.land.naver.com/rooms?articleNo=1', 'https://new.land.naver.com/rooms?articleNo=2'),
+    ('https://www.zigbang.com/home/oneroom/items/42', 'https://new.land.naver.com/rooms?articleNo=42'),
+    ('https://example.com/listing?id=1', 'https://example.com/listing?id=2'),
+    ('https://example.com:8080/listing', 'https://example.com/listing'),
+])
+def test_different_listings_different_keys(app, first, second):
+    assert app.canonical_url_key(first) != app.canonical_url_key(second)
+
+def test_adding_duplicate_merges_memo(client):
+    (link_id,) = add_links(client, 1, memo='남향')
+    result = client.post('/api/links', json={'url': 'https://m.land.naver.com/article/0?utm_source=kakao',
+                                              'platform': 'naver', 'added_by': '중개사', 'memo': '주차 가능'}).get_json()
+    assert result['id'] == link_id and result['duplicate']
+    links = client.get('/api/links').get_json()['links']
+    assert [(link['id'], link['memo']) for link in links] == [(link_id, '남향\n주차 가능')]
+
+def test_bulk_dedupe_merges_legacy_duplicates(app, client):
+    ids = add_links(client, 3)
+    conn = app.connect_sqlite(app.SQLITE_PATH)
+    # url_key가 생기기 전에 들어온 같은 매물 (키를 비워 두면 정리할 때 채운다)
+    conn.execute("UPDATE links SET url = 'https://new.land.naver.com/rooms?articleNo=0&utm_source=x', url_key = '', "
+                 "rating = 9, liked = 1, memo = '역세권' WHERE id = ?", (ids[1],))
+    conn.commit()
+    conn.close()
+    version = client.get('/api/links/changes?since=0').get_json()['version']
+
+    assert dedupe.run(dry_run=True) == {1: 1}
+    assert dedupe.run() == {1: 1}
+    links = {link['id']: link for link in client.get('/api/links').get_json()['links']}
+    assert sorted(links) == [ids[0], ids[2]]
+    assert (links[ids[0]]['rating'], links[ids[0]]['liked'], links[ids[0]]['memo']) == (9, True, '역세권')
+    assert client.get(f'/api/links/changes?since={version}').get_json()['deleted'] == [ids[1]]
+    assert dedupe.run() == {}
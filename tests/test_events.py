@@ -0,0 +1,9 @@
+def test_events_refused_beyond_limit(app, client, monkeypatch):
+    # SSE 연결은 스레드 하나를 계속 잡으므로 SSE_MAX_CLIENTS를 넘으면 바로 거절한다
+    monkeypatch.setattr(app, 'SSE_MAX_CLIENTS', 0)
+    response = client.get('/api/events')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(app.SSE_RETRY_AFTER)
+
+def test_sse_limit_leaves_threads_for_requests(app):
+    assert 0 < app.SSE_MAX_CLIENTS <= app.GUNICORN_THREADS // 2
@@ -0,0 +1,27 @@
+import pytest
+
+from conftest import add_links
+
+@pytest.mark.parametrize('fields', ['', 'url,rating,liked', 'number'])
+def test_columnar_matches_rows(client, fields):
+    add_links(client, 3)
+    client.put('/api/links/2', json={'action': 'like', 'liked': True})
+    rows = client.get(f'/api/links?fields={fields}').get_json()['links']
+    columnar = client.get(f'/api/links?fields={fields}&format=columnar').get_json()
+    assert columnar['count'] == len(rows)
+    assert [dict(zip(columnar['columns'], values)) for values in zip(*columnar['columns'].values())] == rows
+    if 'liked' in columnar['columns']:
+        assert columnar['columns']['liked'] == [False, True, False]
+
+def test_changes_use_list_fields(client):
+    first, second = add_links(client, 2, memo='남향')
+    client.put(f'/api/links/{second}', json={'action': 'like', 'liked': True})
+    listed = {link['id']: link for link in client.get('/api/links').get_json()['links']}
+    changes = client.get('/api/links/changes?since=0').get_json()
+    assert [link['id'] for link in changes['links']] == [first, second]
+    for link in changes['links']:
+        assert isinstance(link.pop('change_seq'), int) and link.pop('updated_at')
+        expected = dict(listed[link['id']])
+        del expected['number']
+        assert link == expected
+    assert changes['links'][1]['liked'] is True
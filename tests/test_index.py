@@ -0,0 +1,45 @@
+import re
+
+def test_index_rendered_once_until_customer_changes(app, client, monkeypatch):
+    renders = []
+    render_template = app.render_template
+    monkeypatch.setattr(app, 'render_template', lambda *args, **kwargs: renders.append(kwargs) or render_template(*args, **kwargs))
+
+    first = client.get('/')
+    assert first.status_code == 200
+    assert client.get('/').get_data() == first.get_data()
+    assert len(renders) == 1
+    assert client.get('/', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    client.post('/api/customer_info', json={'customer_name': '김손님', 'move_in_date': '2026-12-01'})
+    page = client.get('/').get_data(as_text=True)
+    assert len(renders) == 2
+    assert '김손님' in page and '2026-12-01' in page
+
+def test_index_of_unknown_board_is_404(client):
+    assert client.get('/boards/99').status_code == 404
+
+def test_stale_render_not_cached(app):
+    cache = app.IndexPageCache()
+    generation = cache.generation(1)
+    cache.invalidate(1)
+    cache.put(1, generation, ('이전 고객', ''), app.PrecompressedBody(b'old', 'old'))
+    assert cache.get(1) is None
+
+    generation = cache.generation(1)
+    cache.put(1, generation, ('새 고객', ''), app.PrecompressedBody(b'new', 'new'))
+    assert cache.get(1).body == b'new'
+    cache.clear()
+    assert cache.get(1) is None
+
+def test_assets_are_fingerprinted(app, client):
+    page = client.get('/').get_data(as_text=True)
+    path = re.search(r'src="(/assets/(\w+)/app\.js)"', page)
+    response = client.get(path.group(1))
+    assert response.status_code == 200 and response.mimetype in ('text/javascript', 'application/javascript')
+    assert response.headers['Cache-Control'] == f'public, max-age={app.STATIC_MAX_AGE}, immutable'
+
+    stale = client.get('/assets/0123456789ab/app.js')
+    assert stale.status_code == 200 and stale.headers['Cache-Control'] == 'no-cache'
+    assert client.get('/assets/0123456789ab/missing.js').status_code == 404
+    assert client.get('/assets/0123456789ab/..%2Fapp.py').status_code == 404
@@ -0,0 +1,22 @@
+import random
+
+import loadtest
+
+def test_percentile_is_nearest_rank():
+    samples = list(range(1, 101))
+    assert loadtest.percentile(samples, 50) == 50
+    assert loadtest.percentile(samples, 99) == 99
+    assert loadtest.percentile([7], 95) == 7
+
+def test_every_scenario_succeeds(app):
+    target = loadtest.ClientTarget(app)
+    board_ids, link_ids = loadtest.seed_boards(target, 2, 30, seed=1)
+    assert all(len(link_ids[board_id]) == 30 for board_id in board_ids)
+    restore_body = loadtest.ndjson_backup('복원용', loadtest.synthetic_links(10, random.Random(1)))
+    scratch_boards = [board_ids[0]]
+
+    scenarios = loadtest.build_scenarios(board_ids, link_ids, scratch_boards, restore_body)
+    for index, (name, make_request) in enumerate(scenarios):
+        result = loadtest.run_scenario(target, make_request, 3, 1, seed=index)
+        assert result['requests'] == 3
+        assert result['errors'] == 0, name
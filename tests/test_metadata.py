@@ -0,0 +1,49 @@
+import pytest
+
+from conftest import add_links
+
+@pytest.mark.parametrize('text, expected', [
+    ('래미안 전세 3억 5,000 84.5㎡', {'price': '전세 3억 5,000', 'area': '84.5㎡'}),
+    ('원룸 월세 500/45 (7평)', {'price': '월세 500/45', 'area': '7평'}),
+    ('가격 문의', {'price': '', 'area': ''}),
+])
+def test_parse_listing_text(app, text, expected):
+    assert app.parse_listing_text(text) == expected
+
+def test_page_parser_reads_open_graph_tags(app):
+    parser = app.MetadataPageParser()
+    parser.feed('<html><head><title> 매물 </title><meta property="og:title" content="전세 2억">'
+                '<meta name="Description" content="59㎡"><meta property="og:title" content="두 번째"></head></html>')
+    assert parser.title.strip() == '매물'
+    assert parser.meta == {'og:title': '전세 2억', 'description': '59㎡'}
+
+@pytest.mark.parametrize('url', ['http://127.0.0.1/', 'http://localhost:5000/api/links', 'file:///etc/passwd', 'http://10.0.0.1/'])
+def test_private_urls_are_not_fetched(app, url):
+    assert not app.is_public_url(url)
+
+def metadata_of(client, link_id):
+    return client.get(f'/api/links/metadata?ids={link_id}').get_json()['metadata'][str(link_id)]
+
+def test_metadata_pending_until_refreshed(app, client, monkeypatch):
+    (link_id,) = add_links(client, 1)
+    url = client.get('/api/links').get_json()['links'][0]['url']
+    assert metadata_of(client, link_id) == {'status': 'pending'}
+
+    monkeypatch.setattr(app, 'METADATA_FETCHER', 'stub')
+    app.metadata_enricher.refresh(url)
+    metadata = metadata_of(client, link_id)
+    assert metadata['status'] == 'ok'
+    assert {key: metadata[key] for key in ('title', 'price', 'area')} == {
+        key: value for key, value in app.fetch_metadata_stub(url).items() if key != 'thumbnail'}
+
+def test_failed_fetch_is_stored_as_error(app, client, monkeypatch):
+    (link_id,) = add_links(client, 1)
+    url = client.get('/api/links').get_json()['links'][0]['url']
+
+    def broken(url):
+        raise OSError('timed out')
+
+    monkeypatch.setitem(app.METADATA_FETCHERS, 'broken', broken)
+    monkeypatch.setattr(app, 'METADATA_FETCHER', 'broken')
+    app.metadata_enricher.refresh(url)
+    assert metadata_of(client, link_id)['status'] == 'error'
@@ -0,0 +1,41 @@
+import json
+import logging
+import re
+
+from conftest import add_links
+
+def test_server_timing_counts_queries_and_rows(client):
+    add_links(client, 3)
+    timing = client.get('/api/links?all=1').headers['Server-Timing']
+    assert re.search(r'\bdb;dur=[\d.]+', timing)
+    assert re.search(r'\bserialize;dur=[\d.]+', timing)
+    queries, rows = map(int, re.search(r'total;dur=[\d.]+;desc="(\d+) queries, (\d+) rows"', timing).groups())
+    assert queries >= 2 and rows >= 3
+
+def test_request_log_line(app, client, caplog):
+    with caplog.at_level(logging.INFO, logger=app.request_logger.name):
+        client.get('/api/links')
+    entry = json.loads(caplog.records[-1].getMessage())
+    assert entry['endpoint'] == 'links' and entry['status'] == 200
+    assert set(entry['phases_ms']) == set(app.REQUEST_PHASES)
+    assert entry['queries'] >= 1
+
+def test_metrics_endpoint_accumulates_requests(client):
+    client.get('/api/links')
+    client.get('/api/links')
+    text = client.get('/metrics').get_data(as_text=True)
+    count = re.search(r'^http_requests_total\{endpoint="links",method="GET",status="200"\} (\d+)$', text, re.M)
+    assert int(count.group(1)) >= 2
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    assert re.search(r'^db_pool_checkouts \d+$', text, re.M)
+
+def test_histogram_buckets_are_cumulative(app):
+    registry = app.MetricsRegistry((0.1, 1.0))
+    labels = (('endpoint', 'a"b'),)
+    for value in (0.05, 0.5, 0.7, 3.0):
+        registry.observe('http_request_duration_seconds', labels, value)
+    lines = registry.render()
+    assert 'http_request_duration_seconds_bucket{endpoint="a\\"b",le="0.1"} 1' in lines
+    assert 'http_request_duration_seconds_bucket{endpoint="a\\"b",le="1.0"} 3' in lines
+    assert 'http_request_duration_seconds_bucket{endpoint="a\\"b",le="+Inf"} 4' in lines
+    assert 'http_request_duration_seconds_count{endpoint="a\\"b"} 4' in lines
@@ -0,0 +1,47 @@
+import sqlite3
+
+import pytest
+
+def link_columns(app):
+    conn = sqlite3.connect(app.SQLITE_PATH)
+    try:
+        return [row[1] for row in conn.execute('PRAGMA table_info(links)')]
+    finally:
+        conn.close()
+
+def test_init_db_twice_is_a_no_op(app):
+    latest = app.MIGRATIONS[-1][0]
+    columns = link_columns(app)
+    assert app.init_db() == latest
+    assert link_columns(app) == columns
+
+def test_failed_migration_is_rolled_back(app, monkeypatch):
+    version = app.MIGRATIONS[-1][0] + 1
+    broken = (version, '테스트', {'sqlite': [
+        "ALTER TABLE links ADD COLUMN extra TEXT NOT NULL DEFAULT ''",
+        'ALTER TABLE no_such_table ADD COLUMN extra TEXT',
+    ]})
+    monkeypatch.setattr(app, 'MIGRATIONS', app.MIGRATIONS + [broken])
+    with pytest.raises(sqlite3.OperationalError):
+        app.init_db()
+    assert 'extra' not in link_columns(app)
+
+    fixed = (version, '테스트', {'sqlite': ["ALTER TABLE links ADD COLUMN extra TEXT NOT NULL DEFAULT ''"]})
+    monkeypatch.setattr(app, 'MIGRATIONS', app.MIGRATIONS[:-1] + [fixed])
+    assert app.init_db() == version
+    assert 'extra' in link_columns(app)
+
+@pytest.mark.parametrize('query, index', [
+    ({'platform': 'naver'}, 'idx_links_board_platform_id'),
+    ({'user': '손님'}, 'idx_links_board_added_by_id'),
+    ({'platform': 'naver', 'user': '손님'}, 'idx_links_board_platform_added_by_id'),
+])
+def test_list_filters_use_indexes(app, query, index):
+    sql, params = app.LinksQuery('sqlite', 1, query, True, None, 20).rows_query()
+    conn = sqlite3.connect(app.SQLITE_PATH)
+    try:
+        plan = ' '.join(row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + app.statement(sql).sqlite, params))
+    finally:
+        conn.close()
+    assert f'INDEX {index}' in plan
+    assert 'TEMP B-TREE' not in plan
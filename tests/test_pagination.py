@@ -0,0 +1,51 @@
+import pytest
+
+from conftest import add_links
+
+def numbers(client, query):
+    """페이지를 next_cursor/next_number로 끝까지 따라가며 모은 (id, number)"""
+    rows = []
+    page = client.get(f'/api/links?limit=3{query}').get_json()
+    while True:
+        rows.extend((link['id'], link['number']) for link in page['links'])
+        if page['next_cursor'] is None:
+            return rows
+        page = client.get(f"/api/links?limit=3&after_id={page['next_cursor']}&after_number={page['next_number']}{query}").get_json()
+
+@pytest.mark.parametrize('query', ['', '&platform=naver', '&like=liked', '&platform=naver&like=liked', '&include_archived=1'])
+def test_page_numbers_match_full_list(client, query):
+    add_links(client, 5)
+    add_links(client, 4, platform='zigbang')
+    for link_id in (2, 4, 6, 7):
+        client.put(f'/api/links/{link_id}', json={'action': 'like', 'liked': True})
+    full = client.get(f'/api/links?all=1{query}').get_json()
+    assert numbers(client, query) == [(link['id'], link['number']) for link in full]
+
+def test_first_page_number_comes_from_counters(app, client, monkeypatch):
+    add_links(client, 4)
+    statements = []
+    run_statement = app.run_statement
+    monkeypatch.setattr(app, 'run_statement', lambda cursor, db_type, sql, params=(): (statements.append(sql),
+                                                                                       run_statement(cursor, db_type, sql, params))[1])
+    page = client.get('/api/links?limit=2').get_json()
+    assert [link['number'] for link in page['links']] == [4, 3]
+    assert page['next_number'] == 3
+    assert not any('COUNT(*)' in sql for sql in statements)
+
+def test_list_is_paged_by_default(app, client, monkeypatch):
+    monkeypatch.setattr(app, 'DEFAULT_PAGE_SIZE', 3)
+    add_links(client, 5)
+    page = client.get('/api/links').get_json()
+    assert [link['number'] for link in page['links']] == [5, 4, 3]
+    assert (page['limit'], page['next_number']) == (3, 3)
+    assert client.get('/api/links?limit=100000').get_json()['limit'] == app.MAX_PAGE_SIZE
+    assert len(client.get('/api/links?all=1').get_json()) == 5
+
+def test_search_page_reports_truncation(client):
+    add_links(client, 3, memo='역세권')
+    add_links(client, 1, memo='역세권', url='https://zigbang.com/items/7')
+    page = client.get('/api/links?q=역세권&limit=1').get_json()
+    assert len(page['links']) == 1
+    assert page['truncated'] and page['next_cursor'] is None
+    page = client.get('/api/links?q=역세권&limit=10').get_json()
+    assert not page['truncated']
@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+from conftest import add_links
+
+def test_sqlite_connection_reused_across_requests(app, client):
+    client.get('/api/links')
+    before = app.pool_stats()
+    for _ in range(3):
+        client.get('/api/links')
+    after = app.pool_stats()
+    assert after['connects'] == before['connects']
+    assert after['checkouts'] >= before['checkouts'] + 3
+
+def test_sqlite_connection_per_thread(app):
+    main, _ = app.checkout_connection()
+    other = []
+    thread = threading.Thread(target=lambda: other.append(app.checkout_connection()[0]))
+    thread.start()
+    thread.join()
+    assert other[0] is not main
+    assert app.checkout_connection()[0] is main
+
+def test_uncommitted_work_rolled_back_on_return(app, client):
+    (link_id,) = add_links(client, 1)
+    with app.app.app_context():
+        conn, _ = app.get_db_connection()
+        conn.cursor().execute('DELETE FROM links WHERE id = ?', (link_id,))
+    # 같은 스레드 연결을 다시 쓰므로 반납할 때 되돌리지 않으면 지운 행이 보이지 않는다
+    assert [link['id'] for link in client.get('/api/links').get_json()['links']] == [link_id]
+
+class FakeConnections:
+    def getconn(self):
+        return object()
+
+    def putconn(self, conn, close=False):
+        pass
+
+def test_postgres_pool_waits_then_times_out(app):
+    pool = app.PostgresPool('dbname=unused', 0, 1, 0.05)
+    pool._pool = FakeConnections()
+    conn = pool.getconn()
+    with pytest.raises(app.pg_pool.PoolError):
+        pool.getconn()
+    pool.putconn(conn)
+    pool.putconn(pool.getconn())
+
+    stats = pool.stats()
+    assert stats['checkouts'] == 2
+    assert stats['timeouts'] == 1
+    assert stats['in_use'] == 0 and stats['peak_in_use'] == 1
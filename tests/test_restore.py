@@ -0,0 +1,105 @@
+import os
+import threading
+
+import pytest
+
+from conftest import add_links
+
+def merge_round_trip(client):
+    """백업 -> 링크 수정/삭제 -> 병합 복원하면 백업에 있던 링크는 백업 내용으로 돌아오고 새 링크는 남는다"""
+    ids = add_links(client, 3)
+    backup = client.get('/api/backup').get_json()
+    client.put(f'/api/links/{ids[0]}', json={'action': 'rating', 'rating': 9})
+    client.delete(f'/api/links/{ids[1]}')
+    extra = client.post('/api/links', json={'url': 'https://m.land.naver.com/article/1', 'platform': 'naver',
+                                            'added_by': '중개사'}).get_json()['id']
+
+    response = client.post('/api/restore?mode=merge', json=backup)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert response.get_json()['success']
+
+    links = {link['id']: link for link in client.get('/api/links').get_json()['links']}
+    assert set(links) == set(ids) | {extra}
+    assert links[ids[0]]['rating'] == 5
+
+def test_merge_restore_sqlite(client):
+    merge_round_trip(client)
+
+def test_merge_restore_twice_overwrites(app, client):
+    # 같은 id를 다시 넣으면 새 행이 아니라 덮어쓴다
+    ids = add_links(client, 2)
+    backup = client.get('/api/backup').get_json()
+    client.post('/api/restore?mode=merge', json=backup)
+    client.post('/api/restore?mode=merge', json=backup)
+    assert sorted(link['id'] for link in client.get('/api/links').get_json()['links']) == sorted(ids)
+
+@pytest.mark.parametrize('table', ['links', 'archived_links'])
+def test_upsert_links_postgresql_conflict_target(app, monkeypatch, table):
+    # 파티션한 links의 기본 키는 (board_id, id)뿐이므로 PostgreSQL은 두 테이블 모두 그것을 충돌 대상으로 써야 한다
+    statements = []
+    monkeypatch.setattr(app, 'execute_values', lambda cursor, sql, rows, page_size: statements.append(sql))
+    app.upsert_links(None, 'postgresql', table, [])
+    assert 'ON CONFLICT (board_id, id) DO UPDATE' in statements[0]
+
+@pytest.mark.skipif(not os.environ.get('TEST_DATABASE_URL'), reason='TEST_DATABASE_URL(PostgreSQL)이 없다')
+def test_merge_restore_postgresql_partitioned(app, monkeypatch):
+    # PostgreSQL links는 board_id 해시 파티션 (기본 키 (board_id, id), id만의 유일 제약 없음)
+    monkeypatch.setenv('DATABASE_URL', os.environ['TEST_DATABASE_URL'])
+    app.init_db()
+    with app.app.app_context():
+        conn, db_type = app.get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT partstrat FROM pg_partitioned_table WHERE partrelid = 'links'::regclass")
+        assert cursor.fetchone()[0] == 'h'
+    merge_round_trip(app.app.test_client())
+
+@pytest.mark.parametrize('mode', ['', '?mode=merge'])
+def test_ndjson_restore_reads_body_before_write(app, client, monkeypatch, mode):
+    # 본문은 요청 스레드에서 다 읽고 나서 쓰기 스레드에 넘긴다 (느린 업로드가 쓰기 잠금을 잡고 있지 않도록)
+    add_links(client, 3)
+    backup = client.get('/api/backup?format=ndjson').get_data()
+    readers = set()
+    read_ndjson_backup = app.read_ndjson_backup
+
+    def tracking_read(stream):
+        header, items = read_ndjson_backup(stream)
+        def tracked():
+            for item in items:
+                readers.add(threading.current_thread())
+                yield item
+        return header, tracked()
+
+    monkeypatch.setattr(app, 'read_ndjson_backup', tracking_read)
+    response = client.post(f'/api/restore{mode}', data=backup, content_type='application/x-ndjson')
+    assert response.get_json()['success'], response.get_json()
+    assert readers == {threading.current_thread()}
+    assert len(client.get('/api/links').get_json()['links']) == 3
+
+def link_contents(client):
+    links = client.get('/api/links?all=1').get_json()
+    return sorted((link['url'], link['rating'], bool(link['liked']), link['memo']) for link in links)
+
+@pytest.mark.parametrize('backup_format', ['json', 'ndjson'])
+def test_replace_restore_round_trip(app, client, monkeypatch, backup_format):
+    monkeypatch.setattr(app, 'RESTORE_BATCH_SIZE', 2)
+    ids = add_links(client, 5)
+    client.put(f'/api/links/{ids[0]}', json={'action': 'rating', 'rating': 8})
+    client.put(f'/api/links/{ids[1]}', json={'action': 'like', 'liked': True})
+    client.put(f'/api/links/{ids[2]}', json={'action': 'memo', 'memo': '남향'})
+    client.post('/api/customer_info', json={'customer_name': '김손님', 'move_in_date': '2026-12-01'})
+    expected = link_contents(client)
+    backup = client.get(f'/api/backup?format={backup_format}').get_data()
+
+    client.delete(f'/api/links/{ids[3]}')
+    add_links(client, 2, memo='나중에 추가')
+    inserts = []
+    insert_values = app.insert_values
+    monkeypatch.setattr(app, 'insert_values', lambda cursor, db_type, sql, rows, *args, **kwargs:
+                        inserts.append(len(rows)) or insert_values(cursor, db_type, sql, rows, *args, **kwargs))
+
+    content_type = 'application/x-ndjson' if backup_format == 'ndjson' else 'application/json'
+    result = client.post('/api/restore', data=backup, content_type=content_type).get_json()
+    assert result['success'] and result['restored'] == 5
+    assert inserts == [2, 2, 1]
+    assert link_contents(client) == expected
+    assert client.get('/api/customer_info').get_json()['customer_name'] == '김손님'
@@ -0,0 +1,34 @@
+import pytest
+
+from conftest import add_links
+
+def search_ids(client, q, query=''):
+    return [link['id'] for link in client.get(f'/api/links?q={q}{query}').get_json()['links']]
+
+def test_query_tokens_use_bigrams(app):
+    assert app.query_tokens('역세권 Naver') == ['역세', '세권', 'naver']
+    assert app.query_tokens('남') == ['남']
+    assert set(app.query_tokens('역세권')) <= set(app.search_tokens('초역세권 매물').split())
+
+def test_search_matches_memo_and_url(client):
+    south, station, other = add_links(client, 3)
+    client.put(f'/api/links/{south}', json={'action': 'memo', 'memo': '남향 역세권'})
+    client.put(f'/api/links/{station}', json={'action': 'memo', 'memo': '초역세권'})
+    zigbang = client.post('/api/links', json={'url': 'https://www.zigbang.com/home/oneroom/items/42', 'platform': 'zigbang',
+                                              'added_by': '중개사', 'memo': ''}).get_json()['id']
+
+    assert sorted(search_ids(client, '역세권')) == sorted([south, station])
+    assert search_ids(client, '남향') == [south]
+    assert search_ids(client, 'zigbang') == [zigbang]
+    assert search_ids(client, '없는말') == []
+    assert search_ids(client, '역세권', '&platform=zigbang') == []
+    assert other not in search_ids(client, '역세권')
+
+@pytest.mark.parametrize('memo, q', [('햇빛 잘 듦', '햇빛'), ('주차 가능', '주차 가능')])
+def test_search_follows_memo_updates(client, memo, q):
+    (link_id,) = add_links(client, 1)
+    assert search_ids(client, q) == []
+    client.put(f'/api/links/{link_id}', json={'action': 'memo', 'memo': memo})
+    assert search_ids(client, q) == [link_id]
+    client.put(f'/api/links/{link_id}', json={'action': 'memo', 'memo': ''})
+    assert search_ids(client, q) == []
@@ -0,0 +1,71 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+import counters
+from conftest import add_links
+
+def expected_stats(client):
+    links = client.get('/api/links?all=1&include_archived=1').get_json()
+    listed = [link for link in links if not link['archived']]
+    return {
+        'total': len(listed),
+        'liked': sum(bool(link['liked']) for link in listed),
+        'disliked': sum(bool(link['disliked']) for link in listed),
+        'archived': len(links) - len(listed),
+        'platform': dict(Counter(link['platform'] for link in listed)),
+        'added_by': dict(Counter(link['added_by'] for link in listed)),
+    }
+
+def actual_stats(client):
+    stats = client.get('/api/links/stats').get_json()
+    return dict({key: stats[key] for key in ('total', 'liked', 'disliked', 'archived')},
+                platform={name: value['count'] for name, value in stats['platform'].items()},
+                added_by={name: value['count'] for name, value in stats['added_by'].items()})
+
+def test_counters_follow_every_write(app, client):
+    ids = add_links(client, 4)
+    client.post('/api/links', json={'url': 'https://www.zigbang.com/home/oneroom/items/42', 'platform': 'zigbang',
+                                    'added_by': '중개사'})
+    client.put(f'/api/links/{ids[0]}', json={'action': 'like', 'liked': True})
+    client.patch('/api/links/batch', json=[{'id': ids[1], 'action': 'dislike', 'value': True},
+                                           {'id': ids[2], 'action': 'rating', 'value': 9}])
+    client.delete(f'/api/links/{ids[3]}')
+    assert actual_stats(client) == expected_stats(client)
+
+    app.run_archive(now=datetime.now() + timedelta(days=app.ARCHIVE_DISLIKED_AFTER_DAYS + 1))
+    assert actual_stats(client)['archived'] == 1
+    assert actual_stats(client) == expected_stats(client)
+
+    backup = client.get('/api/backup?include_archived=1').get_json()
+    client.post('/api/links/unarchive', json={'ids': [ids[1]]})
+    assert actual_stats(client) == expected_stats(client)
+    client.post('/api/restore', json=backup)
+    assert actual_stats(client) == expected_stats(client)
+    assert counters.run(check=True) == {}
+
+def test_average_rating(client):
+    first, second = add_links(client, 2)
+    client.put(f'/api/links/{first}', json={'action': 'rating', 'rating': 8})
+    stats = client.get('/api/links/stats').get_json()
+    assert stats['average_rating'] == 6.5
+    assert stats['platform']['naver'] == {'count': 2, 'average_rating': 6.5}
+
+def test_stats_etag_until_write(client):
+    (link_id,) = add_links(client, 1)
+    etag = client.get('/api/links/stats').headers['ETag']
+    assert client.get('/api/links/stats', headers={'If-None-Match': etag}).status_code == 304
+    client.put(f'/api/links/{link_id}', json={'action': 'like', 'liked': True})
+    assert client.get('/api/links/stats', headers={'If-None-Match': etag}).status_code == 200
+
+def test_rebuild_fixes_drift(app, client):
+    add_links(client, 3)
+    conn = app.connect_sqlite(app.SQLITE_PATH)
+    conn.execute("UPDATE link_counters SET link_count = 7 WHERE board_id = 1 AND dimension = 'total'")
+    conn.commit()
+    conn.close()
+
+    assert counters.run(check=True) == {1: 1}
+    assert client.get('/api/links/stats').get_json()['total'] == 7
+    assert counters.run() == {1: 1}
+    assert counters.run(check=True) == {}
+    assert client.get('/api/links/stats').get_json()['total'] == 3
@@ -0,0 +1,64 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from conftest import add_links
+
+def writer_jobs(app):
+    return app.get_sqlite_writer().stats()['write_jobs']
+
+@pytest.mark.parametrize('method, path, body', [
+    ('post', '/api/boards', {'customer_name': '새 손님'}),
+    ('post', '/api/customer_info', {'customer_name': '김손님', 'move_in_date': '2026-11-01'}),
+    ('patch', '/api/links/batch', [{'id': 1, 'action': 'rating', 'value': 7}]),
+    ('post', '/api/restore', {'links': [{'url': 'https://new.land.naver.com/rooms?articleNo=9', 'platform': 'naver'}]}),
+    ('post', '/api/restore?mode=merge', {'links': [{'id': 1, 'url': 'https://m.land.naver.com/article/1'}]}),
+])
+def test_writes_go_through_write_queue(app, client, method, path, body):
+    add_links(client, 1)
+    before = writer_jobs(app)
+    response = getattr(client, method)(path, json=body)
+    assert response.get_json()['success'], response.get_data(as_text=True)
+    assert writer_jobs(app) == before + 1
+
+@pytest.mark.parametrize('write_queue', [True, False])
+def test_batch_without_changes_keeps_version(app, client, monkeypatch, write_queue):
+    monkeypatch.setattr(app, 'SQLITE_WRITE_QUEUE', write_queue)
+    (link_id,) = add_links(client, 1)
+    version = client.get('/api/links/stats').get_json()['version']
+    response = client.patch('/api/links/batch', json=[{'id': link_id + 1, 'action': 'like', 'value': True}])
+    assert response.get_json()['applied'] == 0
+    assert client.get('/api/links/stats').get_json()['version'] == version
+    response = client.patch('/api/links/batch', json=[{'id': link_id, 'action': 'like', 'value': True}])
+    assert response.get_json()['applied'] == 1
+    assert client.get('/api/links/stats').get_json()['version'] > version
+
+def test_slow_job_next_to_normal_write(app, client, monkeypatch, caplog):
+    # 느린 작업(쓰기 잠금을 잡은 채 기다림)과 같이 들어간 보통 쓰기도 커밋되고, 느린 작업은 경고로 남는다
+    monkeypatch.setattr(app, 'SLOW_WRITE_JOB_MS', 50)
+    (link_id,) = add_links(client, 1)
+    writer = app.get_sqlite_writer()
+    slow_started = threading.Event()
+
+    def slow_job(cursor, db_type):
+        slow_started.set()
+        time.sleep(0.2)
+        cursor.execute("UPDATE links SET memo = 'slow' WHERE id = ?", (link_id,))
+
+    def normal_job(cursor, db_type):
+        cursor.execute('UPDATE links SET rating = 8 WHERE id = ?', (link_id,))
+        return cursor.rowcount
+
+    slow = threading.Thread(target=writer.submit, args=(slow_job,))
+    slow.start()
+    slow_started.wait()
+    with caplog.at_level(logging.WARNING, logger=app.logger.name):
+        assert writer.submit(normal_job) == 1
+        slow.join()
+
+    assert writer.stats()['write_slow_jobs'] == 1
+    assert any('slow_job' in record.getMessage() for record in caplog.records)
+    (link,) = client.get('/api/links').get_json()['links']
+    assert (link['memo'], link['rating']) == ('slow', 8)